@@ -0,0 +1,63 @@
+"""Compare JSON backends on large Railway API payloads.
+
+Usage:
+    uv run python -m benchmarks.bench_json
+"""
+
+import json
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+from .payloads import deployment_logs_response, list_projects_response
+
+
+def _backends() -> dict[str, tuple]:
+    backends = {
+        "json": (
+            lambda value: json.dumps(value, separators=(",", ":")).encode(),
+            json.loads,
+        )
+    }
+    try:
+        import orjson
+
+        backends["orjson"] = (orjson.dumps, orjson.loads)
+    except ImportError:
+        pass
+    try:
+        import msgspec
+
+        backends["msgspec"] = (msgspec.json.encode, msgspec.json.decode)
+    except ImportError:
+        pass
+    return backends
+
+
+def best_of(func: Callable[[Any], Any], arg: Any, number: int = 20) -> float:
+    """Return the best mean time per call in seconds."""
+    return min(timeit.repeat(lambda: func(arg), number=number, repeat=5)) / number
+
+
+def main() -> None:
+    payloads = {
+        "list_projects (500 projects)": list_projects_response(),
+        "get_logs (5000 lines)": deployment_logs_response(),
+    }
+    backends = _backends()
+    for label, payload in payloads.items():
+        body = json.dumps(payload).encode()
+        print(f"{label}: {len(body) / 1024:.0f} KiB")
+        baseline = None
+        for name, (dumps, loads) in backends.items():
+            decode = best_of(loads, body)
+            encode = best_of(dumps, payload)
+            baseline = baseline or decode
+            print(
+                f"  {name:8} decode {decode * 1000:7.2f} ms  encode {encode * 1000:7.2f} ms"
+                f"  ({baseline / decode:.1f}x decode vs json)"
+            )
+
+
+if __name__ == "__main__":
+    main()
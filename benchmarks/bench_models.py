@@ -0,0 +1,80 @@
+"""Compare dict walking with typed model decoding for list_projects.
+
+Tools convert models back to dicts for their output, so CPU time comes out
+about even; what typed decoding saves is peak memory, since the nested
+connection envelopes are never built as dicts.
+
+Usage:
+    uv run python -m benchmarks.bench_models
+"""
+
+import json
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from railway_mcp import codec, models
+
+from .bench_json import best_of
+from .payloads import list_projects_response
+
+
+def walk_dicts(body: bytes) -> list[dict[str, Any]]:
+    """Decode to dicts and rebuild the tool output field by field."""
+    data = codec.loads(body)["data"]
+    projects = []
+    for edge in data.get("me", {}).get("projects", {}).get("edges", []):
+        node = edge.get("node", {})
+        environments = node.get("environments", {})
+        services = node.get("services", {})
+        projects.append(
+            {
+                "id": node.get("id"),
+                "name": node.get("name"),
+                "description": node.get("description"),
+                "createdAt": node.get("createdAt"),
+                "updatedAt": node.get("updatedAt"),
+                "environments": [
+                    {"id": e["node"]["id"], "name": e["node"]["name"]}
+                    for e in environments.get("edges", [])
+                ],
+                "services": [
+                    {"id": s["node"]["id"], "name": s["node"]["name"]}
+                    for s in services.get("edges", [])
+                ],
+                "hasMoreEnvironments": environments.get("pageInfo", {}).get("hasNextPage", False),
+                "hasMoreServices": services.get("pageInfo", {}).get("hasNextPage", False),
+            }
+        )
+    return projects
+
+
+def decode_models(body: bytes) -> list[dict[str, Any]]:
+    """Decode straight into typed models and convert them for tool output."""
+    data = models.decode(body, models.ListProjectsData).data
+    return models.to_builtins(data.me.projects.nodes)
+
+
+def peak_memory(func: Callable[[bytes], Any], body: bytes) -> int:
+    """Return the peak traced allocation of one call in bytes."""
+    tracemalloc.start()
+    try:
+        func(body)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    body = json.dumps(list_projects_response(projects=500, services_per_project=10)).encode()
+    assert walk_dicts(body) == decode_models(body)
+    decoder = "msgspec" if models.msgspec is not None else "pydantic"
+    print(f"list_projects (500 projects, 5000 services): {len(body) / 1024:.0f} KiB")
+    for label, func in (("dict walk", walk_dicts), (f"{decoder} models", decode_models)):
+        elapsed = best_of(func, body)
+        peak = peak_memory(func, body)
+        print(f"  {label:16} {elapsed * 1000:7.2f} ms  peak {peak / 1024 / 1024:6.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Measure import time of the railway_mcp entry points against a budget.
+
+Each module is imported in a fresh interpreter with `python -X importtime`
+and the median cumulative time over several runs is compared with
+benchmarks/import_budget.json. Exits non-zero when a module is over budget
+or imports a package it must not depend on. Budgets are measured on one
+machine, so CI passes --advisory: timings over budget are only reported,
+and only forbidden imports fail the run.
+
+Usage:
+    uv run python -m benchmarks.import_time
+    uv run python -m benchmarks.import_time --advisory  # fail on imports only
+    uv run python -m benchmarks.import_time --update  # record new budgets
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BUDGET_FILE = Path(__file__).with_name("import_budget.json")
+
+# Headroom applied to measured times when recording budgets with --update,
+# and the smallest budget recorded so sub-millisecond imports are not flaky
+HEADROOM = 1.5
+MIN_BUDGET_MS = 5
+
+
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    """Import a module in a fresh interpreter.
+
+    Returns:
+        Self and cumulative microseconds for every module imported
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            continue  # header line
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def measure(module: str, runs: int) -> tuple[float, float, set[str]]:
+    """Return the median cumulative and own milliseconds and the modules imported."""
+    cumulative, own = [], []
+    imported: set[str] = set()
+    for _ in range(runs):
+        times = import_times(module)
+        cumulative.append(times[module][1] / 1000)
+        own.append(sum(t[0] for name, t in times.items() if name.startswith("railway_mcp")) / 1000)
+        imported = set(times)
+    return statistics.median(cumulative), statistics.median(own), imported
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="imports per module (default: 5)")
+    parser.add_argument("--update", action="store_true", help="rewrite the budget file")
+    parser.add_argument(
+        "--advisory", action="store_true", help="report timings over budget without failing"
+    )
+    args = parser.parse_args()
+
+    budgets = json.loads(BUDGET_FILE.read_text())
+    failures, warnings = [], []
+    slow = warnings if args.advisory else failures
+    for module, budget in budgets.items():
+        cumulative, own, imported = measure(module, args.runs)
+        print(
+            f"{module:22} {cumulative:7.1f} ms total (budget {budget['totalMs']:g})"
+            f"  {own:6.1f} ms in railway_mcp (budget {budget['ownMs']:g})"
+        )
+        if args.update:
+            budget["totalMs"] = max(round(cumulative * HEADROOM), MIN_BUDGET_MS)
+            budget["ownMs"] = max(round(own * HEADROOM), MIN_BUDGET_MS)
+            continue
+        if cumulative > budget["totalMs"]:
+            slow.append(f"{module} took {cumulative:.1f} ms, budget {budget['totalMs']:g} ms")
+        if own > budget["ownMs"]:
+            slow.append(
+                f"{module} spent {own:.1f} ms in railway_mcp, budget {budget['ownMs']:g} ms"
+            )
+        for forbidden in budget.get("mustNotImport", []):
+            if forbidden in imported:
+                failures.append(f"{module} imports {forbidden}")
+
+    if args.update:
+        BUDGET_FILE.write_text(json.dumps(budgets, indent=2) + "\n")
+        print(f"Updated {BUDGET_FILE.name}")
+    for warning in warnings:
+        print(f"WARN: {warning}", file=sys.stderr)
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
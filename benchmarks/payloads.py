@@ -0,0 +1,69 @@
+"""Synthetic Railway API responses shaped like large production accounts."""
+
+import random
+
+
+def _timestamp(rng: random.Random) -> str:
+    return (
+        f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T"
+        f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}.000Z"
+    )
+
+
+def list_projects_response(
+    projects: int = 500, services_per_project: int = 10, seed: int = 0
+) -> dict:
+    """Build a ListProjects response body."""
+    rng = random.Random(seed)
+    edges = []
+    for p in range(projects):
+        edges.append(
+            {
+                "node": {
+                    "id": f"{rng.getrandbits(128):032x}",
+                    "name": f"project-{p}",
+                    "description": f"Synthetic project {p} used for benchmarking",
+                    "createdAt": _timestamp(rng),
+                    "updatedAt": _timestamp(rng),
+                    "environments": {
+                        "edges": [
+                            {"node": {"id": f"{rng.getrandbits(128):032x}", "name": name}}
+                            for name in ("production", "staging")
+                        ],
+                        "pageInfo": {"hasNextPage": False},
+                    },
+                    "services": {
+                        "edges": [
+                            {
+                                "node": {
+                                    "id": f"{rng.getrandbits(128):032x}",
+                                    "name": f"service-{p}-{s}",
+                                }
+                            }
+                            for s in range(services_per_project)
+                        ],
+                        "pageInfo": {"hasNextPage": False},
+                    },
+                }
+            }
+        )
+    return {"data": {"me": {"projects": {"edges": edges}}}}
+
+
+def deployment_logs_response(lines: int = 5000, seed: int = 0) -> dict:
+    """Build a GetDeploymentLogs response body."""
+    rng = random.Random(seed)
+    severities = ("info", "info", "info", "warn", "error")
+    return {
+        "data": {
+            "deploymentLogs": [
+                {
+                    "message": f"GET /api/v1/items/{rng.randint(1, 10_000)} 200 "
+                    f"{rng.random() * 100:.2f}ms request_id={rng.getrandbits(64):016x}",
+                    "timestamp": _timestamp(rng),
+                    "severity": rng.choice(severities),
+                }
+                for _ in range(lines)
+            ]
+        }
+    }
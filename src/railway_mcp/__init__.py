@@ -1,13 +1,27 @@
 """Railway MCP Server - Deploy and manage Railway projects via MCP."""
 
-from .server import mcp
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .server import mcp
 
 __version__ = "0.1.0"
 
 
 def main():
     """Run the MCP server."""
+    from .server import mcp
+
     mcp.run()
 
 
+def __getattr__(name: str) -> Any:
+    # Importing the server pulls in FastMCP, so only do it when `mcp` is used
+    if name == "mcp":
+        from .server import mcp
+
+        return mcp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = ["__version__", "main", "mcp"]
@@ -0,0 +1,129 @@
+"""Circuit breaker that fails fast while the Railway API is unavailable."""
+
+import time
+from collections import deque
+from collections.abc import Callable
+from enum import StrEnum
+from typing import Any
+
+from .exceptions import CircuitOpenError
+
+
+class CircuitState(StrEnum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Open after a high failure rate and probe before closing again.
+
+    Outcomes are tracked over a sliding time window. Once at least
+    `min_requests` requests finished in the window and the share of upstream
+    failures reaches `failure_rate`, the circuit opens and requests fail
+    immediately. After `reset_timeout` seconds one caller is allowed to probe
+    the API (half-open); a successful probe closes the circuit, a failed one
+    keeps it open for another timeout.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_requests: int = 10,
+        window: float = 30.0,
+        reset_timeout: float = 15.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the breaker.
+
+        Args:
+            failure_rate: Share of failed requests in the window that opens the circuit
+            min_requests: Requests needed in the window before the rate is evaluated
+            window: Seconds of outcomes considered
+            reset_timeout: Seconds the circuit stays open before a probe
+            clock: Monotonic time source
+        """
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.times_opened = 0
+        self.rejected = 0
+        self._clock = clock
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until the next probe may be sent."""
+        if self.state is CircuitState.CLOSED:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def allow(self) -> bool:
+        """Check whether requests may be sent without probing first."""
+        return self.state is CircuitState.CLOSED
+
+    def start_probe(self) -> bool:
+        """Claim the half-open probe if the reset timeout has elapsed.
+
+        Returns:
+            True if the caller should send the probe request
+        """
+        if self.state is CircuitState.OPEN and self.retry_after == 0.0:
+            self.state = CircuitState.HALF_OPEN
+            return True
+        return False
+
+    def probe_succeeded(self) -> None:
+        """Close the circuit after a successful probe."""
+        self.state = CircuitState.CLOSED
+        self._outcomes.clear()
+        self._failures = 0
+
+    def probe_failed(self) -> None:
+        """Keep the circuit open for another reset timeout."""
+        self._open()
+
+    def record(self, failed: bool) -> None:
+        """Record the outcome of a request sent while the circuit was closed."""
+        if self.state is not CircuitState.CLOSED:
+            return
+        now = self._clock()
+        self._outcomes.append((now, failed))
+        self._failures += failed
+        while self._outcomes and self._outcomes[0][0] <= now - self.window:
+            self._failures -= self._outcomes.popleft()[1]
+        total = len(self._outcomes)
+        if total >= self.min_requests and self._failures >= total * self.failure_rate:
+            self._open()
+
+    def open_error(self) -> CircuitOpenError:
+        """Build the error raised for a rejected request."""
+        self.rejected += 1
+        retry_after = self.retry_after
+        return CircuitOpenError(
+            f"Railway API is unavailable; requests are paused for {retry_after:.0f}s",
+            retry_after=retry_after,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Return the breaker state and counters."""
+        total = len(self._outcomes)
+        return {
+            "state": self.state.value,
+            "failureRate": round(self._failures / total, 3) if total else 0.0,
+            "timesOpened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+    def _open(self) -> None:
+        self.state = CircuitState.OPEN
+        self._opened_at = self._clock()
+        self.times_opened += 1
+        self._outcomes.clear()
+        self._failures = 0
@@ -0,0 +1,364 @@
+"""In-memory response cache for GraphQL read queries."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from . import codec
+
+# Seconds a response stays fresh, by operation name. Operations that are not
+# listed here (logs, mutations, anonymous queries) are never cached.
+DEFAULT_TTLS: dict[str, float] = {
+    "Me": 60.0,
+    "ListProjects": 30.0,
+    "GetProject": 30.0,
+    "ListServices": 30.0,
+    "GetService": 30.0,
+    "ListEnvironments": 30.0,
+    "ListDeployments": 5.0,
+    "GetDeployment": 5.0,
+    "ListVariables": 10.0,
+    "ListDomains": 30.0,
+    "ListTemplates": 300.0,
+    "GetTemplate": 300.0,
+}
+
+# Cached queries evicted by each mutation. Each rule names a query operation
+# and the variables that must match between the mutation and the cached entry;
+# an empty tuple evicts every cached entry of that operation.
+DEFAULT_INVALIDATIONS: dict[str, tuple[tuple[str, tuple[str, ...]], ...]] = {
+    "CreateProject": (("ListProjects", ()),),
+    "DeleteProject": (
+        ("ListProjects", ()),
+        ("GetProject", ("projectId",)),
+        ("ListServices", ("projectId",)),
+        ("ListEnvironments", ("projectId",)),
+    ),
+    "CreateService": (
+        ("ListProjects", ()),
+        ("GetProject", ("projectId",)),
+        ("ListServices", ("projectId",)),
+    ),
+    "DeleteService": (
+        ("ListProjects", ()),
+        ("GetProject", ()),
+        ("ListServices", ()),
+        ("GetService", ("serviceId",)),
+    ),
+    "CreateEnvironment": (
+        ("ListProjects", ()),
+        ("GetProject", ("projectId",)),
+        ("ListEnvironments", ("projectId",)),
+    ),
+    "DeleteEnvironment": (
+        ("ListProjects", ()),
+        ("GetProject", ()),
+        ("ListEnvironments", ()),
+    ),
+    "DeployService": (("ListDeployments", ("serviceId", "environmentId")),),
+    "Redeploy": (("ListDeployments", ()), ("GetDeployment", ("deploymentId",))),
+    "CancelDeployment": (("ListDeployments", ()), ("GetDeployment", ("deploymentId",))),
+    "RestartDeployment": (("ListDeployments", ()), ("GetDeployment", ("deploymentId",))),
+    "SetVariables": (("ListVariables", ("projectId", "environmentId", "serviceId")),),
+    "DeleteVariable": (("ListVariables", ("projectId", "environmentId", "serviceId")),),
+    "CreateServiceDomain": (("ListDomains", ("serviceId", "environmentId")),),
+    "DeleteServiceDomain": (("ListDomains", ()),),
+    "CreateCustomDomain": (("ListDomains", ("serviceId", "environmentId")),),
+    "DeployTemplate": (
+        ("ListProjects", ()),
+        ("GetProject", ("projectId",)),
+        ("ListServices", ("projectId",)),
+    ),
+}
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    stale_hits: int = 0
+    revalidating_hits: int = 0
+    restored: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the counters as a dictionary."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "staleHits": self.stale_hits,
+            "revalidatingHits": self.revalidating_hits,
+            "restored": self.restored,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    """A cached response and the variables it was fetched with."""
+
+    operation: str
+    variables: dict[str, Any]
+    model: type | None
+    value: Any
+    stored_at: float
+    expires_at: float
+    restored: bool = False
+
+
+@dataclass
+class ServedAge:
+    """Age of the oldest cached response served within a track_age() block."""
+
+    age: float | None = None
+    stale: bool = False
+
+    def record(self, age: float, stale: bool) -> None:
+        """Record a response served from the cache."""
+        self.age = age if self.age is None else max(self.age, age)
+        self.stale = self.stale or stale
+
+
+_served_age: ContextVar[ServedAge | None] = ContextVar("railway_served_age", default=None)
+
+
+@contextmanager
+def track_age() -> Iterator[ServedAge]:
+    """Collect the age of cached responses served to the enclosed calls.
+
+    Tasks started within the block (such as page prefetches) report to the
+    same tracker.
+    """
+    tracker = ServedAge()
+    token = _served_age.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _served_age.reset(token)
+
+
+class ResponseCache:
+    """Bounded TTL + LRU cache keyed by operation name and variables."""
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttls: Mapping[str, float] | None = None,
+        invalidations: Mapping[str, tuple[tuple[str, tuple[str, ...]], ...]] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached responses before LRU eviction
+            ttls: Per-operation TTLs in seconds, merged over DEFAULT_TTLS
+            invalidations: Mutation invalidation rules (defaults to DEFAULT_INVALIDATIONS)
+            clock: Monotonic time source
+        """
+        self.max_entries = max_entries
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.invalidations = DEFAULT_INVALIDATIONS if invalidations is None else dict(invalidations)
+        self.stats = CacheStats()
+        self.generation = 0
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, type | None, bytes], CacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_cacheable(self, operation: str | None) -> bool:
+        """Check whether responses for an operation are cached at all."""
+        return operation is not None and self.ttls.get(operation, 0) > 0
+
+    def get(
+        self, operation: str, variables: dict[str, Any] | None, model: type | None = None
+    ) -> Any | None:
+        """Return a fresh cached response, or None on a miss.
+
+        Expired entries are kept (until evicted or replaced) so that they can
+        still be served by get_stale.
+        """
+        key = _make_key(operation, variables, model)
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= self._clock():
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        self._served(entry)
+        return entry.value
+
+    def get_stale(
+        self, operation: str, variables: dict[str, Any] | None, model: type | None = None
+    ) -> Any | None:
+        """Return a cached response even if it has expired, or None if there is none."""
+        entry = self._entries.get(_make_key(operation, variables, model))
+        if entry is None:
+            return None
+        self.stats.stale_hits += 1
+        self._served(entry)
+        return entry.value
+
+    def get_revalidating(
+        self,
+        operation: str,
+        variables: dict[str, Any] | None,
+        model: type | None = None,
+        max_stale: float = 0.0,
+    ) -> Any | None:
+        """Return an expired response that may be served while it is refreshed.
+
+        That is an entry that expired at most `max_stale` seconds ago, or one
+        restored from a snapshot (which stops counting as restored once it is
+        replaced by a response fetched in this process).
+        """
+        entry = self._entries.get(_make_key(operation, variables, model))
+        if entry is None:
+            return None
+        if not entry.restored and entry.expires_at + max_stale <= self._clock():
+            return None
+        self.stats.revalidating_hits += 1
+        self._served(entry)
+        return entry.value
+
+    def entries(self) -> list[tuple[CacheEntry, float]]:
+        """Return the cached entries from least to most recently used.
+
+        Returns:
+            Each entry with the seconds left until it expires (negative once expired)
+        """
+        now = self._clock()
+        return [(entry, entry.expires_at - now) for entry in self._entries.values()]
+
+    def restore(
+        self,
+        operation: str,
+        variables: dict[str, Any] | None,
+        value: Any,
+        model: type | None,
+        expires_in: float,
+    ) -> bool:
+        """Add an entry loaded from a snapshot as the least recently used one.
+
+        Entries already fetched in this process are kept, and nothing is
+        restored into a full cache, so restore the most recent entries first.
+
+        Args:
+            operation: Query operation name
+            variables: Query variables
+            value: Response data
+            model: Model the data was decoded into, if any
+            expires_in: Seconds until the entry expires (negative if it already has)
+
+        Returns:
+            True if the entry was added
+        """
+        if not self.is_cacheable(operation):
+            return False
+        key = _make_key(operation, variables, model)
+        if key in self._entries or len(self._entries) >= self.max_entries:
+            return False
+        expires_at = self._clock() + expires_in
+        self._entries[key] = CacheEntry(
+            operation=operation,
+            variables=dict(variables or {}),
+            model=model,
+            value=value,
+            stored_at=expires_at - self.ttls[operation],
+            expires_at=expires_at,
+            restored=True,
+        )
+        self._entries.move_to_end(key, last=False)
+        self.stats.restored += 1
+        return True
+
+    def set(
+        self,
+        operation: str,
+        variables: dict[str, Any] | None,
+        value: Any,
+        model: type | None = None,
+        generation: int | None = None,
+    ) -> None:
+        """Store a response.
+
+        Args:
+            operation: Query operation name
+            variables: Query variables
+            value: Response data to cache
+            model: Model the data was decoded into, if any
+            generation: Cache generation observed when the request was sent;
+                the value is dropped if a mutation invalidated entries since
+        """
+        if not self.is_cacheable(operation):
+            return
+        if generation is not None and generation != self.generation:
+            return
+        key = _make_key(operation, variables, model)
+        now = self._clock()
+        self._entries[key] = CacheEntry(
+            operation=operation,
+            variables=dict(variables or {}),
+            model=model,
+            value=value,
+            stored_at=now,
+            expires_at=now + self.ttls[operation],
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, mutation: str | None, variables: dict[str, Any] | None) -> int:
+        """Evict the entries affected by a mutation.
+
+        Args:
+            mutation: Mutation operation name
+            variables: Mutation variables
+
+        Returns:
+            Number of evicted entries
+        """
+        rules = self.invalidations.get(mutation or "", ())
+        if not rules:
+            return 0
+        self.generation += 1
+        variables = variables or {}
+        stale = [
+            key
+            for key, entry in self._entries.items()
+            if any(
+                entry.operation == operation
+                and all(entry.variables.get(name) == variables.get(name) for name in match_on)
+                for operation, match_on in rules
+            )
+        ]
+        for key in stale:
+            self._entries.pop(key, None)
+        self.stats.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self.generation += 1
+        self._entries.clear()
+
+    def _served(self, entry: CacheEntry) -> None:
+        tracker = _served_age.get()
+        if tracker is not None:
+            now = self._clock()
+            tracker.record(now - entry.stored_at, entry.expires_at <= now)
+
+
+def _make_key(
+    operation: str, variables: dict[str, Any] | None, model: type | None
+) -> tuple[str, type | None, bytes]:
+    return operation, model, codec.dumps(variables, sort_keys=True) if variables else b""
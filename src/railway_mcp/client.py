@@ -1,39 +1,252 @@
 """GraphQL client for Railway API."""
 
-from typing import Any
+import asyncio
+import contextvars
+import importlib.util
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
 import httpx
 
-from .exceptions import AuthenticationError, GraphQLError
+from . import codec, deadline, models
+from .breaker import CircuitBreaker
+from .cache import ResponseCache
+from .exceptions import (
+    AuthenticationError,
+    CircuitOpenError,
+    DeadlineExceededError,
+    GraphQLError,
+    RateLimitError,
+)
+from .graphql.queries import ME_QUERY
+from .graphql.registry import Operation, get_operation
+from .loader import BatchLoader
+from .pagination import DEFAULT_PAGE_SIZE
+from .retry import (
+    IDEMPOTENT_MUTATIONS,
+    RetryPolicy,
+    TokenBucket,
+    is_overload,
+    is_rate_limit_error,
+    is_retryable,
+    is_upstream_failure,
+    is_upstream_outcome,
+    parse_rate_limit,
+    parse_retry_after,
+)
+from .scheduler import AdaptiveLimit, Lane, Scheduler
+
+if TYPE_CHECKING:
+    from .config import Settings
+    from .logs import LogStreams, LogWatermarks
+    from .search import SearchIndex
+    from .topology import TopologyIndex
+
+logger = logging.getLogger(__name__)
+
+
+def _error_code(error: dict[str, Any]) -> str:
+    """Return the APQ error code of a GraphQL error entry, if any."""
+    code = (error.get("extensions") or {}).get("code")
+    if code:
+        return code
+    # Some servers only report the condition in the message
+    message = error.get("message", "")
+    if message == "PersistedQueryNotFound":
+        return "PERSISTED_QUERY_NOT_FOUND"
+    if message == "PersistedQueryNotSupported":
+        return "PERSISTED_QUERY_NOT_SUPPORTED"
+    return ""
+
+
+@dataclass(slots=True)
+class _Flight:
+    """A shared read request and the number of callers awaiting it."""
+
+    task: asyncio.Task[Any]
+    waiters: int = 0
 
 
 class RailwayClient:
     """Async GraphQL client for Railway API."""
 
-    def __init__(self, token: str, api_url: str):
+    def __init__(
+        self,
+        token: str,
+        api_url: str,
+        cache: ResponseCache | None = None,
+        limits: httpx.Limits | None = None,
+        timeout: httpx.Timeout | None = None,
+        http2: bool = False,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: TokenBucket | None = None,
+        persisted_queries: bool = False,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        scheduler: Scheduler | None = None,
+        adaptive_limit: AdaptiveLimit | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        max_stale: float = 0.0,
+        topology_refresh_interval: float = 300.0,
+        log_buffer_lines: int = 1000,
+        log_stream_idle_timeout: float = 300.0,
+        log_export_dir: str = "~/.cache/railway-mcp/logs",
+    ):
         """Initialize the Railway client.
 
         Args:
             token: Railway API token
             api_url: Railway GraphQL API URL
+            cache: Optional response cache for read queries
+            limits: Connection pool limits (httpx defaults if omitted)
+            timeout: Request timeouts (30s for every phase if omitted)
+            http2: Multiplex requests over HTTP/2 (requires the h2 package)
+            retry_policy: Retry policy for transient failures (no retries if omitted)
+            rate_limiter: Client-side token bucket fed by rate-limit headers
+            persisted_queries: Send query hashes instead of full documents (APQ)
+            page_size: Nodes requested per page when paginating connections
+            scheduler: Concurrency limiter with priority lanes (unbounded if omitted)
+            adaptive_limit: Controller that tunes the scheduler's limit from
+                observed latency and overload responses
+            circuit_breaker: Breaker that fails requests fast while the API is down
+            max_stale: Seconds past their TTL the list tools may serve cached
+                responses while refreshing them in the background
+            topology_refresh_interval: Seconds after which the project, service
+                and environment index is refreshed in the background
+            log_buffer_lines: Lines kept per live log subscription
+            log_stream_idle_timeout: Seconds without reads after which a live
+                log subscription is closed
+            log_export_dir: Directory export_logs writes log files to
         """
         self.token = token
         self.api_url = api_url
+        self.cache = cache
+        self.limits = limits or httpx.Limits()
+        self.timeout = timeout or httpx.Timeout(30.0)
+        self.http2 = http2
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=1)
+        self.rate_limiter = rate_limiter
+        self.retries = 0
+        self.persisted_queries = persisted_queries
+        self.persisted_query_hits = 0
+        self.persisted_query_misses = 0
+        self.page_size = page_size
+        self.scheduler = scheduler
+        self.adaptive_limit = adaptive_limit
+        self.circuit_breaker = circuit_breaker
+        self.max_stale = max_stale
+        self.stale_responses = 0
+        self.startup_timings: dict[str, float] = {}
+        self._startup: asyncio.Task[None] | None = None
+        self._startup_error: AuthenticationError | None = None
         self._client: httpx.AsyncClient | None = None
+        self._inflight: dict[tuple[str, type | None, bytes], _Flight] = {}
+        self.coalesced_requests = 0
+        self.loader = BatchLoader(self)
+        self.log_buffer_lines = log_buffer_lines
+        self.log_stream_idle_timeout = log_stream_idle_timeout
+        self.log_export_dir = log_export_dir
+        self._log_streams: LogStreams | None = None
+        self._log_watermarks: LogWatermarks | None = None
+        self.topology_refresh_interval = topology_refresh_interval
+        self._search: SearchIndex | None = None
+        self._topology: TopologyIndex | None = None
+
+    @classmethod
+    def from_settings(cls, settings: "Settings") -> "RailwayClient":
+        """Create a client configured from server settings."""
+        cache = None
+        if settings.cache_enabled:
+            cache = ResponseCache(
+                max_entries=settings.cache_max_entries,
+                ttls=settings.cache_ttls,
+            )
+        scheduler = Scheduler(
+            max_concurrency=settings.max_concurrent_requests,
+            queue_depths=settings.queue_depths,
+        )
+        adaptive_limit = None
+        if settings.adaptive_concurrency:
+            adaptive_limit = AdaptiveLimit(
+                scheduler,
+                min_limit=settings.adaptive_min_concurrency,
+                max_limit=settings.adaptive_max_concurrency,
+            )
+        circuit_breaker = None
+        if settings.circuit_breaker_enabled:
+            circuit_breaker = CircuitBreaker(
+                failure_rate=settings.circuit_failure_rate,
+                min_requests=settings.circuit_min_requests,
+                window=settings.circuit_window,
+                reset_timeout=settings.circuit_reset_timeout,
+            )
+        return cls(
+            settings.railway_token,
+            settings.railway_api_url,
+            cache=cache,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                connect=settings.http_connect_timeout,
+                read=settings.http_read_timeout,
+                write=settings.http_write_timeout,
+                pool=settings.http_pool_timeout,
+            ),
+            http2=settings.http2,
+            retry_policy=RetryPolicy(
+                max_attempts=settings.retry_max_attempts,
+                base_delay=settings.retry_base_delay,
+                max_delay=settings.retry_max_delay,
+            ),
+            rate_limiter=TokenBucket() if settings.rate_limit_throttle else None,
+            persisted_queries=settings.persisted_queries,
+            page_size=settings.page_size,
+            scheduler=scheduler,
+            adaptive_limit=adaptive_limit,
+            circuit_breaker=circuit_breaker,
+            max_stale=settings.cache_max_stale,
+            topology_refresh_interval=settings.topology_refresh_interval,
+            log_buffer_lines=settings.log_buffer_lines,
+            log_stream_idle_timeout=settings.log_stream_idle_timeout,
+            log_export_dir=settings.log_export_dir,
+        )
 
     async def __aenter__(self) -> "RailwayClient":
         """Enter async context."""
+        http2 = self.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the h2 package is missing; using HTTP/1.1")
+            http2 = False
+
         self._client = httpx.AsyncClient(
             headers={
                 "Authorization": f"Bearer {self.token}",
                 "Content-Type": "application/json",
             },
-            timeout=30.0,
+            limits=self.limits,
+            timeout=self.timeout,
+            http2=http2,
         )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
         """Exit async context."""
+        if self._startup is not None and not self._startup.done():
+            self._startup.cancel()
+            await asyncio.gather(self._startup, return_exceptions=True)
+        # Background refreshes nobody is waiting for
+        orphans = [flight.task for flight in self._inflight.values() if flight.waiters == 0]
+        for task in orphans:
+            task.cancel()
+        await asyncio.gather(*orphans, return_exceptions=True)
+        if self._topology is not None:
+            await self._topology.stop_refresh()
+        if self._log_streams is not None:
+            await self._log_streams.close()
         if self._client:
             await self._client.aclose()
             self._client = None
@@ -45,16 +258,80 @@ class RailwayClient:
             raise RuntimeError("Client not initialized. Use async context manager.")
         return self._client
 
+    @property
+    def search(self) -> "SearchIndex":
+        """Get the cross-project search index, created on first use."""
+        if self._search is None:
+            from .search import SearchIndex
+
+            self._search = SearchIndex()
+        return self._search
+
+    @property
+    def topology(self) -> "TopologyIndex":
+        """Get the project, environment and service index, created on first use."""
+        if self._topology is None:
+            from .topology import TopologyIndex
+
+            self._topology = TopologyIndex(
+                self, refresh_interval=self.topology_refresh_interval, search=self.search
+            )
+        return self._topology
+
+    @property
+    def log_streams(self) -> "LogStreams":
+        """Get the shared live log subscriptions, created on first use."""
+        if self._log_streams is None:
+            from .logs import LogStreams
+            from .logs.stream import websocket_url
+
+            self._log_streams = LogStreams(
+                websocket_url(self.api_url),
+                self.token,
+                capacity=self.log_buffer_lines,
+                idle_timeout=self.log_stream_idle_timeout,
+            )
+        return self._log_streams
+
+    @property
+    def log_watermarks(self) -> "LogWatermarks":
+        """Get the state behind get_logs cursors, created on first use."""
+        if self._log_watermarks is None:
+            from .logs import LogWatermarks
+
+            self._log_watermarks = LogWatermarks()
+        return self._log_watermarks
+
     async def execute(
         self,
         query: str,
         variables: dict[str, Any] | None = None,
-    ) -> dict[str, Any]:
+        *,
+        fresh: bool = False,
+        model: type | None = None,
+        lane: Lane = Lane.INTERACTIVE,
+        max_stale: float = 0.0,
+    ) -> Any:
         """Execute a GraphQL query or mutation.
 
+        Read queries are served from the response cache when possible, and
+        concurrent calls with an identical query and variables share a single
+        upstream request. Mutations are always sent individually and evict the
+        cached queries they affect. Cached responses that expired at most
+        `max_stale` seconds ago, and entries restored from a cache snapshot,
+        are returned at once while a fresh copy is fetched in the background
+        (stale-while-revalidate). The returned data may be shared between
+        callers and must be treated as read-only.
+
         Args:
             query: GraphQL query string
             variables: Query variables
+            fresh: Bypass the response cache and fetch from the API
+            model: Dataclass from railway_mcp.models to decode the response data
+                into; plain dicts are returned if omitted
+            lane: Scheduling lane for reads; mutations always use Lane.MUTATION
+            max_stale: Seconds past its TTL a cached read may still be served
+                while it is refreshed in the background
 
         Returns:
             Query response data
@@ -62,28 +339,337 @@ class RailwayClient:
         Raises:
             AuthenticationError: If authentication fails
             GraphQLError: If the query fails
+            OverloadedError: If too many requests are queued in the lane
+            CircuitOpenError: If the API is unavailable and no cached response
+                (however old) exists for the read
+            DeadlineExceededError: If the current deadline passes first
         """
-        payload = {"query": query}
-        if variables:
-            payload["variables"] = variables
+        operation = get_operation(query)
 
-        response = await self.client.post(self.api_url, json=payload)
+        if operation.is_mutation:
+            data = await self._send(operation, variables, model, Lane.MUTATION)
+            if self.cache is not None:
+                self.cache.invalidate(operation.name, variables)
+            return data
 
-        if response.status_code == 401:
-            raise AuthenticationError("Invalid Railway API token")
+        cache = self.cache
+        if cache is not None and not cache.is_cacheable(operation.name):
+            cache = None
+        key = (query, model, codec.dumps(variables, sort_keys=True) if variables else b"")
+        if cache is not None and not fresh:
+            cached = cache.get(operation.name, variables, model)
+            if cached is not None:
+                return cached
+            stale = cache.get_revalidating(operation.name, variables, model, max_stale)
+            if stale is not None:
+                self._revalidate(key, operation, variables, model, cache)
+                return stale
 
-        if response.status_code != 200:
-            raise GraphQLError(f"HTTP error {response.status_code}: {response.text}")
+        if deadline.expired():
+            raise DeadlineExceededError("Deadline exceeded before the request was sent")
+        flight = self._inflight.get(key)
+        if flight is not None:
+            self.coalesced_requests += 1
+        else:
+            # Run outside the caller's context: each waiter applies its own deadline
+            task = asyncio.get_running_loop().create_task(
+                self._fetch(operation, variables, model, lane, cache),
+                context=contextvars.Context(),
+            )
+            flight = self._inflight[key] = _Flight(task)
+            task.add_done_callback(lambda _: self._release_inflight(key, flight))
+
+        flight.waiters += 1
+        try:
+            # A caller cancelled or out of time doesn't fail the shared request
+            return await deadline.wait_shared(flight.task)
+        except CircuitOpenError:
+            if cache is not None:
+                stale = cache.get_stale(operation.name, variables, model)
+                if stale is not None:
+                    self.stale_responses += 1
+                    return stale
+            raise
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller gave up; abort the request and free its connection
+                flight.task.cancel()
+
+    def _revalidate(
+        self,
+        key: tuple[str, type | None, bytes],
+        operation: Operation,
+        variables: dict[str, Any] | None,
+        model: type | None,
+        cache: ResponseCache,
+    ) -> None:
+        """Refresh a cache entry in the background unless a request is in flight."""
+        if key in self._inflight:
+            return
+        # Run outside the caller's context so its deadline doesn't apply
+        task = asyncio.get_running_loop().create_task(
+            self._fetch(operation, variables, model, Lane.BULK, cache),
+            context=contextvars.Context(),
+        )
+        flight = self._inflight[key] = _Flight(task)
+        task.add_done_callback(lambda _: self._release_inflight(key, flight))
 
-        result = response.json()
+    async def _fetch(
+        self,
+        operation: Operation,
+        variables: dict[str, Any] | None,
+        model: type | None,
+        lane: Lane,
+        cache: ResponseCache | None,
+    ) -> Any:
+        """Send a read query and store the result in the cache."""
+        generation = cache.generation if cache is not None else None
+        data = await self._send(operation, variables, model, lane)
+        if cache is not None:
+            cache.set(operation.name, variables, data, model, generation=generation)
+        return data
+
+    def stats(self) -> dict[str, Any]:
+        """Return client-side counters for observability."""
+        return {
+            "coalescedRequests": self.coalesced_requests,
+            "batchesSent": self.loader.batches_sent,
+            "retries": self.retries,
+            "throttled": self.rate_limiter.throttled if self.rate_limiter is not None else 0,
+            "persistedQueries": {
+                "hits": self.persisted_query_hits,
+                "misses": self.persisted_query_misses,
+            },
+            "cache": self.cache.stats.as_dict() if self.cache is not None else None,
+            "scheduler": self.scheduler.stats() if self.scheduler is not None else None,
+            "adaptiveLimit": (
+                self.adaptive_limit.stats() if self.adaptive_limit is not None else None
+            ),
+            "circuitBreaker": (
+                self.circuit_breaker.stats() if self.circuit_breaker is not None else None
+            ),
+            "staleResponses": self.stale_responses,
+            "topology": self.topology.stats(),
+            "searchDocuments": len(self.search),
+            "logStreams": self._log_streams.stats() if self._log_streams is not None else None,
+            "logDuplicatesDropped": (
+                self._log_watermarks.duplicates_dropped if self._log_watermarks is not None else 0
+            ),
+            "startup": self.startup_timings,
+        }
+
+    def _release_inflight(self, key: tuple[str, type | None, bytes], flight: "_Flight") -> None:
+        """Forget a finished in-flight request."""
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+    async def _send(
+        self,
+        operation: Operation,
+        variables: dict[str, Any] | None = None,
+        model: type | None = None,
+        lane: Lane = Lane.INTERACTIVE,
+    ) -> Any:
+        """Send a single GraphQL request and return its data."""
+        result = await self._post(operation, variables, model, lane)
 
         if "errors" in result:
             errors = result["errors"]
             message = errors[0].get("message", "Unknown GraphQL error")
             raise GraphQLError(message, errors)
 
+        if model is not None:
+            return result["data"] or model()
         return result.get("data", {})
 
+    async def _post(
+        self,
+        operation: Operation,
+        variables: dict[str, Any] | None = None,
+        model: type | None = None,
+        lane: Lane = Lane.INTERACTIVE,
+        persisted: bool = True,
+    ) -> dict[str, Any]:
+        """POST a GraphQL request and return the full response body.
+
+        Transient failures are retried according to the retry policy; mutations
+        are only retried when the request never reached the API or the mutation
+        is known to be idempotent. Each attempt holds a scheduler slot in the
+        given lane, which is released while backing off, and passes through the
+        circuit breaker. GraphQL errors are left in the body for the caller to
+        handle. Pass persisted=False for one-off documents the API can't have
+        cached, so they skip the persisted query round trip.
+        """
+        if self._startup is not None and not self._startup.done():
+            await asyncio.shield(self._startup)
+        if self._startup_error is not None:
+            raise self._startup_error
+
+        idempotent = not operation.is_mutation or operation.name in IDEMPOTENT_MUTATIONS
+        policy = self.retry_policy
+        breaker = self.circuit_breaker
+        delay = policy.base_delay
+        attempt = 1
+        while True:
+            if breaker is not None and not breaker.allow():
+                await self._probe(breaker)
+            try:
+                if self.scheduler is None:
+                    result = await self._post_once(operation, variables, model, persisted)
+                else:
+                    async with self.scheduler.slot(lane):
+                        result = await self._post_timed(operation, variables, model, persisted)
+            except Exception as e:
+                if deadline.expired():
+                    # Running out of time says nothing about the API's health
+                    if isinstance(e, DeadlineExceededError):
+                        raise
+                    raise DeadlineExceededError(
+                        "Deadline exceeded waiting for the Railway API"
+                    ) from e
+                if breaker is not None and is_upstream_outcome(e):
+                    breaker.record(failed=is_upstream_failure(e))
+                if attempt >= policy.max_attempts or not is_retryable(e, idempotent):
+                    raise
+                delay = policy.next_delay(delay)
+                retry_after = getattr(e, "retry_after", None)
+                if retry_after is not None and retry_after > policy.max_delay:
+                    # Let the caller see the Retry-After rather than stall for it
+                    raise
+                wait = max(delay, retry_after or 0.0)
+                left = deadline.remaining()
+                if left is not None and wait >= left:
+                    raise
+                await asyncio.sleep(wait)
+                attempt += 1
+                self.retries += 1
+            else:
+                if breaker is not None:
+                    breaker.record(failed=False)
+                return result
+
+    async def _probe(self, breaker: CircuitBreaker) -> None:
+        """Probe the API with a cheap query before letting requests through.
+
+        Raises:
+            CircuitOpenError: If the circuit is open and this caller did not
+                get to probe, or the probe failed
+        """
+        if not breaker.start_probe():
+            raise breaker.open_error()
+        try:
+            await self._post_once(get_operation(ME_QUERY))
+        except (asyncio.CancelledError, DeadlineExceededError):
+            breaker.probe_failed()
+            raise
+        except Exception as e:
+            if is_upstream_failure(e):
+                breaker.probe_failed()
+                raise breaker.open_error() from e
+        breaker.probe_succeeded()
+
+    async def _post_timed(
+        self,
+        operation: Operation,
+        variables: dict[str, Any] | None = None,
+        model: type | None = None,
+        persisted: bool = True,
+    ) -> dict[str, Any]:
+        """Send one attempt and feed its latency and outcome to the adaptive limit."""
+        adaptive = self.adaptive_limit
+        if adaptive is None:
+            return await self._post_once(operation, variables, model, persisted)
+        started = adaptive.clock()
+        try:
+            result = await self._post_once(operation, variables, model, persisted)
+        except Exception as e:
+            adaptive.record(started, overloaded=is_overload(e))
+            raise
+        adaptive.record(started)
+        return result
+
+    async def _post_once(
+        self,
+        operation: Operation,
+        variables: dict[str, Any] | None = None,
+        model: type | None = None,
+        persisted: bool = True,
+    ) -> dict[str, Any]:
+        """Send one GraphQL request, negotiating a persisted query if enabled."""
+        if not self.persisted_queries or not persisted:
+            return await self._post_payload(operation.payload(variables), model)
+
+        result = await self._post_payload(
+            operation.payload(variables, persisted=True, include_query=False), model
+        )
+
+        errors = result.get("errors") or []
+        if any(_error_code(error) == "PERSISTED_QUERY_NOT_SUPPORTED" for error in errors):
+            logger.warning("Persisted queries are not supported by the API; disabling them")
+            self.persisted_queries = False
+            return await self._post_payload(operation.payload(variables), model)
+        if any(_error_code(error) == "PERSISTED_QUERY_NOT_FOUND" for error in errors):
+            self.persisted_query_misses += 1
+            return await self._post_payload(operation.payload(variables, persisted=True), model)
+
+        self.persisted_query_hits += 1
+        return result
+
+    async def _post_payload(self, content: bytes, model: type | None = None) -> dict[str, Any]:
+        """Send one pre-encoded HTTP request and classify its outcome.
+
+        With a model, the response data is decoded straight into typed models
+        and returned under the "data" key of the result.
+        """
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+
+        response = await self.client.post(
+            self.api_url, content=content, timeout=deadline.request_timeout(self.timeout)
+        )
+
+        rate_limit = parse_rate_limit(response.headers)
+        if rate_limit is not None and self.rate_limiter is not None:
+            self.rate_limiter.observe(*rate_limit)
+
+        if response.status_code == 401:
+            raise AuthenticationError("Invalid Railway API token")
+
+        if response.status_code == 429:
+            raise RateLimitError(
+                "Railway API rate limit exceeded",
+                status_code=429,
+                retry_after=parse_retry_after(response.headers),
+            )
+
+        if response.status_code != 200:
+            raise GraphQLError(
+                f"HTTP error {response.status_code}: {response.text}",
+                status_code=response.status_code,
+            )
+
+        if model is None:
+            result = codec.loads(response.content)
+        else:
+            decoded = models.decode(response.content, model)
+            result = {"data": decoded.data}
+            if decoded.errors is not None:
+                result["errors"] = decoded.errors
+
+        errors = result.get("errors") or []
+        if any(is_rate_limit_error(error) for error in errors):
+            raise RateLimitError(
+                errors[0].get("message", "Railway API rate limit exceeded"),
+                errors,
+                retry_after=parse_retry_after(response.headers),
+            )
+
+        return result
+
     async def verify_token(self) -> dict[str, Any]:
         """Verify the API token is valid.
 
@@ -93,16 +679,41 @@ class RailwayClient:
         Raises:
             AuthenticationError: If token is invalid
         """
-        query = """
-        query Me {
-            me {
-                id
-                name
-                email
-            }
-        }
-        """
-        data = await self.execute(query)
+        data = await self.execute(ME_QUERY, fresh=True)
         if not data.get("me"):
             raise AuthenticationError("Unable to verify token")
         return data["me"]
+
+    def start_background_verification(self, warmup_connections: int = 1) -> None:
+        """Verify the token and warm up the connection pool without blocking.
+
+        Requests made before verification finishes wait for it. If the token
+        is rejected, every later request raises the AuthenticationError.
+
+        Args:
+            warmup_connections: Connections to open ahead of the first request,
+                including the one used for verification (one suffices with HTTP/2)
+        """
+        self._startup = asyncio.ensure_future(self._verify_and_warm_up(warmup_connections))
+
+    async def _verify_and_warm_up(self, warmup_connections: int) -> None:
+        """Verify the token while opening extra pooled connections."""
+        started = time.perf_counter()
+        extra = max(0, warmup_connections - 1)
+        warmup = asyncio.gather(
+            *(self.client.head(self.api_url) for _ in range(extra)), return_exceptions=True
+        )
+        try:
+            result = await self._post_once(get_operation(ME_QUERY))
+            if not (result.get("data") or {}).get("me"):
+                raise AuthenticationError("Unable to verify token")
+        except AuthenticationError as e:
+            self._startup_error = e
+            logger.error("Railway API token verification failed: %s", e)
+        except Exception as e:
+            # Requests will surface the problem themselves if it persists
+            logger.warning("Railway API token verification could not complete: %s", e)
+        finally:
+            self.startup_timings["verifiedMs"] = round((time.perf_counter() - started) * 1000, 1)
+            await warmup
+            self.startup_timings["warmupMs"] = round((time.perf_counter() - started) * 1000, 1)
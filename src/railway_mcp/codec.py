@@ -0,0 +1,55 @@
+"""JSON encoding and decoding with an optional fast backend.
+
+orjson is used when installed, then msgspec, falling back to the standard
+library. Install the ``fast`` extra to get orjson.
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+BACKEND: str
+dumps: Callable[..., bytes]
+loads: Callable[[bytes | str], Any]
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+if orjson is not None:
+    BACKEND = "orjson"
+
+    def dumps(value: Any, *, sort_keys: bool = False) -> bytes:
+        """Encode a value as compact JSON bytes."""
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+
+    loads = orjson.loads
+
+elif msgspec is not None:
+    BACKEND = "msgspec"
+    _encoder = msgspec.json.Encoder()
+    _sorted_encoder = msgspec.json.Encoder(order="sorted")
+
+    def dumps(value: Any, *, sort_keys: bool = False) -> bytes:
+        """Encode a value as compact JSON bytes."""
+        return (_sorted_encoder if sort_keys else _encoder).encode(value)
+
+    loads = msgspec.json.Decoder().decode
+
+else:
+    BACKEND = "json"
+
+    def dumps(value: Any, *, sort_keys: bool = False) -> bytes:
+        """Encode a value as compact JSON bytes."""
+        return json.dumps(
+            value, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False
+        ).encode()
+
+    loads = json.loads
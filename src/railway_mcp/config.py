@@ -1,5 +1,7 @@
 """Configuration management using Pydantic Settings."""
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -14,6 +16,83 @@ class Settings(BaseSettings):
     railway_token: str
     railway_api_url: str = "https://backboard.railway.com/graphql/v2"
 
+    # Response cache for read queries
+    cache_enabled: bool = True
+    cache_max_entries: int = 512
+    cache_ttls: dict[str, float] = {}
+
+    # Seconds past their TTL list_projects, list_services and list_environments
+    # may serve cached responses while refreshing them in the background
+    cache_max_stale: float = 0.0
+
+    # File the response cache is saved to on shutdown and restored from on
+    # startup (disabled if unset); older snapshots are not restored
+    cache_snapshot_path: str | None = None
+    cache_snapshot_max_age: float = 3600.0
+
+    # HTTP connection pool and timeouts (seconds)
+    http2: bool = False
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http_connect_timeout: float = 10.0
+    http_read_timeout: float = 30.0
+    http_write_timeout: float = 30.0
+    http_pool_timeout: float = 10.0
+
+    # Retries and client-side rate limiting
+    retry_max_attempts: int = 3
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 10.0
+    rate_limit_throttle: bool = True
+
+    # Automatic persisted queries: send document hashes instead of full text
+    persisted_queries: bool = False
+
+    # Nodes requested per page when walking list connections
+    page_size: int = 50
+
+    # Concurrent requests to the API and per-lane queue limits
+    # ("mutation", "interactive", "bulk"), merged over the defaults
+    max_concurrent_requests: int = 16
+    queue_depths: dict[str, int] = {}
+
+    # Tune the concurrency limit from latency and 429/5xx responses (AIMD),
+    # starting from max_concurrent_requests
+    adaptive_concurrency: bool = True
+    adaptive_min_concurrency: int = 1
+    adaptive_max_concurrency: int = 64
+
+    # Fail fast while the API is unavailable, probing again after a timeout
+    circuit_breaker_enabled: bool = True
+    circuit_failure_rate: float = 0.5
+    circuit_min_requests: int = 10
+    circuit_window: float = 30.0
+    circuit_reset_timeout: float = 15.0
+
+    # Seconds a tool call may run (0 disables), and per-tool overrides;
+    # callers can override both with a "timeout" field in the request _meta
+    tool_timeout: float = 60.0
+    tool_timeouts: dict[str, float] = {}
+
+    # "background" accepts requests immediately and verifies the token while
+    # opening warmup_connections pooled connections; "eager" verifies first
+    startup_mode: Literal["background", "eager"] = "background"
+    warmup_connections: int = 4
+
+    # Seconds between background refreshes of the project, service and
+    # environment index tools use to resolve names (0 disables refreshes; the
+    # index is then built by the first lookup of a name it doesn't hold)
+    topology_refresh_interval: float = 300.0
+
+    # Lines buffered per live log subscription (tail_logs), and seconds
+    # without reads after which a subscription is closed
+    log_buffer_lines: int = 1000
+    log_stream_idle_timeout: float = 300.0
+
+    # Directory export_logs writes compressed log files and their indexes to
+    log_export_dir: str = "~/.cache/railway-mcp/logs"
+
 
 def get_settings() -> Settings:
     """Get settings instance."""
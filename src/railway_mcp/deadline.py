@@ -0,0 +1,95 @@
+"""Per-call deadlines propagated from tool invocations into API requests."""
+
+import asyncio
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TypeVar
+
+import httpx
+
+from .exceptions import DeadlineExceededError
+
+T = TypeVar("T")
+
+# Absolute time.monotonic() value by which the current call must finish
+_deadline: ContextVar[float | None] = ContextVar("railway_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Iterator[None]:
+    """Bound the enclosed calls to finish within `seconds`.
+
+    Nested deadlines can only shorten the enclosing one. None leaves the
+    current deadline unchanged.
+    """
+    if seconds is None:
+        yield
+        return
+    expires_at = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        expires_at = min(expires_at, current)
+    token = _deadline.set(expires_at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Return the seconds left before the current deadline, or None without one."""
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def expired() -> bool:
+    """Check whether the current deadline has passed."""
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def request_timeout(timeout: httpx.Timeout) -> httpx.Timeout:
+    """Shorten each phase of a request timeout to the time left.
+
+    Raises:
+        DeadlineExceededError: If the deadline has already passed
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceededError("Deadline exceeded before the request was sent")
+
+    def clamp(value: float | None) -> float:
+        return left if value is None else min(value, left)
+
+    return httpx.Timeout(
+        connect=clamp(timeout.connect),
+        read=clamp(timeout.read),
+        write=clamp(timeout.write),
+        pool=clamp(timeout.pool),
+    )
+
+
+async def wait_shared(future: "asyncio.Future[T]") -> T:
+    """Wait for a task shared with other callers, up to the current deadline.
+
+    The task is shielded, so neither the deadline nor cancelling the caller
+    cancels it for the others.
+
+    Raises:
+        DeadlineExceededError: If the deadline passes before the task finishes
+    """
+    left = remaining()
+    if left is None:
+        return await asyncio.shield(future)
+    try:
+        return await asyncio.wait_for(asyncio.shield(future), max(left, 0.0))
+    except TimeoutError as e:
+        if future.done():
+            raise
+        raise DeadlineExceededError("Deadline exceeded waiting for the Railway API") from e
@@ -16,9 +16,44 @@ class AuthenticationError(RailwayError):
 class GraphQLError(RailwayError):
     """Raised when a GraphQL query fails."""
 
-    def __init__(self, message: str, errors: list | None = None):
+    def __init__(self, message: str, errors: list | None = None, status_code: int | None = None):
         super().__init__(message)
         self.errors = errors or []
+        self.status_code = status_code
+
+
+class RateLimitError(GraphQLError):
+    """Raised when the Railway API rate limit is exceeded."""
+
+    def __init__(
+        self,
+        message: str,
+        errors: list | None = None,
+        status_code: int | None = None,
+        retry_after: float | None = None,
+    ):
+        super().__init__(message, errors, status_code)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(RailwayError):
+    """Raised without contacting the API while it is considered unavailable."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(RailwayError):
+    """Raised when a tool call runs out of its time budget."""
+
+    pass
+
+
+class OverloadedError(RailwayError):
+    """Raised when too many requests are queued for the Railway API."""
+
+    pass
 
 
 class ProjectNotFoundError(RailwayError):
@@ -39,6 +74,18 @@ class EnvironmentNotFoundError(RailwayError):
     pass
 
 
+class AmbiguousNameError(RailwayError):
+    """Raised when a name matches more than one project, service or environment."""
+
+    pass
+
+
+class SubscriptionError(RailwayError):
+    """Raised when a GraphQL subscription is rejected or fails."""
+
+    pass
+
+
 class ConfigurationError(RailwayError):
     """Raised when configuration is invalid."""
 
@@ -1,4 +1,5 @@
-"""GraphQL queries and mutations for Railway API."""
+"""GraphQL queries, mutations and subscriptions for Railway API."""
 
 from .mutations import *  # noqa: F403
 from .queries import *  # noqa: F403
+from .subscriptions import *  # noqa: F403
@@ -13,9 +13,9 @@ query Me {
 
 # Project queries
 LIST_PROJECTS_QUERY = """
-query ListProjects {
+query ListProjects($first: Int, $after: String) {
     me {
-        projects {
+        projects(first: $first, after: $after) {
             edges {
                 node {
                     id
@@ -30,6 +30,9 @@ query ListProjects {
                                 name
                             }
                         }
+                        pageInfo {
+                            hasNextPage
+                        }
                     }
                     services {
                         edges {
@@ -38,9 +41,16 @@ query ListProjects {
                                 name
                             }
                         }
+                        pageInfo {
+                            hasNextPage
+                        }
                     }
                 }
             }
+            pageInfo {
+                hasNextPage
+                endCursor
+            }
         }
     }
 }
@@ -76,9 +86,9 @@ query GetProject($projectId: String!) {
 
 # Service queries
 LIST_SERVICES_QUERY = """
-query ListServices($projectId: String!) {
+query ListServices($projectId: String!, $first: Int, $after: String) {
     project(id: $projectId) {
-        services {
+        services(first: $first, after: $after) {
             edges {
                 node {
                     id
@@ -88,6 +98,10 @@ query ListServices($projectId: String!) {
                     updatedAt
                 }
             }
+            pageInfo {
+                hasNextPage
+                endCursor
+            }
         }
     }
 }
@@ -108,9 +122,9 @@ query GetService($serviceId: String!) {
 
 # Environment queries
 LIST_ENVIRONMENTS_QUERY = """
-query ListEnvironments($projectId: String!) {
+query ListEnvironments($projectId: String!, $first: Int, $after: String) {
     project(id: $projectId) {
-        environments {
+        environments(first: $first, after: $after) {
             edges {
                 node {
                     id
@@ -119,6 +133,10 @@ query ListEnvironments($projectId: String!) {
                     updatedAt
                 }
             }
+            pageInfo {
+                hasNextPage
+                endCursor
+            }
         }
     }
 }
@@ -126,13 +144,19 @@ query ListEnvironments($projectId: String!) {
 
 # Deployment queries
 LIST_DEPLOYMENTS_QUERY = """
-query ListDeployments($serviceId: String!, $environmentId: String!, $first: Int) {
+query ListDeployments(
+    $serviceId: String!
+    $environmentId: String!
+    $first: Int
+    $after: String
+) {
     deployments(
         input: {
             serviceId: $serviceId
             environmentId: $environmentId
         }
         first: $first
+        after: $after
     ) {
         edges {
             node {
@@ -144,6 +168,10 @@ query ListDeployments($serviceId: String!, $environmentId: String!, $first: Int)
                 meta
             }
         }
+        pageInfo {
+            hasNextPage
+            endCursor
+        }
     }
 }
 """
@@ -174,8 +202,18 @@ query ListVariables($projectId: String!, $environmentId: String!, $serviceId: St
 
 # Logs queries
 GET_BUILD_LOGS_QUERY = """
-query GetBuildLogs($deploymentId: String!, $limit: Int) {
-    buildLogs(deploymentId: $deploymentId, limit: $limit) {
+query GetBuildLogs(
+    $deploymentId: String!
+    $limit: Int
+    $startDate: DateTime
+    $endDate: DateTime
+) {
+    buildLogs(
+        deploymentId: $deploymentId
+        limit: $limit
+        startDate: $startDate
+        endDate: $endDate
+    ) {
         message
         timestamp
         severity
@@ -184,8 +222,18 @@ query GetBuildLogs($deploymentId: String!, $limit: Int) {
 """
 
 GET_DEPLOYMENT_LOGS_QUERY = """
-query GetDeploymentLogs($deploymentId: String!, $limit: Int) {
-    deploymentLogs(deploymentId: $deploymentId, limit: $limit) {
+query GetDeploymentLogs(
+    $deploymentId: String!
+    $limit: Int
+    $startDate: DateTime
+    $endDate: DateTime
+) {
+    deploymentLogs(
+        deploymentId: $deploymentId
+        limit: $limit
+        startDate: $startDate
+        endDate: $endDate
+    ) {
         message
         timestamp
         severity
@@ -226,8 +274,8 @@ query ListDomains($projectId: String!, $environmentId: String!, $serviceId: Stri
 
 # Template queries
 LIST_TEMPLATES_QUERY = """
-query ListTemplates($first: Int) {
-    templates(first: $first) {
+query ListTemplates($first: Int, $after: String) {
+    templates(first: $first, after: $after) {
         edges {
             node {
                 id
@@ -239,6 +287,10 @@ query ListTemplates($first: Int) {
                 activeProjects
             }
         }
+        pageInfo {
+            hasNextPage
+            endCursor
+        }
     }
 }
 """
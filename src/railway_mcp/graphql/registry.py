@@ -0,0 +1,155 @@
+"""Registry of the GraphQL documents sent to the Railway API.
+
+Every query, mutation and subscription constant is minified and analysed
+once at import, so the request path only has to look up a precompiled
+Operation and splice the variables into its pre-encoded JSON payload.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from .. import codec
+from . import mutations, queries, subscriptions
+
+_TOKEN_RE = re.compile(
+    r'"""[\s\S]*?"""'  # block string
+    r'|"(?:\\.|[^"\\])*"'  # string
+    r"|#[^\n]*"  # comment
+    r"|\.\.\."  # spread
+    r"|-?[_0-9A-Za-z][_0-9A-Za-z.+-]*"  # name, keyword or number
+    r"|[!$&()\[\]{}:=@|]"  # punctuator
+)
+_VARIABLE_RE = re.compile(r"\$(\w+):")
+_OPERATION_KINDS = frozenset({"query", "mutation", "subscription"})
+
+
+def minify(document: str) -> str:
+    """Strip insignificant whitespace, commas and comments from a document."""
+    parts: list[str] = []
+    previous_is_word = False
+    for token in _TOKEN_RE.findall(document):
+        if token.startswith("#"):
+            continue
+        is_word = token[0] not in '!$&()[]{}:=@|."'
+        if is_word and previous_is_word:
+            parts.append(" ")
+        parts.append(token)
+        previous_is_word = is_word
+    return "".join(parts)
+
+
+@dataclass(frozen=True, slots=True)
+class Operation:
+    """A precompiled GraphQL operation."""
+
+    name: str | None
+    kind: str
+    document: str
+    variables: tuple[str, ...]
+    sha256: str
+    query_prefix: bytes
+    hash_prefix: bytes
+    query_hash_prefix: bytes
+
+    @property
+    def is_mutation(self) -> bool:
+        """Whether the operation is a mutation."""
+        return self.kind == "mutation"
+
+    @classmethod
+    def compile(cls, document: str) -> "Operation":
+        """Minify a document and precompute its metadata and payload prefixes."""
+        minified = minify(document)
+        head = minified.split("{", 1)[0]
+        words = re.findall(r"\w+", head)
+        kind = words[0] if words and words[0] in _OPERATION_KINDS else "query"
+        name = words[1] if len(words) > 1 and not head.startswith(f"{kind}(") else None
+        sha256 = hashlib.sha256(minified.encode()).hexdigest()
+
+        envelope: dict[str, Any] = {"query": minified}
+        if name:
+            envelope["operationName"] = name
+        extensions = {"persistedQuery": {"version": 1, "sha256Hash": sha256}}
+        hashed = {key: value for key, value in envelope.items() if key != "query"}
+
+        # Pre-encoded JSON objects without the closing brace
+        return cls(
+            name=name,
+            kind=kind,
+            document=minified,
+            variables=tuple(_VARIABLE_RE.findall(head)),
+            sha256=sha256,
+            query_prefix=codec.dumps(envelope)[:-1],
+            hash_prefix=codec.dumps({**hashed, "extensions": extensions})[:-1],
+            query_hash_prefix=codec.dumps({**envelope, "extensions": extensions})[:-1],
+        )
+
+    def payload(
+        self,
+        variables: dict[str, Any] | None,
+        *,
+        persisted: bool = False,
+        include_query: bool = True,
+    ) -> bytes:
+        """Build the JSON request body for this operation.
+
+        Args:
+            variables: Operation variables
+            persisted: Include the persisted query extension
+            include_query: Include the document text (ignored unless persisted)
+        """
+        if not persisted:
+            prefix = self.query_prefix
+        elif include_query:
+            prefix = self.query_hash_prefix
+        else:
+            prefix = self.hash_prefix
+        if not variables:
+            return prefix + b"}"
+        return prefix + b',"variables":' + codec.dumps(variables) + b"}"
+
+
+def _compile_constants() -> dict[str, Operation]:
+    """Compile every operation constant, keyed by its source text."""
+    operations = {}
+    for module in (queries, mutations, subscriptions):
+        for name, value in vars(module).items():
+            if name.endswith(("_QUERY", "_MUTATION", "_SUBSCRIPTION")) and isinstance(value, str):
+                operations[value] = Operation.compile(value)
+    return operations
+
+
+OPERATIONS: dict[str, Operation] = _compile_constants()
+OPERATIONS_BY_NAME: dict[str, Operation] = {
+    operation.name: operation for operation in OPERATIONS.values() if operation.name
+}
+
+
+@lru_cache(maxsize=256)
+def _compile_adhoc(document: str) -> Operation:
+    return Operation.compile(document)
+
+
+def get_operation(document: str) -> Operation:
+    """Return the precompiled operation for a document.
+
+    Documents that are not registry constants are compiled on first use and
+    memoized.
+    """
+    operation = OPERATIONS.get(document)
+    if operation is None:
+        operation = _compile_adhoc(document)
+    return operation
+
+
+def operation_name(document: str) -> str | None:
+    """Return the operation name of a document."""
+    return get_operation(document).name
+
+
+def is_mutation(document: str) -> bool:
+    """Check whether a document is a mutation."""
+    return get_operation(document).is_mutation
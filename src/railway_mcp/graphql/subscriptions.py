@@ -0,0 +1,22 @@
+"""GraphQL subscriptions for Railway API."""
+
+# Log subscriptions: each event carries the lines logged since the previous one
+DEPLOYMENT_LOGS_SUBSCRIPTION = """
+subscription StreamDeploymentLogs($deploymentId: String!, $limit: Int) {
+    deploymentLogs(deploymentId: $deploymentId, limit: $limit) {
+        message
+        timestamp
+        severity
+    }
+}
+"""
+
+BUILD_LOGS_SUBSCRIPTION = """
+subscription StreamBuildLogs($deploymentId: String!, $limit: Int) {
+    buildLogs(deploymentId: $deploymentId, limit: $limit) {
+        message
+        timestamp
+        severity
+    }
+}
+"""
@@ -0,0 +1,242 @@
+"""Batching loader that resolves per-ID lookups in a single GraphQL request."""
+
+import asyncio
+import contextvars
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from . import deadline
+from .exceptions import DeadlineExceededError, GraphQLError
+from .graphql.queries import GET_DEPLOYMENT_QUERY, GET_PROJECT_QUERY, GET_SERVICE_QUERY
+from .graphql.registry import get_operation, operation_name
+
+if TYPE_CHECKING:
+    from .client import RailwayClient
+
+
+def _root_selection(document: str) -> str:
+    """Return the selection set of the first root field of a document."""
+    start = document.index("{", document.index("{") + 1)
+    depth = 0
+    for index in range(start, len(document)):
+        if document[index] == "{":
+            depth += 1
+        elif document[index] == "}":
+            depth -= 1
+            if depth == 0:
+                return " ".join(document[start : index + 1].split())
+    raise ValueError("Unbalanced braces in GraphQL document")
+
+
+@dataclass(frozen=True)
+class BatchKind:
+    """A root field that can be looked up by ID and batched with aliases."""
+
+    field: str
+    alias_prefix: str
+    selection: str
+    operation: str
+    variable: str
+
+
+BATCH_KINDS: dict[str, BatchKind] = {
+    "service": BatchKind(
+        field="service",
+        alias_prefix="s",
+        selection=_root_selection(GET_SERVICE_QUERY),
+        operation=operation_name(GET_SERVICE_QUERY),
+        variable="serviceId",
+    ),
+    "deployment": BatchKind(
+        field="deployment",
+        alias_prefix="d",
+        selection=_root_selection(GET_DEPLOYMENT_QUERY),
+        operation=operation_name(GET_DEPLOYMENT_QUERY),
+        variable="deploymentId",
+    ),
+    "project": BatchKind(
+        field="project",
+        alias_prefix="p",
+        selection=_root_selection(GET_PROJECT_QUERY),
+        operation=operation_name(GET_PROJECT_QUERY),
+        variable="projectId",
+    ),
+}
+
+
+def build_batch_document(keys: list[tuple[str, str]]) -> tuple[str, dict[str, str], list[str]]:
+    """Compile lookups into one aliased GraphQL document.
+
+    Args:
+        keys: (kind, id) pairs to resolve
+
+    Returns:
+        The document, its variables and the alias assigned to each key
+    """
+    counters: dict[str, int] = {}
+    declarations = []
+    fields = []
+    variables = {}
+    aliases = []
+    for kind_name, item_id in keys:
+        kind = BATCH_KINDS[kind_name]
+        number = counters.get(kind.alias_prefix, 0)
+        counters[kind.alias_prefix] = number + 1
+        alias = f"{kind.alias_prefix}{number}"
+        declarations.append(f"${alias}: String!")
+        fields.append(f"{alias}: {kind.field}(id: ${alias}) {kind.selection}")
+        variables[alias] = item_id
+        aliases.append(alias)
+    document = f"query Batch({', '.join(declarations)}) {{ {' '.join(fields)} }}"
+    return document, variables, aliases
+
+
+class BatchLoader:
+    """Collect ID lookups made within one event-loop tick and send them together."""
+
+    def __init__(self, client: "RailwayClient", max_batch_size: int = 50):
+        """Initialize the loader.
+
+        Args:
+            client: Railway API client used to send batches
+            max_batch_size: Maximum number of aliased fields per request
+        """
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.batches_sent = 0
+        self._pending: dict[tuple[str, str], asyncio.Future[dict[str, Any] | None]] = {}
+        # Callers waiting on each lookup; a lookup is cancelled when its last caller leaves
+        self._waiters: dict[asyncio.Future[dict[str, Any] | None], int] = {}
+        self._scheduled = False
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, kind: str, item_id: str) -> dict[str, Any] | None:
+        """Resolve a single object by ID.
+
+        Args:
+            kind: One of "service", "deployment" or "project"
+            item_id: Object ID
+
+        Returns:
+            The object's fields, or None if it does not exist
+
+        Raises:
+            GraphQLError: If the lookup for this ID failed
+            DeadlineExceededError: If the current deadline passes first
+        """
+        batch_kind = BATCH_KINDS.get(kind)
+        if batch_kind is None:
+            raise ValueError(f"Unsupported batch kind '{kind}'")
+
+        cache = self.client.cache
+        if cache is not None:
+            cached = cache.get(batch_kind.operation, {batch_kind.variable: item_id})
+            if cached is not None:
+                return cached.get(batch_kind.field)
+
+        if deadline.expired():
+            raise DeadlineExceededError("Deadline exceeded before the request was sent")
+        key = (kind, item_id)
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            # Retrieve the outcome even if every caller has been cancelled
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._pending[key] = future
+            if not self._scheduled:
+                self._scheduled = True
+                asyncio.get_running_loop().call_soon(self._dispatch)
+        self._waiters[future] = self._waiters.get(future, 0) + 1
+        try:
+            return await deadline.wait_shared(future)
+        finally:
+            self._waiters[future] -= 1
+            if not self._waiters[future]:
+                del self._waiters[future]
+                if not future.done():
+                    future.cancel()
+
+    async def load_many(self, kind: str, item_ids: list[str]) -> list[dict[str, Any] | None]:
+        """Resolve several objects by ID in as few requests as possible."""
+        return list(await asyncio.gather(*(self.load(kind, item_id) for item_id in item_ids)))
+
+    def _dispatch(self) -> None:
+        """Send every lookup queued during the current tick."""
+        pending = self._pending
+        self._pending = {}
+        self._scheduled = False
+        # Lookups whose callers have all left are not sent
+        items = [(key, future) for key, future in pending.items() if not future.done()]
+        for start in range(0, len(items), self.max_batch_size):
+            batch = dict(items[start : start + self.max_batch_size])
+            # Run outside the first caller's context: each waiter applies its own deadline
+            task = asyncio.get_running_loop().create_task(
+                self._run_batch(batch), context=contextvars.Context()
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            for future in batch.values():
+                future.add_done_callback(
+                    lambda _, batch=batch, task=task: _cancel_abandoned(batch, task)
+                )
+
+    async def _run_batch(
+        self, batch: dict[tuple[str, str], asyncio.Future[dict[str, Any] | None]]
+    ) -> None:
+        """Send one batch and route each aliased result back to its caller."""
+        keys = list(batch)
+        document, variables, aliases = build_batch_document(keys)
+        cache = self.client.cache
+        generation = cache.generation if cache is not None else None
+        self.batches_sent += 1
+        try:
+            # Batch documents are assembled per call, so the API never has them
+            # as persisted queries
+            result = await self.client._post(get_operation(document), variables, persisted=False)
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        data = result.get("data") or {}
+        errors_by_alias: dict[str, list[dict[str, Any]]] = {}
+        global_errors = []
+        for error in result.get("errors") or []:
+            path = error.get("path") or []
+            if path and path[0] in variables:
+                errors_by_alias.setdefault(path[0], []).append(error)
+            else:
+                global_errors.append(error)
+
+        for key, alias in zip(keys, aliases, strict=True):
+            future = batch[key]
+            if future.done():
+                continue
+            errors = errors_by_alias.get(alias) or global_errors
+            if errors:
+                message = errors[0].get("message", "Unknown GraphQL error")
+                future.set_exception(GraphQLError(message, errors))
+                continue
+            value = data.get(alias)
+            batch_kind = BATCH_KINDS[key[0]]
+            if cache is not None and value is not None:
+                cache.set(
+                    batch_kind.operation,
+                    {batch_kind.variable: key[1]},
+                    {batch_kind.field: value},
+                    generation=generation,
+                )
+            future.set_result(value)
+
+
+def _cancel_abandoned(
+    batch: dict[tuple[str, str], asyncio.Future[dict[str, Any] | None]], task: asyncio.Task[None]
+) -> None:
+    """Cancel a batch request once every lookup in it has been cancelled."""
+    if all(future.cancelled() for future in batch.values()):
+        task.cancel()
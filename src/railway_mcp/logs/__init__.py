@@ -0,0 +1,17 @@
+"""Log streaming and processing."""
+
+from .compact import LogCompactor
+from .cursor import LogWatermarks
+from .export import LogArchive
+from .filters import LogFilter
+from .stream import LogBuffer, LogStreams, LogSubscription
+
+__all__ = [
+    "LogArchive",
+    "LogBuffer",
+    "LogCompactor",
+    "LogFilter",
+    "LogStreams",
+    "LogSubscription",
+    "LogWatermarks",
+]
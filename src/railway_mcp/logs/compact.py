@@ -0,0 +1,153 @@
+"""Compaction of noisy logs.
+
+Runs of identical lines collapse into one line with a count, and other lines
+are grouped by their template: the message with numbers, hashes, IDs, paths,
+URLs and progress bars masked. Each template is reported once, at its first
+occurrence, with the number of lines it covers and their first and last
+timestamps. Error lines are kept verbatim. Each line is handled in constant
+time, and memory is bounded by the number of templates and verbatim lines
+kept rather than the length of the log.
+"""
+
+import re
+from collections.abc import Iterable
+from typing import Any
+
+from .filters import severity_level
+
+ERROR_LEVEL = severity_level("error")
+
+_MASK_RE = re.compile(
+    r"(?P<url>\b[a-z][a-z0-9+.-]*://\S+)"
+    r"|(?P<uuid>\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b)"
+    r"|(?P<path>(?:~|\.{1,2})?(?:/[\w.@+-]+){2,}/?)"
+    r"|(?P<hex>\b(?=[0-9a-f]*\d)(?=[0-9a-f]*[a-f])[0-9a-f]{7,}\b)"
+    r"|(?P<num>\d+(?:[.:,]\d+)*)"
+    r"|(?P<bar>(?P<barchar>[#=*.>_\-━─█░▒▓■])(?P=barchar){2,})"
+    r"|(?P<space>\s{2,})",
+    re.IGNORECASE,
+)
+
+
+def _mask(match: re.Match[str]) -> str:
+    kind = match.lastgroup
+    return " " if kind == "space" else f"<{kind}>"
+
+
+def template(message: str) -> str:
+    """Return a message with its variable parts masked."""
+    return _MASK_RE.sub(_mask, message).strip()
+
+
+class LogCompactor:
+    """Incrementally compacts a stream of log lines."""
+
+    def __init__(self, max_templates: int = 200, max_verbatim: int = 500):
+        """Initialize an empty compactor.
+
+        Args:
+            max_templates: Templates tracked; lines of further templates are
+                counted together in one overflow entry
+            max_verbatim: Error lines kept verbatim; further ones are grouped
+                by template like other lines
+        """
+        self.max_templates = max_templates
+        self.max_verbatim = max_verbatim
+        self.lines = 0
+        self._entries: list[dict[str, Any]] = []
+        self._groups: dict[tuple[str | None, str], dict[str, Any]] = {}
+        self._overflow: dict[str, Any] | None = None
+        self._verbatim = 0
+        self._previous: dict[str, Any] | None = None
+        self._previous_key: tuple[str | None, str | None] | None = None
+
+    def add(self, line: dict[str, Any]) -> None:
+        """Add the next line of the log."""
+        self.lines += 1
+        message = line.get("message") or ""
+        severity = line.get("severity")
+        timestamp = line.get("timestamp")
+
+        # Consecutive duplicates extend the entry they were added to
+        key = (severity, message)
+        if key == self._previous_key and self._previous is not None:
+            _count(self._previous, timestamp)
+            return
+
+        if severity_level(severity) >= ERROR_LEVEL and self._verbatim < self.max_verbatim:
+            self._verbatim += 1
+            entry = dict(line)
+            self._entries.append(entry)
+        else:
+            entry = self._group(severity, message, line)
+            _count(entry, timestamp)
+        self._previous, self._previous_key = entry, key
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Return the compacted log in order of first occurrence.
+
+        Templates seen once come back as the original line. Other entries,
+        including the overflow entry, carry the template, an example
+        message, the number of lines and their first and last timestamps;
+        verbatim lines repeated in a row carry a count.
+        """
+        result = []
+        for entry in self._entries:
+            if entry.get("count") == 1 and "template" in entry and entry is not self._overflow:
+                entry = {
+                    key: value
+                    for key, value in entry.items()
+                    if key not in ("template", "count", "firstTimestamp", "lastTimestamp")
+                }
+            result.append(entry)
+        return result
+
+    def _group(self, severity: str | None, message: str, line: dict[str, Any]) -> dict[str, Any]:
+        key = (severity, template(message))
+        entry = self._groups.get(key)
+        if entry is not None:
+            return entry
+        if len(self._groups) >= self.max_templates:
+            if self._overflow is None:
+                self._overflow = {
+                    "template": "<other>",
+                    "message": message,
+                    "timestamp": line.get("timestamp"),
+                    "count": 0,
+                }
+                self._entries.append(self._overflow)
+            return self._overflow
+        entry = {**line, "template": key[1], "count": 0}
+        self._groups[key] = entry
+        self._entries.append(entry)
+        return entry
+
+
+def _count(entry: dict[str, Any], timestamp: str | None) -> None:
+    """Add a line to an entry's count and timestamp range.
+
+    Template entries start at 0 and verbatim lines at an implicit 1.
+    """
+    entry["count"] = entry.get("count", 1) + 1
+    if timestamp is not None:
+        entry.setdefault("firstTimestamp", entry.get("timestamp") or timestamp)
+        entry["lastTimestamp"] = timestamp
+
+
+def compact_log(
+    lines: Iterable[dict[str, Any]], max_templates: int = 200, max_verbatim: int = 500
+) -> dict[str, Any]:
+    """Compact a log.
+
+    Args:
+        lines: Lines in log order
+        max_templates: Templates tracked before lines are counted as "<other>"
+        max_verbatim: Error lines kept verbatim
+
+    Returns:
+        Dictionary with the compacted entries and the number of lines read
+    """
+    compactor = LogCompactor(max_templates, max_verbatim)
+    for line in lines:
+        compactor.add(line)
+    return {"logs": compactor.entries(), "totalLines": compactor.lines}
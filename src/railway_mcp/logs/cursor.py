@@ -0,0 +1,194 @@
+"""Timestamp watermarks for fetching only new log lines.
+
+A cursor names the newest timestamp a caller has seen plus a digest of the
+lines logged at exactly that timestamp. get_logs asks the API for lines from
+the watermark on and drops the ones the caller already has: everything
+older than the watermark, and lines at the watermark whose hashes are
+remembered under the cursor's digest. Those hashes are kept server-side in
+a bounded LRU per deployment, so cursors stay short. If a cursor's state has
+been evicted, lines at the watermark are returned again rather than risk
+dropping new ones.
+"""
+
+import base64
+import hashlib
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+
+def timestamp_key(timestamp: str) -> str:
+    """Return a key ordering RFC 3339 UTC timestamps of any fractional precision."""
+    head, _, fraction = timestamp.removesuffix("Z").partition(".")
+    return f"{head}.{fraction:0<9}"
+
+
+def line_hash(line: dict[str, Any]) -> str:
+    """Return a short hash identifying a log line."""
+    key = f"{line.get('timestamp')}\0{line.get('severity')}\0{line.get('message')}"
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+
+def encode_cursor(timestamp: str, digest: str) -> str:
+    """Encode a watermark as an opaque cursor."""
+    return base64.urlsafe_b64encode(f"{timestamp}|{digest}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Decode a cursor into its timestamp and digest.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        text = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, digest = text.split("|")
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor '{cursor}'") from e
+    return timestamp, digest
+
+
+class LogWatermarks:
+    """Bounded LRU of the lines seen at each cursor's watermark, per deployment."""
+
+    def __init__(self, max_deployments: int = 256, cursors_per_deployment: int = 8):
+        """Initialize empty state.
+
+        Args:
+            max_deployments: Deployments (and log types) to keep state for
+            cursors_per_deployment: Cursors remembered per deployment, so
+                several callers can follow the same log
+        """
+        self.max_deployments = max_deployments
+        self.cursors_per_deployment = cursors_per_deployment
+        self.duplicates_dropped = 0
+        self._state: OrderedDict[Any, OrderedDict[str, frozenset[str]]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def filter(
+        self, key: Any, cursor: str | None, lines: Iterable[dict[str, Any]]
+    ) -> Iterator[dict[str, Any]]:
+        """Drop lines the caller has seen according to a cursor.
+
+        Args:
+            key: Deployment and log type the cursor belongs to
+            cursor: Cursor from a previous call, or None to keep every line
+            lines: Lines fetched from the watermark on
+
+        Returns:
+            Iterator over the lines newer than the cursor, in their original order
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        if cursor is None:
+            return iter(lines)
+        timestamp, digest = decode_cursor(cursor)
+        cursors = self._state.get(key)
+        seen = cursors.get(digest) if cursors is not None else None
+        if cursors is not None:
+            self._state.move_to_end(key)
+        return self._fresh(lines, timestamp_key(timestamp), seen)
+
+    def _fresh(
+        self, lines: Iterable[dict[str, Any]], watermark: str, seen: frozenset[str] | None
+    ) -> Iterator[dict[str, Any]]:
+        """Yield the lines after a watermark, and those at it not in `seen`."""
+        for line in lines:
+            line_timestamp = line.get("timestamp")
+            if line_timestamp is not None:
+                line_key = timestamp_key(line_timestamp)
+                if line_key < watermark or (
+                    line_key == watermark and seen is not None and line_hash(line) in seen
+                ):
+                    self.duplicates_dropped += 1
+                    continue
+            yield line
+
+    def advance(self, key: Any, cursor: str | None) -> "CursorAdvance":
+        """Start building the cursor that follows a batch of lines.
+
+        Args:
+            key: Deployment and log type
+            cursor: Cursor the batch was fetched with
+
+        Returns:
+            Tracker to pass the returned lines through
+        """
+        return CursorAdvance(self, key, cursor)
+
+    def _seen(self, key: Any, digest: str) -> frozenset[str]:
+        """Return the hashes remembered under a cursor's digest, if still kept."""
+        cursors = self._state.get(key)
+        return cursors.get(digest, frozenset()) if cursors is not None else frozenset()
+
+    def _remember(self, key: Any, hashes: frozenset[str]) -> str:
+        """Store the hashes seen at a watermark and return their digest."""
+        digest = hashlib.blake2b("".join(sorted(hashes)).encode(), digest_size=6).hexdigest()
+        cursors = self._state.get(key)
+        if cursors is None:
+            cursors = self._state[key] = OrderedDict()
+            while len(self._state) > self.max_deployments:
+                self._state.popitem(last=False)
+        else:
+            self._state.move_to_end(key)
+        cursors[digest] = hashes
+        cursors.move_to_end(digest)
+        while len(cursors) > self.cursors_per_deployment:
+            cursors.popitem(last=False)
+        return digest
+
+
+class CursorAdvance:
+    """The newest timestamp of lines streamed to a caller, and the lines at it.
+
+    Lines at the new watermark that were already seen under the previous
+    cursor are included, so the new cursor covers everything returned.
+    """
+
+    def __init__(self, watermarks: LogWatermarks, key: Any, cursor: str | None):
+        """Initialize a tracker.
+
+        Args:
+            watermarks: State the new cursor is remembered in
+            key: Deployment and log type
+            cursor: Cursor the batch was fetched with
+        """
+        self.watermarks = watermarks
+        self.key = key
+        self.previous = cursor
+        self._watermark: str | None = None
+        self._watermark_key = ""
+        self._hashes: set[str] = set()
+
+    def track(self, lines: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        """Yield lines unchanged, noting the newest timestamp among them."""
+        for line in lines:
+            timestamp = line.get("timestamp")
+            if timestamp is not None:
+                key = timestamp_key(timestamp)
+                if self._watermark is None or key > self._watermark_key:
+                    self._watermark, self._watermark_key = timestamp, key
+                    self._hashes = {line_hash(line)}
+                elif key == self._watermark_key:
+                    self._hashes.add(line_hash(line))
+            yield line
+
+    def cursor(self) -> str | None:
+        """Return the cursor after the lines tracked and remember its state.
+
+        Returns:
+            The cursor for the next call, or the previous cursor if no line
+            had a timestamp
+        """
+        if self._watermark is None:
+            return self.previous
+        hashes = self._hashes
+        if self.previous is not None:
+            previous, digest = decode_cursor(self.previous)
+            if timestamp_key(previous) == self._watermark_key:
+                hashes = hashes | self.watermarks._seen(self.key, digest)
+        digest = self.watermarks._remember(self.key, frozenset(hashes))
+        return encode_cursor(self._watermark, digest)
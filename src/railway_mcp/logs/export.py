@@ -0,0 +1,199 @@
+"""Exported logs on local disk, searchable without the API.
+
+An export is newline-delimited JSON written as a series of independent gzip
+members of `block_lines` lines each, which together still form a valid
+.ndjson.gz file. A sidecar index records each block's byte offset and
+length, time range and highest severity. Searches memory-map the file and
+decompress only the blocks whose time range and severity can match.
+
+Both files are written under unique temporary names and renamed into place,
+data first and index last. The index records the data file's size, so an
+index paired with another writer's data file is rejected on open.
+"""
+
+import gzip
+import mmap
+import os
+import re
+import tempfile
+import time
+import zlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from .. import codec
+from .cursor import timestamp_key
+from .filters import LogFilter, severity_level
+
+# Bump when the file or index layout changes
+EXPORT_VERSION = 1
+
+_SAFE_NAME_RE = re.compile(r"^[\w.-]+$")
+
+
+def export_path(directory: str | Path, deployment_id: str, log_type: str) -> Path:
+    """Return the file a deployment's logs are exported to.
+
+    Raises:
+        ValueError: If the deployment ID is not safe to use in a file name
+    """
+    if not _SAFE_NAME_RE.match(deployment_id) or deployment_id.startswith("."):
+        raise ValueError(f"Invalid deployment ID '{deployment_id}'")
+    return Path(directory).expanduser() / f"{deployment_id}.{log_type}.ndjson.gz"
+
+
+class LogArchive:
+    """An exported log file and its block index."""
+
+    def __init__(self, path: str | Path):
+        """Open an export by reading its index.
+
+        Raises:
+            FileNotFoundError: If the export or its index doesn't exist
+            ValueError: If the index was written by another version or
+                doesn't describe the export file
+        """
+        self.path = Path(path)
+        self.index = codec.loads(self.index_path(self.path).read_bytes())
+        if self.index.get("version") != EXPORT_VERSION:
+            raise ValueError(f"Unsupported log export version in {self.path}")
+        if self.path.stat().st_size != self.index.get("bytes"):
+            raise ValueError(f"Log export {self.path} doesn't match its index; export it again")
+        self.blocks_read = 0
+
+    @staticmethod
+    def index_path(path: Path) -> Path:
+        """Return the sidecar index path for an export."""
+        return path.with_name(path.name.removesuffix(".ndjson.gz") + ".index.json")
+
+    @classmethod
+    def write(
+        cls,
+        path: str | Path,
+        lines: Iterable[dict[str, Any]],
+        block_lines: int = 256,
+        **metadata: Any,
+    ) -> "LogArchive":
+        """Write lines to an export and its index, replacing any previous one.
+
+        Args:
+            path: Export file path; parent directories are created
+            lines: Lines in log order
+            block_lines: Lines per independently compressed block
+            **metadata: Extra fields stored in the index
+
+        Returns:
+            The written export
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(
+            prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+        )
+        index_descriptor, index_temporary = tempfile.mkstemp(
+            prefix=f".{cls.index_path(path).name}.", suffix=".tmp", dir=path.parent
+        )
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                blocks, total = _write_blocks(file, lines, block_lines)
+                size = file.tell()
+            index = {
+                "version": EXPORT_VERSION,
+                **metadata,
+                "exportedAt": time.time(),
+                "lines": total,
+                "bytes": size,
+                "blocks": blocks,
+            }
+            with os.fdopen(index_descriptor, "wb") as file:
+                file.write(codec.dumps(index))
+            Path(temporary).replace(path)
+            Path(index_temporary).replace(cls.index_path(path))
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            Path(index_temporary).unlink(missing_ok=True)
+            raise
+        return cls(path)
+
+    def search(
+        self, log_filter: LogFilter, max_matches: int | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Yield lines matching a filter, reading only blocks that can match.
+
+        Context lines don't reach into skipped blocks.
+
+        Args:
+            log_filter: Criteria and context
+            max_matches: Stop after this many matches
+        """
+        yield from log_filter.apply(self._lines(log_filter), max_matches)
+
+    def _lines(self, log_filter: LogFilter) -> Iterator[dict[str, Any]]:
+        if not self.index["blocks"]:
+            return
+        level = severity_level(log_filter.min_severity) if log_filter.min_severity else 0
+        start = timestamp_key(log_filter.start) if log_filter.start else None
+        end = timestamp_key(log_filter.end) if log_filter.end else None
+        with (
+            self.path.open("rb") as file,
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view,
+        ):
+            for block in self.index["blocks"]:
+                if block["maxSeverity"] < level:
+                    continue
+                if block["first"] is not None and block["last"] is not None:
+                    if end is not None and timestamp_key(block["first"]) >= end:
+                        continue
+                    if start is not None and timestamp_key(block["last"]) < start:
+                        continue
+                offset, length = block["offset"], block["length"]
+                data = zlib.decompress(view[offset : offset + length], wbits=31)
+                self.blocks_read += 1
+                for raw in data.splitlines():
+                    yield codec.loads(raw)
+
+
+def _write_blocks(
+    file: Any, lines: Iterable[dict[str, Any]], block_lines: int
+) -> tuple[list[dict[str, Any]], int]:
+    """Write lines as compressed blocks, returning the index entries and line count."""
+    blocks: list[dict[str, Any]] = []
+    total = 0
+    block: list[bytes] = []
+    first = last = None
+    level = 0
+    for line in lines:
+        block.append(codec.dumps(line) + b"\n")
+        timestamp = line.get("timestamp")
+        if timestamp is not None:
+            key = timestamp_key(timestamp)
+            if first is None or key < timestamp_key(first):
+                first = timestamp
+            if last is None or key > timestamp_key(last):
+                last = timestamp
+        level = max(level, severity_level(line.get("severity")))
+        if len(block) == block_lines:
+            blocks.append(_write_block(file, block, first, last, level))
+            total += len(block)
+            block, first, last, level = [], None, None, 0
+    if block:
+        blocks.append(_write_block(file, block, first, last, level))
+        total += len(block)
+    return blocks, total
+
+
+def _write_block(
+    file: Any, block: list[bytes], first: str | None, last: str | None, level: int
+) -> dict[str, Any]:
+    """Compress and append one block, returning its index entry."""
+    offset = file.tell()
+    file.write(gzip.compress(b"".join(block), compresslevel=6))
+    return {
+        "offset": offset,
+        "length": file.tell() - offset,
+        "lines": len(block),
+        "first": first,
+        "last": last,
+        "maxSeverity": level,
+    }
@@ -0,0 +1,167 @@
+"""Log line filtering by severity, time window and text.
+
+Filters run as a single pass over an iterable of lines, holding at most
+`context` lines back for the context before a match, so a log is never
+copied or materialized to be searched.
+"""
+
+import re
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import lru_cache
+from typing import Any
+
+from .cursor import timestamp_key
+
+# Severity ranks; lines with an unknown severity rank as info
+SEVERITY_LEVELS = {
+    "debug": 10,
+    "info": 20,
+    "warn": 30,
+    "warning": 30,
+    "error": 40,
+    "err": 40,
+    "fatal": 50,
+    "critical": 50,
+}
+
+
+def severity_level(severity: str | None) -> int:
+    """Return the rank of a severity name."""
+    return SEVERITY_LEVELS.get(severity.lower(), 20) if severity else 20
+
+
+def parse_time(value: str) -> str:
+    """Normalize an ISO 8601 time to an RFC 3339 UTC timestamp.
+
+    Times without an offset are taken as UTC.
+
+    Raises:
+        ValueError: If the value is not an ISO 8601 time
+    """
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError as e:
+        raise ValueError(f"Invalid time '{value}', expected ISO 8601") from e
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return moment.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+@lru_cache(maxsize=128)
+def compile_pattern(pattern: str, case_sensitive: bool = False) -> re.Pattern[str]:
+    """Compile a regular expression, reusing it across searches.
+
+    Raises:
+        ValueError: If the pattern is not a valid regular expression
+    """
+    try:
+        return re.compile(pattern, 0 if case_sensitive else re.IGNORECASE)
+    except re.error as e:
+        raise ValueError(f"Invalid regular expression '{pattern}': {e}") from e
+
+
+@dataclass(frozen=True, slots=True)
+class LogFilter:
+    """Criteria a log line must meet, and context to keep around matches.
+
+    Times are RFC 3339 UTC timestamps as returned by parse_time.
+    """
+
+    min_severity: str | None = None
+    start: str | None = None
+    end: str | None = None
+    pattern: str | None = None
+    regex: bool = False
+    case_sensitive: bool = False
+    context: int = 0
+
+    def __post_init__(self) -> None:
+        if self.min_severity is not None and self.min_severity.lower() not in SEVERITY_LEVELS:
+            raise ValueError(
+                f"Invalid severity '{self.min_severity}'. Must be one of: "
+                f"{', '.join(sorted(SEVERITY_LEVELS))}"
+            )
+        if self.context < 0:
+            raise ValueError("context must not be negative")
+        if self.pattern and self.regex:
+            compile_pattern(self.pattern, self.case_sensitive)
+
+    @property
+    def active(self) -> bool:
+        """Whether the filter excludes any line."""
+        return bool(self.min_severity or self.start or self.end or self.pattern)
+
+    def matcher(self) -> Callable[[dict[str, Any]], bool]:
+        """Build a predicate testing one line against every criterion."""
+        level = severity_level(self.min_severity) if self.min_severity else None
+        start = timestamp_key(self.start) if self.start else None
+        end = timestamp_key(self.end) if self.end else None
+        search: Callable[[str], Any] | None = None
+        if self.pattern and self.regex:
+            search = compile_pattern(self.pattern, self.case_sensitive).search
+        elif self.pattern:
+            needle = self.pattern if self.case_sensitive else self.pattern.casefold()
+            fold = not self.case_sensitive
+
+            def search(message: str) -> bool:
+                return needle in (message.casefold() if fold else message)
+
+        def matches(line: dict[str, Any]) -> bool:
+            if level is not None and severity_level(line.get("severity")) < level:
+                return False
+            if start is not None or end is not None:
+                timestamp = line.get("timestamp")
+                if timestamp is None:
+                    return False
+                key = timestamp_key(timestamp)
+                if (start is not None and key < start) or (end is not None and key >= end):
+                    return False
+            return search is None or bool(search(line.get("message") or ""))
+
+        return matches
+
+    def apply(
+        self, lines: Iterable[dict[str, Any]], max_matches: int | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Yield matching lines, with context lines around them.
+
+        When context is requested, every yielded line carries a "match" flag
+        telling matches from context.
+
+        Args:
+            lines: Lines in log order
+            max_matches: Stop after this many matches (and their trailing context)
+        """
+        matches = self.matcher()
+        if not self.context:
+            found = 0
+            for line in lines:
+                if matches(line):
+                    yield line
+                    found += 1
+                    if found == max_matches:
+                        return
+            return
+
+        before: deque[dict[str, Any]] = deque(maxlen=self.context)
+        after = 0
+        found = 0
+        for line in lines:
+            if (max_matches is None or found < max_matches) and matches(line):
+                for previous in before:
+                    yield {**previous, "match": False}
+                before.clear()
+                yield {**line, "match": True}
+                found += 1
+                after = self.context
+                continue
+            if after > 0:
+                yield {**line, "match": False}
+                after -= 1
+                if after == 0 and found == max_matches:
+                    return
+            else:
+                before.append(line)
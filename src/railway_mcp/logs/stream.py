@@ -0,0 +1,504 @@
+"""Live log tailing over GraphQL subscriptions.
+
+Each deployment's build or deployment log is followed by one websocket
+subscription (graphql-transport-ws protocol) that appends lines to a bounded
+ring buffer, numbering them in arrival order. Any number of tail callers read
+the buffer with their own cursor, so following a log returns only the lines
+a caller hasn't seen, and callers never hold up the subscription: when they
+fall behind, the oldest lines are overwritten and reported as skipped.
+Cursors name the subscription they were issued by, so a cursor outliving
+its subscription is never read against another buffer's numbering. The
+websocket's incoming queue is kept small, so if the buffer writer itself
+stalls the connection stops reading and TCP flow control throttles the API.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import importlib.util
+import itertools
+import logging
+import re
+import secrets
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .. import codec
+from ..exceptions import SubscriptionError
+from ..graphql.registry import get_operation
+from ..graphql.subscriptions import BUILD_LOGS_SUBSCRIPTION, DEPLOYMENT_LOGS_SUBSCRIPTION
+from .cursor import timestamp_key
+
+logger = logging.getLogger(__name__)
+
+SUBPROTOCOL = "graphql-transport-ws"
+
+# Subscription document and the data field carrying lines, by log type
+LOG_SUBSCRIPTIONS = {
+    "build": (BUILD_LOGS_SUBSCRIPTION, "buildLogs"),
+    "deployment": (DEPLOYMENT_LOGS_SUBSCRIPTION, "deploymentLogs"),
+}
+
+
+_CURSOR_RE = re.compile(r"^([0-9a-f]+):(\d+)$")
+
+
+def encode_tail_cursor(epoch: str, seq: int) -> str:
+    """Encode a subscription epoch and buffer sequence number as a cursor."""
+    return f"{epoch}:{seq}"
+
+
+def decode_tail_cursor(cursor: str) -> tuple[str, int]:
+    """Decode a cursor into its subscription epoch and sequence number.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    match = _CURSOR_RE.match(cursor)
+    if match is None:
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    return match.group(1), int(match.group(2))
+
+
+def websocket_url(api_url: str) -> str:
+    """Return the websocket URL for a GraphQL HTTP endpoint."""
+    if api_url.startswith("https://"):
+        return "wss://" + api_url.removeprefix("https://")
+    if api_url.startswith("http://"):
+        return "ws://" + api_url.removeprefix("http://")
+    return api_url
+
+
+@dataclass(slots=True)
+class LogBatch:
+    """Lines read from a buffer and the cursor to continue from."""
+
+    lines: list[dict[str, Any]]
+    cursor: int
+    # Lines after the caller's cursor that were overwritten before being read
+    skipped: int = 0
+
+
+class LogBuffer:
+    """Ring buffer of log lines with monotonically increasing sequence numbers."""
+
+    def __init__(self, capacity: int = 1000):
+        """Initialize an empty buffer.
+
+        Args:
+            capacity: Maximum number of lines kept; older lines are dropped
+        """
+        self.capacity = capacity
+        self.next_seq = 0
+        self._lines: deque[dict[str, Any]] = deque(maxlen=capacity)
+        self._changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest line still held."""
+        return self.next_seq - len(self._lines)
+
+    def extend(self, lines: list[dict[str, Any]]) -> None:
+        """Append lines and wake waiting readers."""
+        if not lines:
+            return
+        self._lines.extend(lines)
+        self.next_seq += len(lines)
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def read(self, cursor: int | None, limit: int) -> LogBatch:
+        """Return up to `limit` lines from a cursor.
+
+        Args:
+            cursor: Sequence number of the first line wanted, or None for
+                the latest `limit` lines
+            limit: Maximum number of lines
+
+        Returns:
+            The lines and the cursor of the line after them
+        """
+        first = self.first_seq
+        if cursor is None:
+            start = max(first, self.next_seq - limit)
+        elif cursor > self.next_seq:
+            # A cursor from a subscription that has since been dropped
+            start = first
+        else:
+            start = max(cursor, first)
+        skipped = start - cursor if cursor is not None and cursor < start else 0
+        end = min(start + limit, self.next_seq)
+        lines = list(itertools.islice(self._lines, start - first, end - first))
+        return LogBatch(lines, end, skipped)
+
+    async def wait(self, cursor: int, timeout: float) -> bool:
+        """Wait until a line at or after `cursor` exists.
+
+        Returns:
+            Whether there are lines to read
+        """
+        if self.next_seq <= cursor and timeout > 0:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._changed.wait(), timeout)
+        return self.next_seq > cursor
+
+
+class LogSubscription:
+    """One websocket subscription feeding a deployment's log buffer.
+
+    Dropped connections are re-established with exponential backoff. The API
+    replays recent lines on subscribe, so after a reconnect lines at or
+    before the last one received are skipped.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        deployment_id: str,
+        log_type: str,
+        capacity: int = 1000,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a subscription; call start() to connect.
+
+        Args:
+            url: GraphQL websocket URL
+            token: Railway API token
+            deployment_id: Deployment to follow
+            log_type: "build" or "deployment"
+            capacity: Lines kept in the ring buffer
+            max_retries: Consecutive failed connections before giving up
+            retry_delay: Delay before the first reconnect, doubled after each failure
+            clock: Monotonic time source
+        """
+        self.url = url
+        self.token = token
+        self.deployment_id = deployment_id
+        self.log_type = log_type
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.buffer = LogBuffer(capacity)
+        # Identifies this subscription's numbering in cursors
+        self.epoch = secrets.token_hex(4)
+        self.connections = 0
+        self.complete = False
+        self.error: str | None = None
+        self.last_used = clock()
+        self._clock = clock
+        self._task: asyncio.Task[None] | None = None
+        # Ordering key of the newest timestamp buffered, and the messages logged at it
+        self._last_timestamp_key: str | None = None
+        self._last_keys: set[str | None] = set()
+        self._replaying = False
+
+    @property
+    def live(self) -> bool:
+        """Whether the subscription is connected or reconnecting."""
+        return self._task is not None and not self._task.done()
+
+    def touch(self) -> None:
+        """Record a read, postponing idle shutdown."""
+        self.last_used = self._clock()
+
+    def start(self) -> None:
+        """Connect in the background unless already running or complete."""
+        if self.live or self.complete:
+            return
+        self.error = None
+        # Run outside the caller's context so a tool deadline doesn't apply
+        self._task = asyncio.get_running_loop().create_task(
+            self._run(), context=contextvars.Context()
+        )
+
+    async def close(self) -> None:
+        """Close the subscription."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        from websockets.exceptions import ConnectionClosed, InvalidHandshake, InvalidStatus
+
+        failures = 0
+        while True:
+            received = self.buffer.next_seq
+            try:
+                await self._stream()
+            except InvalidStatus as e:
+                if e.response.status_code in (401, 403):
+                    self.error = "Authentication failed for log subscription"
+                    return
+                failure: Exception = e
+            except SubscriptionError as e:
+                self.error = str(e)
+                logger.warning("Log subscription for %s failed: %s", self.deployment_id, e)
+                return
+            except (OSError, TimeoutError, ConnectionClosed, InvalidHandshake) as e:
+                failure = e
+            else:
+                self.complete = True
+                return
+
+            failures = 0 if self.buffer.next_seq > received else failures + 1
+            if failures > self.max_retries:
+                self.error = f"Log subscription connection failed: {failure}"
+                logger.warning("Giving up on log subscription for %s", self.deployment_id)
+                return
+            await asyncio.sleep(self.retry_delay * 2 ** max(failures - 1, 0))
+            self._replaying = self._last_timestamp_key is not None
+
+    async def _stream(self) -> None:
+        """Run one connection until the server completes the subscription."""
+        from websockets.asyncio.client import connect
+
+        document, field = LOG_SUBSCRIPTIONS[self.log_type]
+        operation = get_operation(document)
+        variables = {"deploymentId": self.deployment_id, "limit": self.buffer.capacity}
+        authorization = f"Bearer {self.token}"
+
+        async with connect(
+            self.url,
+            subprotocols=[SUBPROTOCOL],
+            additional_headers={"Authorization": authorization},
+            max_queue=16,
+        ) as websocket:
+            self.connections += 1
+            await websocket.send(
+                codec.dumps(
+                    {"type": "connection_init", "payload": {"Authorization": authorization}}
+                ).decode()
+            )
+            ack = codec.loads(await websocket.recv())
+            if ack.get("type") != "connection_ack":
+                raise SubscriptionError(f"Subscription not acknowledged: {ack.get('type')}")
+            await websocket.send(
+                '{"id":"1","type":"subscribe","payload":'
+                + operation.payload(variables).decode()
+                + "}"
+            )
+
+            async for raw in websocket:
+                message = codec.loads(raw)
+                kind = message.get("type")
+                if kind == "next":
+                    payload = message.get("payload") or {}
+                    if payload.get("errors"):
+                        raise SubscriptionError(_error_message(payload["errors"]))
+                    self._append((payload.get("data") or {}).get(field) or [])
+                elif kind == "ping":
+                    await websocket.send('{"type":"pong"}')
+                elif kind == "error":
+                    raise SubscriptionError(_error_message(message.get("payload")))
+                elif kind == "complete":
+                    return
+            raise OSError("Connection closed by the server")
+
+    def _append(self, lines: list[dict[str, Any]]) -> None:
+        if self._replaying:
+            fresh = []
+            for line in lines:
+                timestamp = line.get("timestamp")
+                if (
+                    self._replaying
+                    and timestamp is not None
+                    and self._last_timestamp_key is not None
+                ):
+                    key = timestamp_key(timestamp)
+                    if key < self._last_timestamp_key:
+                        continue
+                    if key == self._last_timestamp_key and line.get("message") in self._last_keys:
+                        continue
+                self._replaying = False
+                fresh.append(line)
+            lines = fresh
+
+        for line in lines:
+            timestamp = line.get("timestamp")
+            if timestamp is None:
+                continue
+            key = timestamp_key(timestamp)
+            if key != self._last_timestamp_key:
+                self._last_timestamp_key = key
+                self._last_keys = set()
+            self._last_keys.add(line.get("message"))
+        self.buffer.extend(lines)
+
+
+class LogStreams:
+    """Shared log subscriptions, one per deployment and log type.
+
+    Subscriptions unused for `idle_timeout` seconds are closed by a
+    background task that runs while any are open, and the least recently
+    used one is closed when `max_streams` are open.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        capacity: int = 1000,
+        max_streams: int = 32,
+        idle_timeout: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize with no subscriptions.
+
+        Args:
+            url: GraphQL websocket URL
+            token: Railway API token
+            capacity: Lines kept per subscription
+            max_streams: Maximum open subscriptions
+            idle_timeout: Seconds without reads after which a subscription is closed
+            clock: Monotonic time source
+        """
+        self.url = url
+        self.token = token
+        self.capacity = capacity
+        self.max_streams = max_streams
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        self._subscriptions: OrderedDict[tuple[str, str], LogSubscription] = OrderedDict()
+        self._closing: set[asyncio.Task[None]] = set()
+        self._reaper: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, deployment_id: str, log_type: str = "deployment") -> LogSubscription:
+        """Return the subscription for a deployment log, starting it if needed.
+
+        Raises:
+            SubscriptionError: If the websockets package is not installed
+        """
+        if importlib.util.find_spec("websockets") is None:
+            # A declared dependency; only missing in stripped-down environments
+            raise SubscriptionError("Live log tailing requires the websockets package")
+
+        self._expire()
+        key = (deployment_id, log_type)
+        subscription = self._subscriptions.get(key)
+        if subscription is None:
+            subscription = LogSubscription(
+                self.url, self.token, deployment_id, log_type, self.capacity, clock=self._clock
+            )
+            self._subscriptions[key] = subscription
+            while len(self._subscriptions) > self.max_streams:
+                _, evicted = self._subscriptions.popitem(last=False)
+                self._close_later(evicted)
+        else:
+            self._subscriptions.move_to_end(key)
+        subscription.touch()
+        subscription.start()
+        if self._reaper is None or self._reaper.done():
+            # Run outside the caller's context so a tool deadline doesn't apply
+            self._reaper = asyncio.get_running_loop().create_task(
+                self._reap(), context=contextvars.Context()
+            )
+        return subscription
+
+    async def tail(
+        self,
+        deployment_id: str,
+        log_type: str = "deployment",
+        cursor: str | None = None,
+        limit: int = 100,
+        wait: float = 0.0,
+    ) -> dict[str, Any]:
+        """Return log lines after a cursor, waiting briefly for new ones.
+
+        A cursor issued by a subscription that has since been closed is
+        reset: reading restarts at the oldest line the new subscription
+        holds, which may repeat lines the caller has seen.
+
+        Args:
+            deployment_id: Deployment to follow
+            log_type: "build" or "deployment"
+            cursor: Cursor from the previous call, or None for the latest lines
+            limit: Maximum number of lines
+            wait: Seconds to wait for a new line when there is none
+
+        Returns:
+            Lines, the cursor for the next call, the number of lines skipped
+            because the buffer overflowed, whether the cursor was reset, and
+            whether the log is still live
+
+        Raises:
+            ValueError: If the cursor is malformed
+            SubscriptionError: If the subscription failed and no lines are left
+        """
+        position = None
+        epoch = None
+        if cursor is not None:
+            epoch, position = decode_tail_cursor(cursor)
+        subscription = self.subscribe(deployment_id, log_type)
+        buffer = subscription.buffer
+        reset = epoch is not None and epoch != subscription.epoch
+        if reset:
+            position = buffer.first_seq
+        if subscription.live:
+            await buffer.wait(buffer.next_seq if position is None else position, wait)
+        batch = buffer.read(position, limit)
+        subscription.touch()
+        if not batch.lines and subscription.error is not None:
+            raise SubscriptionError(subscription.error)
+        return {
+            "logs": batch.lines,
+            "cursor": encode_tail_cursor(subscription.epoch, batch.cursor),
+            "skipped": batch.skipped,
+            "reset": reset,
+            "live": subscription.live,
+        }
+
+    async def close(self) -> None:
+        """Close every subscription."""
+        if self._reaper is not None and not self._reaper.done():
+            self._reaper.cancel()
+            await asyncio.gather(self._reaper, return_exceptions=True)
+        subscriptions = list(self._subscriptions.values())
+        self._subscriptions.clear()
+        await asyncio.gather(*(subscription.close() for subscription in subscriptions))
+        await asyncio.gather(*self._closing, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the open subscriptions and buffered lines."""
+        return {
+            "subscriptions": len(self._subscriptions),
+            "live": sum(subscription.live for subscription in self._subscriptions.values()),
+            "bufferedLines": sum(
+                len(subscription.buffer) for subscription in self._subscriptions.values()
+            ),
+        }
+
+    async def _reap(self) -> None:
+        """Close subscriptions as they become idle, until none are left."""
+        while self._subscriptions:
+            oldest = min(subscription.last_used for subscription in self._subscriptions.values())
+            await asyncio.sleep(max(oldest + self.idle_timeout - self._clock(), 0.0))
+            self._expire()
+
+    def _expire(self) -> None:
+        now = self._clock()
+        for key, subscription in list(self._subscriptions.items()):
+            if now - subscription.last_used >= self.idle_timeout:
+                del self._subscriptions[key]
+                self._close_later(subscription)
+
+    def _close_later(self, subscription: LogSubscription) -> None:
+        task = asyncio.get_running_loop().create_task(subscription.close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+
+def _error_message(errors: Any) -> str:
+    if isinstance(errors, list) and errors and isinstance(errors[0], dict):
+        return errors[0].get("message", "Subscription failed")
+    return "Subscription failed"
@@ -0,0 +1,105 @@
+"""FastMCP middleware for the Railway MCP server."""
+
+import asyncio
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+import mcp.types as mt
+from fastmcp.exceptions import ToolError
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+from .cache import track_age
+from .deadline import deadline
+from .exceptions import DeadlineExceededError
+
+if TYPE_CHECKING:
+    from fastmcp.tools.tool import ToolResult
+
+# Seconds each tool may run, by tool name, where it differs from the default
+DEFAULT_TOOL_TIMEOUTS: dict[str, float] = {
+    "check_railway_status": 15.0,
+    "get_logs": 120.0,
+    "search_logs": 120.0,
+    "export_logs": 300.0,
+}
+
+
+class DeadlineMiddleware(Middleware):
+    """Give every tool call a deadline and propagate it into API requests.
+
+    The timeout comes from the per-call `_meta.timeout` field of the request,
+    the tool's configured timeout, or the default, in that order. A timeout
+    of 0 disables the deadline. API requests made by the tool use the time
+    left as their HTTP timeout, and the tool is cancelled once it runs out.
+    """
+
+    def __init__(
+        self,
+        default_timeout: float = 60.0,
+        tool_timeouts: Mapping[str, float] | None = None,
+    ):
+        """Initialize the middleware.
+
+        Args:
+            default_timeout: Seconds a tool may run unless configured otherwise
+            tool_timeouts: Per-tool timeouts, merged over DEFAULT_TOOL_TIMEOUTS
+        """
+        self.default_timeout = default_timeout
+        self.tool_timeouts = {**DEFAULT_TOOL_TIMEOUTS, **(tool_timeouts or {})}
+
+    def timeout_for(self, tool: str, meta: Any = None) -> float | None:
+        """Return the timeout for a call, or None if it has no deadline."""
+        if meta is not None and not isinstance(meta, Mapping):
+            meta = meta.model_dump()
+        timeout = (meta or {}).get("timeout")
+        if timeout is None:
+            timeout = self.tool_timeouts.get(tool, self.default_timeout)
+        try:
+            timeout = float(timeout)
+        except (TypeError, ValueError):
+            timeout = self.tool_timeouts.get(tool, self.default_timeout)
+        return timeout if timeout > 0 else None
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mt.CallToolRequestParams],
+        call_next: CallNext[mt.CallToolRequestParams, "ToolResult"],
+    ) -> "ToolResult":
+        """Run the tool within its deadline."""
+        name = context.message.name
+        timeout = self.timeout_for(name, context.message.meta)
+        if timeout is None:
+            return await call_next(context)
+        try:
+            with deadline(timeout):
+                async with asyncio.timeout(timeout):
+                    return await call_next(context)
+        except TimeoutError:
+            error = DeadlineExceededError(f"Tool '{name}' did not finish within {timeout:g}s")
+            # Errors raised outside the tool itself must be ToolErrors to reach the client
+            raise ToolError(str(error)) from error
+
+
+class CacheAgeMiddleware(Middleware):
+    """Annotate tool results served from the response cache with their age.
+
+    When any response a tool used came from the cache, the result `_meta`
+    gets `cacheAge` (seconds since the oldest one was fetched) and `stale`
+    (whether it had outlived its TTL and is being refreshed).
+    """
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mt.CallToolRequestParams],
+        call_next: CallNext[mt.CallToolRequestParams, "ToolResult"],
+    ) -> "ToolResult":
+        """Run the tool and record the age of the cached data it returned."""
+        with track_age() as served:
+            result = await call_next(context)
+        if served.age is not None:
+            result.meta = {
+                **(result.meta or {}),
+                "cacheAge": round(served.age, 3),
+                "stale": served.stale,
+            }
+        return result
@@ -0,0 +1,247 @@
+"""Typed models for Railway API responses.
+
+Responses are decoded straight from the response bytes into these slotted
+dataclasses in a single pass, using msgspec when it is installed and pydantic
+otherwise. Field names mirror the API (and the tool output) so that models
+can be converted to tool results without any per-field Python code.
+"""
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Generic, TypeVar
+
+from .exceptions import GraphQLError
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+_DECODE_ERRORS: tuple[type[Exception], ...] = (msgspec.DecodeError,) if msgspec else ()
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class Edge(Generic[T]):
+    """A GraphQL connection edge."""
+
+    node: T
+
+
+@dataclass(slots=True)
+class PageInfo:
+    """Cursor information for a page of a connection."""
+
+    hasNextPage: bool = False
+    endCursor: str | None = None
+
+
+@dataclass(slots=True)
+class Connection(Generic[T]):
+    """A GraphQL connection."""
+
+    edges: list[Edge[T]] = field(default_factory=list)
+    pageInfo: PageInfo = field(default_factory=PageInfo)
+
+    @property
+    def nodes(self) -> list[T]:
+        """The nodes of every edge."""
+        return [edge.node for edge in self.edges]
+
+
+@dataclass(slots=True)
+class Ref:
+    """An ID and name reference to a related object."""
+
+    id: str | None = None
+    name: str | None = None
+
+
+@dataclass(slots=True)
+class Project:
+    """A project with its environments and services.
+
+    Nested connections are flattened to lists of references on decode;
+    hasMoreEnvironments and hasMoreServices tell whether a list is only the
+    first page.
+    """
+
+    id: str | None = None
+    name: str | None = None
+    description: str | None = None
+    createdAt: str | None = None
+    updatedAt: str | None = None
+    environments: Connection[Ref] | list[Ref] = field(default_factory=list)
+    services: Connection[Ref] | list[Ref] = field(default_factory=list)
+    hasMoreEnvironments: bool = False
+    hasMoreServices: bool = False
+
+    def __post_init__(self) -> None:
+        if isinstance(self.environments, Connection):
+            self.hasMoreEnvironments = self.environments.pageInfo.hasNextPage
+            self.environments = self.environments.nodes
+        if isinstance(self.services, Connection):
+            self.hasMoreServices = self.services.pageInfo.hasNextPage
+            self.services = self.services.nodes
+
+
+@dataclass(slots=True)
+class Service:
+    """A service in a project."""
+
+    id: str | None = None
+    name: str | None = None
+    icon: str | None = None
+    createdAt: str | None = None
+    updatedAt: str | None = None
+
+
+@dataclass(slots=True)
+class Environment:
+    """An environment in a project."""
+
+    id: str | None = None
+    name: str | None = None
+    createdAt: str | None = None
+    updatedAt: str | None = None
+
+
+@dataclass(slots=True)
+class Deployment:
+    """A deployment of a service."""
+
+    id: str | None = None
+    status: str | None = None
+    createdAt: str | None = None
+    updatedAt: str | None = None
+    staticUrl: str | None = None
+    meta: Any = None
+
+
+@dataclass(slots=True)
+class LogLine:
+    """A build or deployment log line."""
+
+    message: str | None = None
+    timestamp: str | None = None
+    severity: str | None = None
+
+
+@dataclass(slots=True)
+class Template:
+    """A template from the Railway Template Library."""
+
+    id: str | None = None
+    code: str | None = None
+    name: str | None = None
+    description: str | None = None
+    category: str | None = None
+    health: float | None = None
+    activeProjects: int | None = None
+
+
+@dataclass(slots=True)
+class TemplateDetails(Template):
+    """A template with the services it deploys."""
+
+    services: list[dict[str, Any]] = field(default_factory=list)
+
+
+# Response data shapes, one per query
+
+
+@dataclass(slots=True)
+class ProjectsViewer:
+    projects: Connection[Project] = field(default_factory=Connection)
+
+
+@dataclass(slots=True)
+class ListProjectsData:
+    me: ProjectsViewer | None = None
+
+
+@dataclass(slots=True)
+class ProjectServices:
+    services: Connection[Service] = field(default_factory=Connection)
+
+
+@dataclass(slots=True)
+class ListServicesData:
+    project: ProjectServices | None = None
+
+
+@dataclass(slots=True)
+class ProjectEnvironments:
+    environments: Connection[Environment] = field(default_factory=Connection)
+
+
+@dataclass(slots=True)
+class ListEnvironmentsData:
+    project: ProjectEnvironments | None = None
+
+
+@dataclass(slots=True)
+class ListDeploymentsData:
+    deployments: Connection[Deployment] = field(default_factory=Connection)
+
+
+@dataclass(slots=True)
+class BuildLogsData:
+    buildLogs: list[LogLine] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class DeploymentLogsData:
+    deploymentLogs: list[LogLine] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ListTemplatesData:
+    templates: Connection[Template] = field(default_factory=Connection)
+
+
+@dataclass(slots=True)
+class GetTemplateData:
+    template: TemplateDetails | None = None
+
+
+@dataclass(slots=True)
+class GraphQLResponse(Generic[T]):
+    """A GraphQL response envelope."""
+
+    data: T | None = None
+    errors: list[dict[str, Any]] | None = None
+
+
+@lru_cache(maxsize=64)
+def _decoder(model: type) -> Any:
+    """Build a reusable decoder for a response envelope of the given data model."""
+    if msgspec is not None:
+        return msgspec.json.Decoder(GraphQLResponse[model]).decode
+
+    from pydantic import TypeAdapter
+
+    return TypeAdapter(GraphQLResponse[model]).validate_json
+
+
+def decode(content: bytes, model: type[T]) -> GraphQLResponse[T]:
+    """Decode a GraphQL response body into typed models in one pass.
+
+    Raises:
+        GraphQLError: If the body does not match the model
+    """
+    try:
+        return _decoder(model)(content)
+    except (ValueError, *_DECODE_ERRORS) as e:
+        raise GraphQLError(f"Unexpected response shape for {model.__name__}: {e}") from e
+
+
+def to_builtins(value: Any) -> Any:
+    """Convert models to plain dicts and lists for tool output."""
+    if msgspec is not None:
+        return msgspec.to_builtins(value)
+
+    import pydantic_core
+
+    return pydantic_core.to_jsonable_python(value)
@@ -0,0 +1,107 @@
+"""Cursor-based pagination over GraphQL connections."""
+
+import asyncio
+from collections.abc import AsyncGenerator, Callable
+from typing import TYPE_CHECKING, Any
+
+from .models import Connection
+from .scheduler import Lane
+
+if TYPE_CHECKING:
+    from .client import RailwayClient
+
+DEFAULT_PAGE_SIZE = 50
+
+
+async def paginate(
+    client: "RailwayClient",
+    query: str,
+    variables: dict[str, Any] | None = None,
+    *,
+    model: type,
+    connection: Callable[[Any], Connection | None],
+    page_size: int | None = None,
+    limit: int | None = None,
+    prefetch: bool = True,
+    fresh: bool = False,
+    max_stale: float = 0.0,
+    lane: Lane = Lane.INTERACTIVE,
+) -> AsyncGenerator[Any, None]:
+    """Iterate over the nodes of a connection, one page request at a time.
+
+    The query must accept `$first` and `$after` variables and select
+    `pageInfo { hasNextPage endCursor }` on the connection.
+
+    Args:
+        client: Railway API client
+        query: GraphQL query document
+        variables: Query variables other than the page arguments
+        model: Response data model the query decodes into
+        connection: Returns the connection from the decoded data, or None if
+            its parent object does not exist
+        page_size: Nodes requested per page (defaults to the client's page size)
+        limit: Stop after this many nodes
+        prefetch: Request the next page while the caller consumes the current one
+        fresh: Bypass the response cache
+        max_stale: Seconds past its TTL a cached page may be served while it
+            is refreshed in the background
+        lane: Scheduling lane for the first page; later pages are sent in
+            the bulk lane
+
+    Yields:
+        Connection nodes in API order
+    """
+    page_size = page_size or client.page_size
+    remaining = limit
+
+    def fetch(after: str | None) -> asyncio.Future:
+        page_variables = dict(variables or {})
+        page_variables["first"] = page_size if remaining is None else min(page_size, remaining)
+        page_lane = lane
+        if after is not None:
+            page_variables["after"] = after
+            page_lane = Lane.BULK
+        future = asyncio.ensure_future(
+            client.execute(
+                query,
+                page_variables,
+                fresh=fresh,
+                model=model,
+                lane=page_lane,
+                max_stale=max_stale,
+            )
+        )
+        # Retrieve the outcome of a prefetch the caller never consumed
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        return future
+
+    if remaining is not None and remaining <= 0:
+        return
+    pending: asyncio.Future | None = fetch(None)
+    try:
+        while pending is not None:
+            page = connection(await pending)
+            pending = None
+            if page is None:
+                return
+            nodes = page.nodes
+            if remaining is not None:
+                nodes = nodes[:remaining]
+                remaining -= len(nodes)
+
+            cursor = page.pageInfo.endCursor
+            has_next = (
+                page.pageInfo.hasNextPage
+                and cursor is not None
+                and bool(page.edges)
+                and (remaining is None or remaining > 0)
+            )
+            if has_next and prefetch:
+                pending = fetch(cursor)
+            for node in nodes:
+                yield node
+            if has_next and not prefetch:
+                pending = fetch(cursor)
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
@@ -0,0 +1,187 @@
+"""Retry policy and client-side rate limiting for Railway API requests."""
+
+import asyncio
+import random
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from .exceptions import AuthenticationError, GraphQLError, RateLimitError
+
+# Mutations that can safely be sent again if the first attempt may have
+# reached the API (read timeouts, 5xx responses).
+IDEMPOTENT_MUTATIONS = frozenset(
+    {
+        "SetVariables",
+        "DeleteVariable",
+        "DeleteProject",
+        "DeleteService",
+        "DeleteEnvironment",
+        "DeleteServiceDomain",
+        "CancelDeployment",
+    }
+)
+
+# Failures where the request never reached the API; retrying is always safe.
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Failures where the request may have been processed.
+_MAYBE_SENT_ERRORS = (httpx.ReadTimeout, httpx.ReadError, httpx.RemoteProtocolError)
+
+_RETRYABLE_STATUS_CODES = frozenset({500, 502, 503, 504})
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with decorrelated jitter."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+
+    def next_delay(self, previous: float) -> float:
+        """Return the delay before the next attempt.
+
+        Args:
+            previous: Delay used before the previous attempt (base_delay initially)
+        """
+        return min(
+            self.max_delay, random.uniform(self.base_delay, max(previous, self.base_delay) * 3)
+        )
+
+
+def is_retryable(error: BaseException, idempotent: bool) -> bool:
+    """Classify a request failure as retryable.
+
+    Args:
+        error: Exception raised by the request
+        idempotent: Whether the operation can safely run more than once
+
+    Returns:
+        True if the request should be retried
+    """
+    if isinstance(error, (RateLimitError, *_NOT_SENT_ERRORS)):
+        return True
+    if isinstance(error, _MAYBE_SENT_ERRORS):
+        return idempotent
+    if isinstance(error, GraphQLError) and error.status_code in _RETRYABLE_STATUS_CODES:
+        return idempotent
+    return False
+
+
+def is_overload(error: BaseException) -> bool:
+    """Check whether a request failure signals that the API is overloaded."""
+    if isinstance(error, (RateLimitError, httpx.TimeoutException)):
+        return True
+    return isinstance(error, GraphQLError) and (error.status_code or 0) >= 500
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """Check whether a request failure means the API is unreachable or failing."""
+    if isinstance(error, httpx.TransportError):
+        return True
+    return (
+        isinstance(error, GraphQLError)
+        and not isinstance(error, RateLimitError)
+        and (error.status_code or 0) >= 500
+    )
+
+
+def is_upstream_outcome(error: BaseException) -> bool:
+    """Check whether a request failure came from an attempt to reach the API.
+
+    Local failures (a full scheduler queue, a response body that does not
+    decode) say nothing about the API's health.
+    """
+    return isinstance(error, (httpx.TransportError, AuthenticationError, GraphQLError))
+
+
+def is_rate_limit_error(error: Mapping) -> bool:
+    """Check whether a GraphQL error entry reports rate limiting."""
+    code = (error.get("extensions") or {}).get("code", "")
+    message = error.get("message", "")
+    return code == "RATE_LIMITED" or "rate limit" in message.lower()
+
+
+def parse_retry_after(headers: httpx.Headers) -> float | None:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_rate_limit(headers: httpx.Headers) -> tuple[int, int, float] | None:
+    """Parse Railway's rate-limit headers.
+
+    Returns:
+        (limit, remaining, seconds until reset), or None if the headers are absent
+    """
+    try:
+        limit = int(headers["x-ratelimit-limit"])
+        remaining = int(headers["x-ratelimit-remaining"])
+        reset = float(headers["x-ratelimit-reset"])
+    except (KeyError, ValueError):
+        return None
+    # The reset header is an epoch timestamp; tolerate a relative value too
+    if reset > 1_000_000_000:
+        reset -= time.time()
+    return limit, remaining, max(reset, 0.0)
+
+
+class TokenBucket:
+    """Client-side token bucket sized from observed rate-limit headers.
+
+    The bucket does not throttle until the API has reported its limits.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.capacity: float | None = None
+        self.tokens = 0.0
+        self.rate = 0.0
+        self.throttled = 0
+        self._window = 0.0
+        self._clock = clock
+        self._updated_at = clock()
+        self._lock = asyncio.Lock()
+
+    def observe(self, limit: int, remaining: int, reset_in: float) -> None:
+        """Resize the bucket from the latest rate-limit headers.
+
+        Args:
+            limit: Requests allowed per window
+            remaining: Requests left in the current window
+            reset_in: Seconds until the window resets
+        """
+        self._window = max(self._window, reset_in)
+        self.capacity = float(limit)
+        self.tokens = float(remaining)
+        self.rate = limit / self._window if self._window > 0 else float(limit)
+        self._updated_at = self._clock()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        if self.capacity is None:
+            return
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1 and self.rate > 0:
+                self.throttled += 1
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity or 0.0, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
@@ -0,0 +1,264 @@
+"""Bounded concurrency scheduler with priority lanes for Railway API requests."""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+from .exceptions import OverloadedError
+
+
+class Lane(StrEnum):
+    """Request lanes, in priority order."""
+
+    MUTATION = "mutation"
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
+
+
+# Maximum number of requests waiting in each lane before new ones are rejected
+DEFAULT_QUEUE_DEPTHS: dict[str, int] = {
+    Lane.MUTATION: 64,
+    Lane.INTERACTIVE: 128,
+    Lane.BULK: 256,
+}
+
+
+@dataclass
+class LaneStats:
+    """Counters for one lane."""
+
+    admitted: int = 0
+    rejected: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        """Return the counters as a dictionary, with wait times in milliseconds."""
+        return {
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avgWaitMs": round(self.wait_total / self.admitted * 1000, 2) if self.admitted else 0.0,
+            "maxWaitMs": round(self.wait_max * 1000, 2),
+        }
+
+
+class Scheduler:
+    """Cap concurrent requests and admit queued ones by lane priority.
+
+    A request only waits when every slot is taken; freed slots go to the
+    oldest waiter of the highest-priority lane. A lane whose queue is full
+    rejects new requests immediately instead of letting latency grow.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        queue_depths: Mapping[str, int] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            max_concurrency: Maximum number of requests in flight
+            queue_depths: Per-lane queue limits, merged over DEFAULT_QUEUE_DEPTHS
+            clock: Monotonic time source
+        """
+        self._limit = max_concurrency
+        self.queue_depths = {**DEFAULT_QUEUE_DEPTHS, **(queue_depths or {})}
+        self.active = 0
+        self.lane_stats = {lane: LaneStats() for lane in Lane}
+        self._clock = clock
+        self._waiters: dict[Lane, deque[asyncio.Future[None]]] = {lane: deque() for lane in Lane}
+
+    @property
+    def limit(self) -> int:
+        """Maximum number of requests in flight."""
+        return self._limit
+
+    @limit.setter
+    def limit(self, value: int) -> None:
+        self._limit = max(1, value)
+        self._wake()
+
+    def queued(self, lane: Lane | None = None) -> int:
+        """Return the number of waiting requests in a lane, or in all lanes."""
+        if lane is not None:
+            return len(self._waiters[lane])
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    @asynccontextmanager
+    async def slot(self, lane: Lane) -> AsyncIterator[None]:
+        """Hold a concurrency slot for the duration of the block.
+
+        Raises:
+            OverloadedError: If the lane's queue is full
+        """
+        await self.acquire(lane)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, lane: Lane) -> None:
+        """Wait for a free slot in the given lane.
+
+        Raises:
+            OverloadedError: If the lane's queue is full
+        """
+        stats = self.lane_stats[lane]
+        if self.active < self._limit and not self.queued():
+            self.active += 1
+            stats.admitted += 1
+            return
+
+        waiters = self._waiters[lane]
+        if len(waiters) >= self.queue_depths[lane]:
+            stats.rejected += 1
+            raise OverloadedError(
+                f"Too many queued {lane} requests ({len(waiters)}); try again shortly"
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        waiters.append(future)
+        started = self._clock()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted as we were cancelled; hand it on
+                self.release()
+            elif future in waiters:
+                waiters.remove(future)
+            raise
+        waited = self._clock() - started
+        stats.admitted += 1
+        stats.wait_total += waited
+        stats.wait_max = max(stats.wait_max, waited)
+
+    def release(self) -> None:
+        """Free a slot and admit the next waiter."""
+        self.active -= 1
+        self._wake()
+
+    def stats(self) -> dict[str, Any]:
+        """Return scheduler state and per-lane counters."""
+        return {
+            "limit": self._limit,
+            "active": self.active,
+            "queued": {lane.value: len(self._waiters[lane]) for lane in Lane},
+            "lanes": {lane.value: stats.as_dict() for lane, stats in self.lane_stats.items()},
+        }
+
+    def _wake(self) -> None:
+        """Grant free slots to waiters in priority order."""
+        for lane in Lane:
+            waiters = self._waiters[lane]
+            while waiters and self.active < self._limit:
+                future = waiters.popleft()
+                if not future.done():
+                    self.active += 1
+                    future.set_result(None)
+
+
+class AdaptiveLimit:
+    """Additive-increase/multiplicative-decrease control of a scheduler's limit.
+
+    After every window of successful requests the limit grows by one if the
+    window's p90 latency stayed within `latency_tolerance` times the baseline
+    and the scheduler was saturated. Overload responses (429, 5xx, timeouts)
+    and latency spikes cut the limit by `backoff`. Only one cut is applied per
+    burst: failures of requests sent before the last cut are ignored.
+    """
+
+    def __init__(
+        self,
+        scheduler: Scheduler,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        window: int = 20,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the controller.
+
+        Args:
+            scheduler: Scheduler whose limit is adjusted
+            min_limit: Lowest limit the controller backs off to
+            max_limit: Highest limit the controller grows to
+            window: Successful requests per latency evaluation
+            backoff: Factor applied to the limit on overload
+            latency_tolerance: p90 latency over baseline that counts as a spike
+            clock: Monotonic time source used to time requests
+        """
+        self.scheduler = scheduler
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.window = window
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.clock = clock
+        self.baseline: float | None = None
+        self.last_p90: float | None = None
+        self.increases = 0
+        self.decreases = 0
+        self._samples: list[float] = []
+        self._saturated = False
+        self._last_decrease = float("-inf")
+        scheduler.limit = min(max(scheduler.limit, min_limit), max_limit)
+
+    def record(self, started: float, overloaded: bool = False) -> None:
+        """Record a finished request.
+
+        Args:
+            started: Clock time the request was sent
+            overloaded: Whether the API reported overload (429, 5xx, timeout)
+        """
+        if overloaded:
+            if started >= self._last_decrease:
+                self._decrease()
+            return
+
+        scheduler = self.scheduler
+        if scheduler.active >= scheduler.limit or scheduler.queued():
+            self._saturated = True
+        self._samples.append(self.clock() - started)
+        if len(self._samples) < self.window:
+            return
+
+        samples = sorted(self._samples)
+        p90 = samples[min(len(samples) - 1, int(len(samples) * 0.9))]
+        self.last_p90 = p90
+        self._samples.clear()
+        saturated, self._saturated = self._saturated, False
+        if self.baseline is not None and p90 > self.baseline * self.latency_tolerance:
+            self._decrease()
+            return
+        self.baseline = p90 if self.baseline is None else 0.8 * self.baseline + 0.2 * p90
+        if saturated and scheduler.limit < self.max_limit:
+            scheduler.limit += 1
+            self.increases += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return the current limit and observed latency."""
+        return {
+            "limit": self.scheduler.limit,
+            "minLimit": self.min_limit,
+            "maxLimit": self.max_limit,
+            "p90RttMs": round(self.last_p90 * 1000, 2) if self.last_p90 is not None else None,
+            "baselineRttMs": round(self.baseline * 1000, 2) if self.baseline is not None else None,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+    def _decrease(self) -> None:
+        self.scheduler.limit = max(self.min_limit, int(self.scheduler.limit * self.backoff))
+        self.decreases += 1
+        self._last_decrease = self.clock()
+        self._samples.clear()
+        self._saturated = False
@@ -0,0 +1,255 @@
+"""Inverted index for searching projects, services, environments, domains and templates."""
+
+import bisect
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+# Kinds of searchable documents
+SEARCH_KINDS = frozenset({"project", "environment", "service", "domain", "template"})
+
+# Relative weight of a match by the field it is found in
+FIELD_WEIGHTS: dict[str, float] = {
+    "name": 3.0,
+    "code": 3.0,
+    "category": 1.0,
+    "description": 1.0,
+}
+
+# Relative weight of a match by how the query term matched the token
+EXACT, PREFIX, FUZZY = 1.0, 0.6, 0.3
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Split text into case-folded alphanumeric tokens."""
+    return _TOKEN_RE.findall(text.casefold()) if text else []
+
+
+@dataclass(slots=True)
+class SearchDocument:
+    """A searchable object and the text fields it is indexed by."""
+
+    kind: str
+    id: str
+    name: str | None = None
+    project_id: str | None = None
+    service_id: str | None = None
+    fields: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class SearchHit:
+    """A document matching a query and its relevance score."""
+
+    document: SearchDocument
+    score: float
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the hit as tool output."""
+        document = self.document
+        result: dict[str, Any] = {"kind": document.kind, "id": document.id, "name": document.name}
+        if document.project_id is not None:
+            result["projectId"] = document.project_id
+        if document.service_id is not None:
+            result["serviceId"] = document.service_id
+        if "code" in document.fields:
+            result["code"] = document.fields["code"]
+        result["score"] = round(self.score, 3)
+        return result
+
+
+class SearchIndex:
+    """Token -> document postings with prefix and fuzzy term matching.
+
+    Documents are added, updated and removed one at a time, so the index
+    follows incremental updates without rebuilding. Prefix matches use a
+    sorted token list that is rebuilt lazily after the vocabulary changes,
+    and fuzzy matches compare only against tokens of a similar length.
+    """
+
+    def __init__(self, max_distance: int = 2):
+        """Initialize an empty index.
+
+        Args:
+            max_distance: Largest edit distance accepted for fuzzy matches
+                (terms under 6 characters accept at most 1)
+        """
+        self.max_distance = max_distance
+        # Kinds whose complete listing has been indexed
+        self.complete: set[str] = set()
+        self._documents: dict[str, SearchDocument] = {}
+        # token -> document ID -> weight of the best field containing the token
+        self._postings: dict[str, dict[str, float]] = {}
+        self._by_length: dict[int, set[str]] = {}
+        self._sorted: list[str] | None = []
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def count(self, kind: str) -> int:
+        """Return the number of documents of a kind."""
+        return sum(document.kind == kind for document in self._documents.values())
+
+    def ids(self, kind: str) -> list[str]:
+        """Return the IDs of the documents of a kind."""
+        return [doc_id for doc_id, document in self._documents.items() if document.kind == kind]
+
+    def upsert(
+        self,
+        kind: str,
+        doc_id: str,
+        name: str | None,
+        *,
+        project_id: str | None = None,
+        service_id: str | None = None,
+        **fields: str | None,
+    ) -> None:
+        """Add or replace a document.
+
+        Args:
+            kind: One of SEARCH_KINDS
+            doc_id: Document ID, unique across kinds
+            name: Display name, indexed as the "name" field
+            project_id: Parent project ID
+            service_id: Parent service ID
+            **fields: Other text fields (see FIELD_WEIGHTS); None values are skipped
+        """
+        text = {"name": name} | fields
+        document = SearchDocument(
+            kind,
+            doc_id,
+            name,
+            project_id,
+            service_id,
+            {key: value for key, value in text.items() if value},
+        )
+        if self._documents.get(doc_id) == document:
+            return
+        self.remove(doc_id)
+        self._documents[doc_id] = document
+        for key, value in document.fields.items():
+            weight = FIELD_WEIGHTS.get(key, 1.0)
+            for token in tokenize(value):
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = {}
+                    self._by_length.setdefault(len(token), set()).add(token)
+                    self._sorted = None
+                if weight > postings.get(doc_id, 0.0):
+                    postings[doc_id] = weight
+
+    def remove(self, doc_id: str) -> None:
+        """Remove a document if it is indexed."""
+        document = self._documents.pop(doc_id, None)
+        if document is None:
+            return
+        for value in document.fields.values():
+            for token in tokenize(value):
+                postings = self._postings.get(token)
+                if postings is None:
+                    continue
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[token]
+                    self._by_length[len(token)].discard(token)
+                    self._sorted = None
+
+    def remove_children(self, service_id: str) -> None:
+        """Remove the documents (domains) belonging to a service."""
+        for doc_id in [
+            doc_id
+            for doc_id, document in self._documents.items()
+            if document.service_id == service_id
+        ]:
+            self.remove(doc_id)
+
+    def search(
+        self,
+        query: str,
+        kinds: set[str] | frozenset[str] | None = None,
+        limit: int = 20,
+        fuzzy: bool = True,
+    ) -> list[SearchHit]:
+        """Find documents containing every query term.
+
+        Each term matches tokens exactly, as a prefix, or (when neither
+        matches and `fuzzy` is set) within the edit distance limit.
+
+        Args:
+            query: Free-text query
+            kinds: Only return documents of these kinds
+            limit: Maximum number of hits
+            fuzzy: Allow approximate matches for misspelled terms
+
+        Returns:
+            Hits by descending score, then name
+        """
+        scores: dict[str, float] | None = None
+        for term in dict.fromkeys(tokenize(query)):
+            term_scores: dict[str, float] = {}
+            for token, weight in self._match(term, fuzzy).items():
+                for doc_id, field_weight in self._postings[token].items():
+                    score = weight * field_weight
+                    if score > term_scores.get(doc_id, 0.0):
+                        term_scores[doc_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    doc_id: scores[doc_id] + score
+                    for doc_id, score in term_scores.items()
+                    if doc_id in scores
+                }
+            if not scores:
+                return []
+
+        hits = [
+            SearchHit(self._documents[doc_id], score)
+            for doc_id, score in (scores or {}).items()
+            if kinds is None or self._documents[doc_id].kind in kinds
+        ]
+        hits.sort(key=lambda hit: (-hit.score, hit.document.name or ""))
+        return hits[:limit]
+
+    def _match(self, term: str, fuzzy: bool) -> dict[str, float]:
+        """Return the tokens a query term matches and the weight of each match."""
+        matches = {}
+        if term in self._postings:
+            matches[term] = EXACT
+        if self._sorted is None:
+            self._sorted = sorted(self._postings)
+        for index in range(bisect.bisect_right(self._sorted, term), len(self._sorted)):
+            token = self._sorted[index]
+            if not token.startswith(term):
+                break
+            matches[token] = PREFIX
+        if matches or not fuzzy:
+            return matches
+
+        limit = min(self.max_distance, 1 if len(term) < 6 else 2)
+        for length in range(len(term) - limit, len(term) + limit + 1):
+            for token in self._by_length.get(length, ()):
+                if _within_distance(term, token, limit):
+                    matches[token] = FUZZY
+        return matches
+
+
+def _within_distance(a: str, b: str, limit: int) -> bool:
+    """Check whether the Levenshtein distance between a and b is at most limit."""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        if min(current) > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
@@ -1,46 +1,77 @@
-"""FastMCP server for Railway."""
+"""FastMCP server for Railway.
+
+Tools import their implementation modules when first called, and the
+client, settings and snapshot modules are imported when the server starts,
+so importing this module costs little more than FastMCP itself.
+"""
 
 import sys
+import time
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from fastmcp import Context, FastMCP
 
-from .client import RailwayClient
-from .config import get_settings
 from .exceptions import AuthenticationError
-from .tools import deployments as deployment_tools
-from .tools import domains as domain_tools
-from .tools import environments as environment_tools
-from .tools import projects as project_tools
-from .tools import services as service_tools
-from .tools import status as status_tools
-from .tools import templates as template_tools
-from .tools import variables as variable_tools
+from .middleware import CacheAgeMiddleware, DeadlineMiddleware
+
+if TYPE_CHECKING:
+    from .client import RailwayClient
+
+# Reference point for the time-to-ready measurement reported at startup
+_IMPORTED_AT = time.perf_counter()
 
 
 @dataclass
 class AppContext:
     """Application context holding the Railway client."""
 
-    client: RailwayClient
+    client: "RailwayClient"
 
 
 @asynccontextmanager
 async def lifespan(mcp: FastMCP):
     """Manage server lifecycle - initialize and cleanup Railway client."""
+    from .client import RailwayClient
+    from .config import get_settings
+    from .snapshot import load_snapshot, save_snapshot
+
     settings = get_settings()
-    client = RailwayClient(settings.railway_token, settings.railway_api_url)
+    client = RailwayClient.from_settings(settings)
+    deadlines.default_timeout = settings.tool_timeout
+    deadlines.tool_timeouts.update(settings.tool_timeouts)
+
+    snapshot_path = settings.cache_snapshot_path if client.cache is not None else None
+    if snapshot_path:
+        restored = load_snapshot(
+            client.cache, snapshot_path, client.token, settings.cache_snapshot_max_age
+        )
+        print(f"Restored {restored} cached responses from {snapshot_path}", file=sys.stderr)
 
     try:
         async with client:
-            # Verify token on startup
-            await client.verify_token()
+            if settings.startup_mode == "eager":
+                # Verify token before accepting requests
+                await client.verify_token()
+            else:
+                client.start_background_verification(settings.warmup_connections)
+            if settings.topology_refresh_interval > 0:
+                # Build the name index in the background
+                client.topology.start_refresh()
+            ready_ms = round((time.perf_counter() - _IMPORTED_AT) * 1000, 1)
+            client.startup_timings["readyMs"] = ready_ms
+            print(f"railway-mcp ready in {ready_ms:.0f} ms", file=sys.stderr)
             yield AppContext(client=client)
     except AuthenticationError as e:
         print(f"FATAL: Railway API authentication failed: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if snapshot_path:
+            try:
+                save_snapshot(client.cache, snapshot_path, client.token)
+            except OSError as e:
+                print(f"Could not save cache snapshot to {snapshot_path}: {e}", file=sys.stderr)
 
 
 # Create the MCP server
@@ -50,8 +81,13 @@ mcp = FastMCP(
     lifespan=lifespan,
 )
 
+# Per-call deadlines, configured from settings when the server starts
+deadlines = DeadlineMiddleware()
+mcp.add_middleware(deadlines)
+mcp.add_middleware(CacheAgeMiddleware())
+
 
-def get_client(ctx: Context) -> RailwayClient:
+def get_client(ctx: Context) -> "RailwayClient":
     """Get Railway client from context."""
     app_ctx: AppContext = ctx.request_context.lifespan_context
     return app_ctx.client
@@ -64,19 +100,35 @@ async def check_railway_status(ctx: Context) -> dict[str, Any]:
 
     Returns the current user's information if authenticated.
     """
+    from .tools import status as status_tools
+
     client = get_client(ctx)
     return await status_tools.check_railway_status(client)
 
 
 # Project tools
 @mcp.tool()
-async def list_projects(ctx: Context) -> list[dict[str, Any]]:
+async def list_projects(
+    ctx: Context,
+    fresh: bool = False,
+    limit: int | None = None,
+    max_stale: float | None = None,
+) -> list[dict[str, Any]]:
     """List all accessible Railway projects.
 
-    Returns a list of projects with their environments and services.
+    Args:
+        fresh: Bypass the response cache and fetch from Railway (default: False)
+        limit: Maximum number of projects to return (default: all)
+        max_stale: Seconds past its TTL a cached result may be returned while
+            it is refreshed in the background (default: server setting)
+
+    Returns a list of projects with their environments and services. Results
+    served from the cache report their age in seconds as _meta.cacheAge.
     """
+    from .tools import projects as project_tools
+
     client = get_client(ctx)
-    return await project_tools.list_projects(client)
+    return await project_tools.list_projects(client, fresh=fresh, limit=limit, max_stale=max_stale)
 
 
 @mcp.tool()
@@ -95,6 +147,8 @@ async def create_project_and_link(
 
     Returns the created project information.
     """
+    from .tools import projects as project_tools
+
     client = get_client(ctx)
     return await project_tools.create_project_and_link(
         client, name, description, default_environment_name
@@ -103,14 +157,21 @@ async def create_project_and_link(
 
 # Service tools
 @mcp.tool()
-async def list_services(ctx: Context, project_id: str) -> list[dict[str, Any]]:
+async def list_services(
+    ctx: Context, project_id: str, fresh: bool = False, max_stale: float | None = None
+) -> list[dict[str, Any]]:
     """List services in a project.
 
     Args:
-        project_id: The Railway project ID
+        project_id: The Railway project ID or name
+        fresh: Bypass the response cache and fetch from Railway (default: False)
+        max_stale: Seconds past its TTL a cached result may be returned while
+            it is refreshed in the background (default: server setting)
     """
+    from .tools import services as service_tools
+
     client = get_client(ctx)
-    return await service_tools.list_services(client, project_id)
+    return await service_tools.list_services(client, project_id, fresh=fresh, max_stale=max_stale)
 
 
 @mcp.tool()
@@ -118,20 +179,37 @@ async def link_service(ctx: Context, service_id: str) -> dict[str, Any]:
     """Get service details for context/linking.
 
     Args:
-        service_id: The Railway service ID
+        service_id: The Railway service ID or name
     """
+    from .tools import services as service_tools
+
     client = get_client(ctx)
     return await service_tools.link_service(client, service_id)
 
 
+@mcp.tool()
+async def link_services(ctx: Context, service_ids: list[str]) -> list[dict[str, Any]]:
+    """Get details for several services in a single API request.
+
+    Args:
+        service_ids: The Railway service IDs or names
+    """
+    from .tools import services as service_tools
+
+    client = get_client(ctx)
+    return await service_tools.link_services(client, service_ids)
+
+
 @mcp.tool()
 async def deploy(ctx: Context, service_id: str, environment_id: str) -> dict[str, Any]:
     """Trigger deployment for a service.
 
     Args:
-        service_id: The Railway service ID
-        environment_id: The Railway environment ID to deploy to
+        service_id: The Railway service ID or name
+        environment_id: The Railway environment ID or name to deploy to
     """
+    from .tools import services as service_tools
+
     client = get_client(ctx)
     return await service_tools.deploy(client, service_id, environment_id)
 
@@ -147,10 +225,12 @@ async def list_deployments(
     """List deployments for a service.
 
     Args:
-        service_id: The Railway service ID
-        environment_id: The Railway environment ID
+        service_id: The Railway service ID or name
+        environment_id: The Railway environment ID or name
         limit: Maximum number of deployments to return (default: 10)
     """
+    from .tools import deployments as deployment_tools
+
     client = get_client(ctx)
     return await deployment_tools.list_deployments(client, service_id, environment_id, limit)
 
@@ -161,16 +241,210 @@ async def get_logs(
     deployment_id: str,
     log_type: str = "deployment",
     limit: int = 100,
-) -> list[dict[str, Any]]:
+    cursor: str | None = None,
+    severity: str | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    pattern: str | None = None,
+    regex: bool = False,
+    context: int = 0,
+    compact: bool = False,
+) -> dict[str, Any]:
     """Retrieve build or deployment logs.
 
     Args:
         deployment_id: The Railway deployment ID
         log_type: Type of logs to retrieve - "build" or "deployment" (default: "deployment")
+        limit: Maximum number of log entries to fetch (default: 100)
+        cursor: Cursor from the previous call; only lines logged since are
+            fetched and returned (default: the latest lines)
+        severity: Minimum severity - "debug", "info", "warn" or "error" (default: all)
+        start: Only lines at or after this ISO 8601 time
+        end: Only lines before this ISO 8601 time
+        pattern: Only lines containing this text, case-insensitive
+        regex: Treat pattern as a regular expression (default: False)
+        context: Lines to include before and after each matching line (default: 0)
+        compact: Collapse repeated lines and group near-identical ones (progress
+            output, downloads) into counted entries with their first and last
+            timestamps; error lines are kept verbatim (default: False)
+
+    Returns the log entries and a cursor to pass to the next call.
+    """
+    from .tools import deployments as deployment_tools
+
+    client = get_client(ctx)
+    return await deployment_tools.get_logs(
+        client,
+        deployment_id,
+        log_type,
+        limit,
+        cursor,
+        severity=severity,
+        start=start,
+        end=end,
+        pattern=pattern,
+        regex=regex,
+        context=context,
+        compact=compact,
+    )
+
+
+@mcp.tool()
+async def search_logs(
+    ctx: Context,
+    deployment_id: str,
+    pattern: str,
+    log_type: str = "deployment",
+    regex: bool = False,
+    case_sensitive: bool = False,
+    severity: str | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    context: int = 0,
+    limit: int = 50,
+    scan_limit: int = 1000,
+) -> dict[str, Any]:
+    """Search build or deployment logs for text or a regular expression.
+
+    Args:
+        deployment_id: The Railway deployment ID
+        pattern: Text or regular expression to look for
+        log_type: Type of logs to search - "build" or "deployment" (default: "deployment")
+        regex: Treat pattern as a regular expression (default: False)
+        case_sensitive: Match case (default: False)
+        severity: Minimum severity - "debug", "info", "warn" or "error" (default: all)
+        start: Only lines at or after this ISO 8601 time
+        end: Only lines before this ISO 8601 time
+        context: Lines to include before and after each match (default: 0)
+        limit: Maximum number of matches (default: 50)
+        scan_limit: Maximum number of log lines to search (default: 1000)
+
+    Returns the matching lines, the number of matches and of lines searched.
+    With context, each line has a "match" flag telling matches from context.
+    """
+    from .tools import deployments as deployment_tools
+
+    client = get_client(ctx)
+    return await deployment_tools.search_logs(
+        client,
+        deployment_id,
+        pattern,
+        log_type,
+        regex=regex,
+        case_sensitive=case_sensitive,
+        severity=severity,
+        start=start,
+        end=end,
+        context=context,
+        limit=limit,
+        scan_limit=scan_limit,
+    )
+
+
+@mcp.tool()
+async def export_logs(
+    ctx: Context,
+    deployment_ids: list[str],
+    log_type: str = "deployment",
+    limit: int = 5000,
+) -> list[dict[str, Any]]:
+    """Export the logs of several deployments to compressed local files.
+
+    Args:
+        deployment_ids: The Railway deployment IDs
+        log_type: Type of logs to export - "build" or "deployment" (default: "deployment")
+        limit: Maximum number of log lines per deployment (default: 5000)
+
+    Returns one entry per deployment with the file path, number of lines,
+    compressed size and number of blocks, or the error its export failed
+    with. Search the exports with search_exported_logs.
+    """
+    from .tools import deployments as deployment_tools
+
+    client = get_client(ctx)
+    return await deployment_tools.export_logs(client, deployment_ids, log_type, limit=limit)
+
+
+@mcp.tool()
+async def search_exported_logs(
+    ctx: Context,
+    deployment_id: str,
+    pattern: str | None = None,
+    log_type: str = "deployment",
+    regex: bool = False,
+    case_sensitive: bool = False,
+    severity: str | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    context: int = 0,
+    limit: int = 50,
+) -> dict[str, Any]:
+    """Search logs previously exported with export_logs, without calling the API.
+
+    Args:
+        deployment_id: The Railway deployment ID
+        pattern: Text or regular expression to look for (default: any line)
+        log_type: Type of logs to search - "build" or "deployment" (default: "deployment")
+        regex: Treat pattern as a regular expression (default: False)
+        case_sensitive: Match case (default: False)
+        severity: Minimum severity - "debug", "info", "warn" or "error" (default: all)
+        start: Only lines at or after this ISO 8601 time
+        end: Only lines before this ISO 8601 time
+        context: Lines to include before and after each match (default: 0)
+        limit: Maximum number of matches (default: 50)
+
+    Returns the matching lines, the number of matches, and how many of the
+    export's blocks had to be read. With context, each line has a "match"
+    flag telling matches from context.
+    """
+    from .tools import deployments as deployment_tools
+
+    client = get_client(ctx)
+    return await deployment_tools.search_exported_logs(
+        client,
+        deployment_id,
+        pattern,
+        log_type,
+        regex=regex,
+        case_sensitive=case_sensitive,
+        severity=severity,
+        start=start,
+        end=end,
+        context=context,
+        limit=limit,
+    )
+
+
+@mcp.tool()
+async def tail_logs(
+    ctx: Context,
+    deployment_id: str,
+    log_type: str = "deployment",
+    cursor: str | None = None,
+    limit: int = 100,
+    wait: float = 2.0,
+) -> dict[str, Any]:
+    """Follow build or deployment logs live, returning only new lines.
+
+    Call again with the returned cursor to get the lines written since the
+    previous call.
+
+    Args:
+        deployment_id: The Railway deployment ID
+        log_type: Type of logs to follow - "build" or "deployment" (default: "deployment")
+        cursor: Cursor from the previous call (default: start from the latest lines)
         limit: Maximum number of log entries (default: 100)
+        wait: Seconds to wait for new lines when there are none yet (default: 2)
+
+    Returns logs, the next cursor, the number of lines skipped because they
+    were overwritten before being read, whether the cursor had expired with
+    its subscription (reading then restarts at the oldest buffered line, so
+    some lines may repeat), and whether the log is still live.
     """
+    from .tools import deployments as deployment_tools
+
     client = get_client(ctx)
-    return await deployment_tools.get_logs(client, deployment_id, log_type, limit)
+    return await deployment_tools.tail_logs(client, deployment_id, log_type, cursor, limit, wait)
 
 
 # Environment tools
@@ -183,9 +457,11 @@ async def create_environment(
     """Create a new environment in a project.
 
     Args:
-        project_id: The Railway project ID
+        project_id: The Railway project ID or name
         name: Name for the new environment
     """
+    from .tools import environments as environment_tools
+
     client = get_client(ctx)
     return await environment_tools.create_environment(client, project_id, name)
 
@@ -199,22 +475,33 @@ async def link_environment(
     """Get environment details for context/linking.
 
     Args:
-        project_id: The Railway project ID
-        environment_id: The Railway environment ID
+        project_id: The Railway project ID or name
+        environment_id: The Railway environment ID or name
     """
+    from .tools import environments as environment_tools
+
     client = get_client(ctx)
     return await environment_tools.link_environment(client, project_id, environment_id)
 
 
 @mcp.tool()
-async def list_environments(ctx: Context, project_id: str) -> list[dict[str, Any]]:
+async def list_environments(
+    ctx: Context, project_id: str, fresh: bool = False, max_stale: float | None = None
+) -> list[dict[str, Any]]:
     """List environments in a project.
 
     Args:
-        project_id: The Railway project ID
+        project_id: The Railway project ID or name
+        fresh: Bypass the response cache and fetch from Railway (default: False)
+        max_stale: Seconds past its TTL a cached result may be returned while
+            it is refreshed in the background (default: server setting)
     """
+    from .tools import environments as environment_tools
+
     client = get_client(ctx)
-    return await environment_tools.list_environments(client, project_id)
+    return await environment_tools.list_environments(
+        client, project_id, fresh=fresh, max_stale=max_stale
+    )
 
 
 # Variable tools
@@ -229,11 +516,13 @@ async def list_variables(
     """List environment variables.
 
     Args:
-        project_id: The Railway project ID
-        environment_id: The Railway environment ID
-        service_id: Optional service ID for service-specific variables
+        project_id: The Railway project ID or name
+        environment_id: The Railway environment ID or name
+        service_id: Optional service ID or name for service-specific variables
         include_values: If True, return actual values; if False, return masked values (default: False)
     """
+    from .tools import variables as variable_tools
+
     client = get_client(ctx)
     return await variable_tools.list_variables(
         client, project_id, environment_id, service_id, include_values
@@ -251,11 +540,13 @@ async def set_variables(
     """Set environment variables.
 
     Args:
-        project_id: The Railway project ID
-        environment_id: The Railway environment ID
+        project_id: The Railway project ID or name
+        environment_id: The Railway environment ID or name
         variables: Dictionary of variable names and values to set
-        service_id: Optional service ID for service-specific variables
+        service_id: Optional service ID or name for service-specific variables
     """
+    from .tools import variables as variable_tools
+
     client = get_client(ctx)
     return await variable_tools.set_variables(
         client, project_id, environment_id, variables, service_id
@@ -272,9 +563,11 @@ async def generate_domain(
     """Generate a railway.app domain for a service.
 
     Args:
-        service_id: The Railway service ID
-        environment_id: The Railway environment ID
+        service_id: The Railway service ID or name
+        environment_id: The Railway environment ID or name
     """
+    from .tools import domains as domain_tools
+
     client = get_client(ctx)
     return await domain_tools.generate_domain(client, service_id, environment_id)
 
@@ -291,11 +584,13 @@ async def deploy_template(
     """Deploy from Railway Template Library.
 
     Args:
-        project_id: The Railway project ID to deploy to
-        environment_id: The Railway environment ID to deploy to
+        project_id: The Railway project ID or name to deploy to
+        environment_id: The Railway environment ID or name to deploy to
         template_code: Template code (e.g., "redis", "postgres", "mysql")
         services: Optional list of service configurations
     """
+    from .tools import templates as template_tools
+
     client = get_client(ctx)
     return await template_tools.deploy_template(
         client, project_id, environment_id, template_code, services
@@ -303,22 +598,54 @@ async def deploy_template(
 
 
 @mcp.tool()
-async def list_templates(ctx: Context, limit: int = 50) -> list[dict[str, Any]]:
+async def list_templates(
+    ctx: Context, limit: int = 50, fresh: bool = False
+) -> list[dict[str, Any]]:
     """List available templates from Railway Template Library.
 
     Args:
         limit: Maximum number of templates to return (default: 50)
+        fresh: Bypass the response cache and fetch from Railway (default: False)
     """
+    from .tools import templates as template_tools
+
     client = get_client(ctx)
-    return await template_tools.list_templates(client, limit)
+    return await template_tools.list_templates(client, limit, fresh=fresh)
 
 
 @mcp.tool()
-async def get_template(ctx: Context, code: str) -> dict[str, Any]:
+async def get_template(ctx: Context, code: str, fresh: bool = False) -> dict[str, Any]:
     """Get template details.
 
     Args:
         code: Template code (e.g., "redis", "postgres")
+        fresh: Bypass the response cache and fetch from Railway (default: False)
     """
+    from .tools import templates as template_tools
+
+    client = get_client(ctx)
+    return await template_tools.get_template(client, code, fresh=fresh)
+
+
+# Search tools
+@mcp.tool()
+async def search(
+    ctx: Context, query: str, kinds: list[str] | None = None, limit: int = 20
+) -> list[dict[str, Any]]:
+    """Search projects, environments, services, domains and templates.
+
+    Matches whole words and word prefixes in names, template codes and
+    descriptions, tolerating small misspellings, from a local index.
+
+    Args:
+        query: Words to look for (e.g., "api prod", "postgre")
+        kinds: Only return these kinds: project, environment, service,
+            domain, template (default: all)
+        limit: Maximum number of results (default: 20)
+
+    Returns matches with their kind, ID, name, parent IDs and a relevance score.
+    """
+    from .tools.search import search as search_index
+
     client = get_client(ctx)
-    return await template_tools.get_template(client, code)
+    return await search_index(client, query, kinds, limit)
@@ -0,0 +1,168 @@
+"""Persist the response cache across restarts.
+
+The snapshot is a gzip-compressed JSON document holding the cached
+responses with their operation, variables, model name and the seconds they
+had left to live when it was written. Responses that hold secrets are never
+written, and the file is readable by its owner only. It records a hash of
+the API token, so responses are never restored for a different account.
+Restored entries keep their remaining TTL; once that has passed they are
+still served while a fresh copy is fetched in the background (see
+RailwayClient.execute).
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from . import __version__, codec, models
+from .cache import ResponseCache
+from .exceptions import GraphQLError
+
+logger = logging.getLogger(__name__)
+
+# Bump when the snapshot layout changes; other versions are ignored on load
+SNAPSHOT_VERSION = 1
+
+# Operations whose responses hold secrets (variable values) and never go to disk
+UNPERSISTED_OPERATIONS = frozenset({"ListVariables"})
+
+
+def save_snapshot(
+    cache: ResponseCache,
+    path: str | os.PathLike[str],
+    token: str,
+    clock: Callable[[], float] = time.time,
+) -> int:
+    """Write the cache contents to a snapshot file.
+
+    The file is replaced atomically, so a crash mid-write leaves the previous
+    snapshot intact, and is created readable by its owner only. Responses of
+    UNPERSISTED_OPERATIONS are left out.
+
+    Args:
+        cache: Cache to persist
+        path: Snapshot file path; parent directories are created
+        token: API token the cached responses were fetched with
+        clock: Wall-clock time source
+
+    Returns:
+        Number of entries written
+    """
+    entries = [
+        {
+            "operation": entry.operation,
+            "variables": entry.variables,
+            "model": entry.model.__name__ if entry.model is not None else None,
+            "expiresIn": round(expires_in, 3),
+            "value": models.to_builtins(entry.value),
+        }
+        for entry, expires_in in cache.entries()
+        if entry.operation not in UNPERSISTED_OPERATIONS
+    ]
+    document = {
+        "version": SNAPSHOT_VERSION,
+        "package": __version__,
+        "token": _fingerprint(token),
+        "savedAt": clock(),
+        "entries": entries,
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # mkstemp creates the file with mode 0600 under a unique name
+    descriptor, temporary = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(gzip.compress(codec.dumps(document), compresslevel=6))
+        Path(temporary).replace(path)
+    except BaseException:
+        Path(temporary).unlink(missing_ok=True)
+        raise
+    return len(entries)
+
+
+def load_snapshot(
+    cache: ResponseCache,
+    path: str | os.PathLike[str],
+    token: str,
+    max_age: float = 3600.0,
+    clock: Callable[[], float] = time.time,
+) -> int:
+    """Restore cache entries from a snapshot file.
+
+    A missing, unreadable or incompatible snapshot is ignored, as is one
+    written for another token or older than `max_age` seconds, since
+    restoring only saves round trips.
+
+    Args:
+        cache: Cache to restore into
+        path: Snapshot file path
+        token: API token the client uses
+        max_age: Seconds after which a snapshot is too old to restore
+        clock: Wall-clock time source
+
+    Returns:
+        Number of entries restored
+    """
+    try:
+        document = codec.loads(gzip.decompress(Path(path).read_bytes()))
+    except FileNotFoundError:
+        return 0
+    except (OSError, EOFError, ValueError) as e:
+        logger.warning("Ignoring unreadable cache snapshot %s: %s", path, e)
+        return 0
+
+    if document.get("version") != SNAPSHOT_VERSION or document.get("package") != __version__:
+        logger.info("Ignoring cache snapshot %s written by another version", path)
+        return 0
+    if document.get("token") != _fingerprint(token):
+        logger.info("Ignoring cache snapshot %s written for another token", path)
+        return 0
+    age = clock() - document.get("savedAt", 0)
+    if age > max_age:
+        return 0
+
+    restored = 0
+    # Most recently used entries last in the file, and restored first
+    for item in reversed(document.get("entries", [])):
+        if item["operation"] in UNPERSISTED_OPERATIONS:
+            continue
+        model = _resolve_model(item.get("model"))
+        if model is False:
+            continue
+        value = _rebuild(item["value"], model)
+        if value is None:
+            continue
+        restored += cache.restore(
+            item["operation"], item["variables"], value, model, item["expiresIn"] - age
+        )
+    return restored
+
+
+def _fingerprint(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def _resolve_model(name: str | None) -> Any:
+    """Return the model class for a name, None for plain data, or False if unknown."""
+    if name is None:
+        return None
+    model = getattr(models, name, None)
+    return model if isinstance(model, type) else False
+
+
+def _rebuild(value: Any, model: type | None) -> Any:
+    """Decode a snapshot value back into its model, or None if it no longer fits."""
+    if model is None:
+        return value
+    try:
+        return models.decode(codec.dumps({"data": value}), model).data
+    except GraphQLError:
+        return None
@@ -1,13 +1,61 @@
-"""Railway MCP tools."""
+"""Railway MCP tools.
+
+Tool functions are imported from their modules on first access, so that
+importing one tool module doesn't import every other one.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .deployments import (
+        export_logs,
+        get_logs,
+        list_deployments,
+        search_exported_logs,
+        search_logs,
+        tail_logs,
+    )
+    from .domains import generate_domain
+    from .environments import create_environment, link_environment
+    from .projects import create_project_and_link, list_projects
+    from .search import search
+    from .services import deploy, link_service, link_services, list_services
+    from .status import check_railway_status
+    from .templates import deploy_template
+    from .variables import list_variables, set_variables
+
+# Module defining each tool function
+_MODULES = {
+    "check_railway_status": "status",
+    "create_environment": "environments",
+    "create_project_and_link": "projects",
+    "deploy": "services",
+    "deploy_template": "templates",
+    "export_logs": "deployments",
+    "generate_domain": "domains",
+    "get_logs": "deployments",
+    "link_environment": "environments",
+    "link_service": "services",
+    "link_services": "services",
+    "list_deployments": "deployments",
+    "list_projects": "projects",
+    "list_services": "services",
+    "list_variables": "variables",
+    "search": "search",
+    "search_exported_logs": "deployments",
+    "search_logs": "deployments",
+    "set_variables": "variables",
+    "tail_logs": "deployments",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f".{module}", __name__), name)
 
-from .deployments import get_logs, list_deployments
-from .domains import generate_domain
-from .environments import create_environment, link_environment
-from .projects import create_project_and_link, list_projects
-from .services import deploy, link_service, list_services
-from .status import check_railway_status
-from .templates import deploy_template
-from .variables import list_variables, set_variables
 
 __all__ = [
     "check_railway_status",
@@ -15,13 +63,19 @@ __all__ = [
     "create_project_and_link",
     "deploy",
     "deploy_template",
+    "export_logs",
     "generate_domain",
     "get_logs",
     "link_environment",
     "link_service",
+    "link_services",
     "list_deployments",
     "list_projects",
     "list_services",
     "list_variables",
+    "search",
+    "search_exported_logs",
+    "search_logs",
     "set_variables",
+    "tail_logs",
 ]
@@ -1,13 +1,31 @@
 """Deployment and logs tools."""
 
-from typing import Any
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import Future
+from typing import Any, TypeVar
 
 from ..client import RailwayClient
+from ..exceptions import RailwayError
 from ..graphql.queries import (
     GET_BUILD_LOGS_QUERY,
     GET_DEPLOYMENT_LOGS_QUERY,
     LIST_DEPLOYMENTS_QUERY,
 )
+from ..logs.compact import compact_log
+from ..logs.cursor import LogWatermarks, decode_cursor, timestamp_key
+from ..logs.export import LogArchive, export_path
+from ..logs.filters import LogFilter, parse_time
+from ..models import (
+    BuildLogsData,
+    DeploymentLogsData,
+    ListDeploymentsData,
+    LogLine,
+    to_builtins,
+)
+from ..pagination import paginate
+from ..scheduler import Lane
 
 
 async def list_deployments(
@@ -20,55 +38,186 @@ async def list_deployments(
 
     Args:
         client: Railway API client
-        service_id: Service ID
-        environment_id: Environment ID
+        service_id: Service ID or name
+        environment_id: Environment ID or name
         limit: Maximum number of deployments to return
 
     Returns:
         List of deployment dictionaries
     """
-    data = await client.execute(
+    refs = await client.topology.resolve(service=service_id, environment=environment_id)
+    deployments = paginate(
+        client,
         LIST_DEPLOYMENTS_QUERY,
-        {"serviceId": service_id, "environmentId": environment_id, "first": limit},
+        {"serviceId": refs.service_id, "environmentId": refs.environment_id},
+        model=ListDeploymentsData,
+        connection=lambda data: data.deployments,
+        limit=limit,
     )
-    deployments = []
-
-    edges = data.get("deployments", {}).get("edges", [])
-    for edge in edges:
-        node = edge.get("node", {})
-        deployments.append(
-            {
-                "id": node.get("id"),
-                "status": node.get("status"),
-                "createdAt": node.get("createdAt"),
-                "updatedAt": node.get("updatedAt"),
-                "staticUrl": node.get("staticUrl"),
-                "meta": node.get("meta"),
-            }
-        )
-
-    return deployments
+    return [to_builtins(deployment) async for deployment in deployments]
 
 
 VALID_LOG_TYPES = {"build", "deployment"}
 
+# Most log lines requested at once; longer reads are fetched a page at a time
+LOG_PAGE_SIZE = 1000
+
+T = TypeVar("T")
+
 
 async def get_logs(
     client: RailwayClient,
     deployment_id: str,
     log_type: str = "deployment",
     limit: int = 100,
-) -> list[dict[str, Any]]:
+    cursor: str | None = None,
+    severity: str | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    pattern: str | None = None,
+    regex: bool = False,
+    context: int = 0,
+    compact: bool = False,
+) -> dict[str, Any]:
     """Retrieve build or deployment logs.
 
+    Pass the cursor from the previous call to fetch only lines logged since.
+    Lines can be filtered by severity, time window and text; the cursor
+    advances past filtered-out lines too. Compaction collapses repeated and
+    near-identical lines, such as progress output, into counted entries.
+
     Args:
         client: Railway API client
         deployment_id: Deployment ID
         log_type: Type of logs to retrieve ("build" or "deployment")
-        limit: Maximum number of log entries
+        limit: Maximum number of log entries to fetch
+        cursor: Cursor returned by the previous call
+        severity: Minimum severity (e.g., "warn", "error")
+        start: Only lines at or after this ISO 8601 time
+        end: Only lines before this ISO 8601 time
+        pattern: Only lines containing this text (case-insensitive)
+        regex: Treat pattern as a regular expression
+        context: Lines to include before and after each match
+        compact: Collapse repeated lines and group lines by template,
+            keeping error lines verbatim
+
+    Returns:
+        Dictionary with the log entries and the cursor for the next call,
+        plus the number of lines compacted when compacting
+
+    Raises:
+        ValueError: If log_type, cursor, severity, a time or the pattern is not valid
+    """
+    log_filter = _log_filter(log_type, severity, start, end, pattern, regex, False, context)
+    start_date = log_filter.start
+    if cursor is not None:
+        watermark, _ = decode_cursor(cursor)
+        if start_date is None or timestamp_key(watermark) > timestamp_key(start_date):
+            start_date = watermark
+    fetched = _PageReader(
+        _fetch_logs(client, deployment_id, log_type, limit, start_date, log_filter.end)
+    )
+
+    key = (deployment_id, log_type)
+    advance = client.log_watermarks.advance(key, cursor)
+    lines = advance.track(client.log_watermarks.filter(key, cursor, fetched))
+    selected = log_filter.apply(lines) if log_filter.active else lines
+
+    def read() -> dict[str, Any]:
+        return compact_log(selected) if compact else {"logs": list(selected)}
+
+    result = await fetched.run(read)
+    return {**result, "cursor": advance.cursor()}
+
+
+async def search_logs(
+    client: RailwayClient,
+    deployment_id: str,
+    pattern: str,
+    log_type: str = "deployment",
+    regex: bool = False,
+    case_sensitive: bool = False,
+    severity: str | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    context: int = 0,
+    limit: int = 50,
+    scan_limit: int = 1000,
+) -> dict[str, Any]:
+    """Search build or deployment logs for text or a regular expression.
+
+    Lines are matched page by page as they are fetched, in a single pass
+    that stops fetching once `limit` matches (and their trailing context)
+    are found.
+
+    Args:
+        client: Railway API client
+        deployment_id: Deployment ID
+        pattern: Text or regular expression to look for
+        log_type: Type of logs to search ("build" or "deployment")
+        regex: Treat pattern as a regular expression
+        case_sensitive: Match case
+        severity: Minimum severity (e.g., "warn", "error")
+        start: Only lines at or after this ISO 8601 time
+        end: Only lines before this ISO 8601 time
+        context: Lines to include before and after each match
+        limit: Maximum number of matches
+        scan_limit: Maximum number of log lines to fetch and search
+
+    Returns:
+        Dictionary with the matching lines (flagged "match" when context is
+        included), the number of matches and the number of lines searched
+
+    Raises:
+        ValueError: If log_type, severity, a time or the pattern is not valid
+    """
+    log_filter = _log_filter(
+        log_type, severity, start, end, pattern, regex, case_sensitive, context
+    )
+    fetched = _PageReader(
+        _fetch_logs(client, deployment_id, log_type, scan_limit, log_filter.start, log_filter.end)
+    )
+
+    scanned = 0
+
+    def lines() -> Iterator[dict[str, Any]]:
+        nonlocal scanned
+        for line in fetched:
+            scanned += 1
+            yield line
+
+    def search() -> list[dict[str, Any]]:
+        return list(log_filter.apply(lines(), max_matches=limit))
+
+    results = await fetched.run(search)
+    matches = sum(line.get("match", True) for line in results)
+    return {"logs": results, "matches": matches, "scanned": scanned}
+
+
+async def export_logs(
+    client: RailwayClient,
+    deployment_ids: list[str],
+    log_type: str = "deployment",
+    limit: int = 5000,
+) -> list[dict[str, Any]]:
+    """Export the logs of several deployments to compressed local files.
+
+    Deployments are fetched concurrently at bulk priority, once each even
+    if listed twice, and each log is written to disk page by page as it
+    is fetched. Each export replaces the previous one for the same
+    deployment and log type, and can then be searched with
+    search_exported_logs without calling the API.
+
+    Args:
+        client: Railway API client
+        deployment_ids: Deployment IDs to export
+        log_type: Type of logs to export ("build" or "deployment")
+        limit: Maximum number of log lines per deployment
 
     Returns:
-        List of log entries
+        One dictionary per deployment, in the order given, with the file
+        path, lines, compressed size and number of blocks, or the error the
+        export failed with
 
     Raises:
         ValueError: If log_type is not valid
@@ -78,24 +227,256 @@ async def get_logs(
             f"Invalid log_type '{log_type}'. Must be one of: {', '.join(sorted(VALID_LOG_TYPES))}"
         )
 
-    if log_type == "build":
-        query = GET_BUILD_LOGS_QUERY
-        key = "buildLogs"
-    else:
-        query = GET_DEPLOYMENT_LOGS_QUERY
-        key = "deploymentLogs"
+    async def export(deployment_id: str) -> dict[str, Any]:
+        try:
+            path = export_path(client.log_export_dir, deployment_id, log_type)
+            lines = _PageReader(
+                _fetch_logs(client, deployment_id, log_type, limit, None, None, lane=Lane.BULK)
+            )
+            archive = await lines.run(
+                LogArchive.write, path, lines, deploymentId=deployment_id, logType=log_type
+            )
+        except (RailwayError, ValueError, OSError) as e:
+            return {"deploymentId": deployment_id, "error": str(e)}
+        return {
+            "deploymentId": deployment_id,
+            "logType": log_type,
+            "path": str(archive.path),
+            "lines": archive.index["lines"],
+            "bytes": archive.index["bytes"],
+            "blocks": len(archive.index["blocks"]),
+        }
+
+    # Export each deployment once, even if it is listed more than once
+    unique = list(dict.fromkeys(deployment_ids))
+    results = dict(zip(unique, await asyncio.gather(*(export(d) for d in unique)), strict=True))
+    return [results[deployment_id] for deployment_id in deployment_ids]
+
+
+async def search_exported_logs(
+    client: RailwayClient,
+    deployment_id: str,
+    pattern: str | None = None,
+    log_type: str = "deployment",
+    regex: bool = False,
+    case_sensitive: bool = False,
+    severity: str | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    context: int = 0,
+    limit: int = 50,
+) -> dict[str, Any]:
+    """Search a deployment's exported logs.
+
+    Only the blocks of the export whose time range and severity can match
+    are decompressed.
+
+    Args:
+        client: Railway API client
+        deployment_id: Deployment ID
+        pattern: Text or regular expression to look for (any line if omitted)
+        log_type: Type of logs to search ("build" or "deployment")
+        regex: Treat pattern as a regular expression
+        case_sensitive: Match case
+        severity: Minimum severity (e.g., "warn", "error")
+        start: Only lines at or after this ISO 8601 time
+        end: Only lines before this ISO 8601 time
+        context: Lines to include before and after each match
+        limit: Maximum number of matches
+
+    Returns:
+        Dictionary with the matching lines (flagged "match" when context is
+        included), the number of matches, and the number of blocks read out
+        of the blocks in the export
 
+    Raises:
+        ValueError: If an argument is not valid or the logs were not exported
+    """
+    log_filter = _log_filter(
+        log_type, severity, start, end, pattern, regex, case_sensitive, context
+    )
+    path = export_path(client.log_export_dir, deployment_id, log_type)
+    try:
+        archive = LogArchive(path)
+    except FileNotFoundError as e:
+        raise ValueError(
+            f"No exported {log_type} logs for deployment '{deployment_id}'; run export_logs first"
+        ) from e
+
+    def search() -> list[dict[str, Any]]:
+        return list(archive.search(log_filter, max_matches=limit))
+
+    results = await asyncio.to_thread(search)
+    matches = sum(line.get("match", True) for line in results)
+    return {
+        "logs": results,
+        "matches": matches,
+        "blocksRead": archive.blocks_read,
+        "blocks": len(archive.index["blocks"]),
+    }
+
+
+def _log_filter(
+    log_type: str,
+    severity: str | None,
+    start: str | None,
+    end: str | None,
+    pattern: str | None,
+    regex: bool,
+    case_sensitive: bool,
+    context: int,
+) -> LogFilter:
+    """Validate log arguments and build their filter."""
+    if log_type not in VALID_LOG_TYPES:
+        raise ValueError(
+            f"Invalid log_type '{log_type}'. Must be one of: {', '.join(sorted(VALID_LOG_TYPES))}"
+        )
+    return LogFilter(
+        min_severity=severity,
+        start=parse_time(start) if start else None,
+        end=parse_time(end) if end else None,
+        pattern=pattern or None,
+        regex=regex,
+        case_sensitive=case_sensitive,
+        context=context,
+    )
+
+
+async def _fetch_logs(
+    client: RailwayClient,
+    deployment_id: str,
+    log_type: str,
+    limit: int,
+    start_date: str | None,
+    end_date: str | None,
+    lane: Lane = Lane.INTERACTIVE,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Fetch up to `limit` log lines a page at a time.
+
+    Each page after the first starts at the newest timestamp of the lines
+    before it; lines at that timestamp already yielded are dropped by their
+    hashes. Fetching stops at a short page or one with no new lines.
+    """
+    # Private state, so paging doesn't evict the cursors of get_logs callers
+    boundary = LogWatermarks(max_deployments=1, cursors_per_deployment=1)
+    cursor = None
+    while limit > 0:
+        size = min(limit, LOG_PAGE_SIZE)
+        logs = await _fetch_log_page(
+            client, deployment_id, log_type, size, start_date, end_date, lane
+        )
+        advance = boundary.advance(None, cursor)
+        page = list(
+            advance.track(boundary.filter(None, cursor, (to_builtins(line) for line in logs)))
+        )
+        if not page:
+            return
+        yield page
+        limit -= len(page)
+        cursor = advance.cursor()
+        if len(logs) < size or cursor is None:
+            return
+        start_date, _ = decode_cursor(cursor)
+
+
+async def _fetch_log_page(
+    client: RailwayClient,
+    deployment_id: str,
+    log_type: str,
+    limit: int,
+    start_date: str | None,
+    end_date: str | None,
+    lane: Lane,
+) -> list[LogLine]:
+    """Fetch one page of log lines, narrowing the request to a time window if given."""
+    variables: dict[str, Any] = {"deploymentId": deployment_id, "limit": limit}
+    if start_date is not None:
+        variables["startDate"] = start_date
+    if end_date is not None:
+        variables["endDate"] = end_date
+    if log_type == "build":
+        data = await client.execute(GET_BUILD_LOGS_QUERY, variables, model=BuildLogsData, lane=lane)
+        return data.buildLogs
     data = await client.execute(
-        query,
-        {"deploymentId": deployment_id, "limit": limit},
+        GET_DEPLOYMENT_LOGS_QUERY, variables, model=DeploymentLogsData, lane=lane
     )
+    return data.deploymentLogs
 
-    logs = data.get(key, [])
-    return [
-        {
-            "message": log.get("message"),
-            "timestamp": log.get("timestamp"),
-            "severity": log.get("severity"),
-        }
-        for log in logs
-    ]
+
+class _PageReader:
+    """The lines of paged log fetches, read by blocking code in a worker thread.
+
+    Iterating blocks the worker thread while the next page is fetched on the
+    event loop, and a page is fetched only once the previous one is used
+    up, so a reader that stops early stops the fetching too.
+    """
+
+    def __init__(self, pages: AsyncIterator[list[dict[str, Any]]]):
+        """Initialize a reader; call run() from the event loop to read it."""
+        self.pages = pages
+        self._loop = asyncio.get_running_loop()
+        self._stopped = threading.Event()
+        self._fetching: Future[list[dict[str, Any]] | None] | None = None
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        while True:
+            if self._stopped.is_set():
+                # Abandoned; fail rather than let the reader finish on a partial log
+                raise asyncio.CancelledError
+            self._fetching = asyncio.run_coroutine_threadsafe(self._next_page(), self._loop)
+            page = self._fetching.result()
+            if page is None:
+                return
+            yield from page
+
+    async def run(self, func: "Callable[..., T]", *args: Any, **kwargs: Any) -> "T":
+        """Call a blocking function that reads the lines in a worker thread."""
+        try:
+            return await asyncio.to_thread(func, *args, **kwargs)
+        finally:
+            self._stopped.set()
+            if self._fetching is not None and not self._fetching.done():
+                self._fetching.cancel()
+            else:
+                await self.pages.aclose()
+
+    async def _next_page(self) -> list[dict[str, Any]] | None:
+        return await anext(self.pages, None)
+
+
+async def tail_logs(
+    client: RailwayClient,
+    deployment_id: str,
+    log_type: str = "deployment",
+    cursor: str | None = None,
+    limit: int = 100,
+    wait: float = 2.0,
+) -> dict[str, Any]:
+    """Follow build or deployment logs as they are written.
+
+    The first call subscribes to the log; later calls with the returned
+    cursor return only lines written since. Concurrent callers share one
+    subscription per deployment.
+
+    Args:
+        client: Railway API client
+        deployment_id: Deployment ID
+        log_type: Type of logs ("build" or "deployment")
+        cursor: Cursor returned by the previous call (latest lines if omitted)
+        limit: Maximum number of lines to return
+        wait: Seconds to wait for new lines when there are none yet
+
+    Returns:
+        Dictionary with the lines, the cursor for the next call, the number
+        of lines skipped because they left the buffer unread, whether the
+        cursor's subscription had been closed so reading restarted at the
+        oldest buffered line, and whether the log is still being followed
+
+    Raises:
+        ValueError: If log_type or cursor is not valid
+    """
+    if log_type not in VALID_LOG_TYPES:
+        raise ValueError(
+            f"Invalid log_type '{log_type}'. Must be one of: {', '.join(sorted(VALID_LOG_TYPES))}"
+        )
+    return await client.log_streams.tail(deployment_id, log_type, cursor, limit, wait)
@@ -15,23 +15,36 @@ async def generate_domain(
 
     Args:
         client: Railway API client
-        service_id: Service ID
-        environment_id: Environment ID
+        service_id: Service ID or name
+        environment_id: Environment ID or name
 
     Returns:
         Created domain information
     """
+    refs = await client.topology.resolve(service=service_id, environment=environment_id)
     data = await client.execute(
         CREATE_SERVICE_DOMAIN_MUTATION,
-        {"serviceId": service_id, "environmentId": environment_id},
+        {"serviceId": refs.service_id, "environmentId": refs.environment_id},
     )
     domain = data.get("serviceDomainCreate", {})
+    full_domain = (
+        f"{domain.get('domain')}.{domain.get('suffix')}"
+        if domain.get("domain") and domain.get("suffix")
+        else domain.get("domain")
+    )
+    if domain.get("id") and full_domain:
+        service = client.topology.get(refs.service_id)
+        client.search.upsert(
+            "domain",
+            domain["id"],
+            full_domain,
+            project_id=service.project_id if service is not None else None,
+            service_id=refs.service_id,
+        )
 
     return {
         "id": domain.get("id"),
         "domain": domain.get("domain"),
         "suffix": domain.get("suffix"),
-        "fullDomain": f"{domain.get('domain')}.{domain.get('suffix')}"
-        if domain.get("domain") and domain.get("suffix")
-        else domain.get("domain"),
+        "fullDomain": full_domain,
     }
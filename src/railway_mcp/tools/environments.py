@@ -1,38 +1,57 @@
 """Environment tools."""
 
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
 from typing import Any
 
 from ..client import RailwayClient
 from ..graphql.mutations import CREATE_ENVIRONMENT_MUTATION
 from ..graphql.queries import LIST_ENVIRONMENTS_QUERY
+from ..models import Environment, ListEnvironmentsData, to_builtins
+from ..pagination import paginate
+from ..topology import NodeKind
 
 
-async def list_environments(client: RailwayClient, project_id: str) -> list[dict[str, Any]]:
+async def list_environments(
+    client: RailwayClient, project_id: str, fresh: bool = False, max_stale: float | None = None
+) -> list[dict[str, Any]]:
     """List environments in a project.
 
     Args:
         client: Railway API client
-        project_id: Project ID
+        project_id: Project ID or name
+        fresh: Bypass the response cache
+        max_stale: Seconds past its TTL a cached response may be served while
+            it is refreshed (defaults to the client's max_stale)
 
     Returns:
         List of environment dictionaries
     """
-    data = await client.execute(LIST_ENVIRONMENTS_QUERY, {"projectId": project_id})
-    environments = []
-
-    edges = data.get("project", {}).get("environments", {}).get("edges", [])
-    for edge in edges:
-        node = edge.get("node", {})
-        environments.append(
-            {
-                "id": node.get("id"),
-                "name": node.get("name"),
-                "createdAt": node.get("createdAt"),
-                "updatedAt": node.get("updatedAt"),
-            }
-        )
-
-    return environments
+    project_id = (await client.topology.resolve(project=project_id)).project_id
+    environments = _iter_environments(
+        client,
+        project_id,
+        fresh=fresh,
+        max_stale=client.max_stale if max_stale is None else max_stale,
+    )
+    nodes = [environment async for environment in environments]
+    client.topology.apply_children(project_id, NodeKind.ENVIRONMENT, nodes, complete=True)
+    return [to_builtins(environment) for environment in nodes]
+
+
+def _iter_environments(
+    client: RailwayClient, project_id: str, fresh: bool = False, max_stale: float = 0.0
+) -> AsyncGenerator[Environment, None]:
+    """Iterate over every environment in a project."""
+    return paginate(
+        client,
+        LIST_ENVIRONMENTS_QUERY,
+        {"projectId": project_id},
+        model=ListEnvironmentsData,
+        connection=lambda data: data.project.environments if data.project is not None else None,
+        fresh=fresh,
+        max_stale=max_stale,
+    )
 
 
 async def create_environment(
@@ -44,17 +63,26 @@ async def create_environment(
 
     Args:
         client: Railway API client
-        project_id: Project ID
+        project_id: Project ID or name
         name: Environment name
 
     Returns:
         Created environment information
     """
+    project_id = (await client.topology.resolve(project=project_id)).project_id
     data = await client.execute(
         CREATE_ENVIRONMENT_MUTATION,
         {"projectId": project_id, "name": name},
     )
     environment = data.get("environmentCreate", {})
+    if environment.get("id"):
+        client.topology.add(
+            NodeKind.ENVIRONMENT,
+            environment["id"],
+            environment.get("name"),
+            project_id,
+            environment.get("createdAt"),
+        )
 
     return {
         "id": environment.get("id"),
@@ -70,28 +98,52 @@ async def link_environment(
 
     Args:
         client: Railway API client
-        project_id: Project ID (for validation)
-        environment_id: Environment ID to link
+        project_id: Project ID or name (for validation)
+        environment_id: Environment ID or name to link
 
     Returns:
         Environment information
     """
-    # Get all environments and find the matching one
-    data = await client.execute(LIST_ENVIRONMENTS_QUERY, {"projectId": project_id})
-
-    edges = data.get("project", {}).get("environments", {}).get("edges", [])
-    for edge in edges:
-        node = edge.get("node", {})
-        if node.get("id") == environment_id:
-            return {
-                "id": node.get("id"),
-                "name": node.get("name"),
-                "projectId": project_id,
-                "createdAt": node.get("createdAt"),
-                "updatedAt": node.get("updatedAt"),
-            }
+    refs = await client.topology.resolve(project=project_id, environment=environment_id)
+    project_id, environment_id = refs.project_id, refs.environment_id
+
+    node = client.topology.get(environment_id)
+    if node is not None and node.project_id == project_id and node.created_at is not None:
+        return _environment_details(
+            node.id, node.name, project_id, node.created_at, node.updated_at
+        )
+
+    # Not indexed with its timestamps yet: walk the project's environments
+    # until the matching one is found, indexing those seen on the way
+    async with aclosing(_iter_environments(client, project_id)) as environments:
+        async for environment in environments:
+            client.topology.apply_children(project_id, NodeKind.ENVIRONMENT, [environment])
+            if environment.id == environment_id:
+                return _environment_details(
+                    environment.id,
+                    environment.name,
+                    project_id,
+                    environment.createdAt,
+                    environment.updatedAt,
+                )
 
     # If not found, raise an error
     from ..exceptions import EnvironmentNotFoundError
 
     raise EnvironmentNotFoundError(f"Environment {environment_id} not found in project")
+
+
+def _environment_details(
+    environment_id: str | None,
+    name: str | None,
+    project_id: str | None,
+    created_at: str | None,
+    updated_at: str | None,
+) -> dict[str, Any]:
+    return {
+        "id": environment_id,
+        "name": name,
+        "projectId": project_id,
+        "createdAt": created_at,
+        "updatedAt": updated_at,
+    }
@@ -5,41 +5,43 @@ from typing import Any
 from ..client import RailwayClient
 from ..graphql.mutations import CREATE_PROJECT_MUTATION
 from ..graphql.queries import LIST_PROJECTS_QUERY
+from ..models import ListProjectsData, to_builtins
+from ..pagination import paginate
+from ..topology import NodeKind
 
 
-async def list_projects(client: RailwayClient) -> list[dict[str, Any]]:
+async def list_projects(
+    client: RailwayClient,
+    fresh: bool = False,
+    limit: int | None = None,
+    max_stale: float | None = None,
+) -> list[dict[str, Any]]:
     """List all accessible Railway projects.
 
+    Args:
+        client: Railway API client
+        fresh: Bypass the response cache
+        limit: Maximum number of projects to return (all projects if omitted)
+        max_stale: Seconds past its TTL a cached response may be served while
+            it is refreshed (defaults to the client's max_stale)
+
     Returns:
         List of project dictionaries
     """
-    data = await client.execute(LIST_PROJECTS_QUERY)
-    projects = []
-
-    edges = data.get("me", {}).get("projects", {}).get("edges", [])
-    for edge in edges:
-        node = edge.get("node", {})
-        environments = [
-            {"id": e["node"]["id"], "name": e["node"]["name"]}
-            for e in node.get("environments", {}).get("edges", [])
-        ]
-        services = [
-            {"id": s["node"]["id"], "name": s["node"]["name"]}
-            for s in node.get("services", {}).get("edges", [])
-        ]
-        projects.append(
-            {
-                "id": node.get("id"),
-                "name": node.get("name"),
-                "description": node.get("description"),
-                "createdAt": node.get("createdAt"),
-                "updatedAt": node.get("updatedAt"),
-                "environments": environments,
-                "services": services,
-            }
-        )
-
-    return projects
+    projects = paginate(
+        client,
+        LIST_PROJECTS_QUERY,
+        model=ListProjectsData,
+        connection=lambda data: data.me.projects if data.me is not None else None,
+        limit=limit,
+        fresh=fresh,
+        max_stale=client.max_stale if max_stale is None else max_stale,
+    )
+    results = []
+    async for project in projects:
+        client.topology.apply_project(project)
+        results.append(to_builtins(project))
+    return results
 
 
 async def create_project_and_link(
@@ -72,6 +74,17 @@ async def create_project_and_link(
         {"id": e["node"]["id"], "name": e["node"]["name"]}
         for e in project.get("environments", {}).get("edges", [])
     ]
+    if project.get("id"):
+        client.topology.add(
+            NodeKind.PROJECT,
+            project["id"],
+            project.get("name"),
+            created_at=project.get("createdAt"),
+        )
+        for environment in environments:
+            client.topology.add(
+                NodeKind.ENVIRONMENT, environment["id"], environment["name"], project["id"]
+            )
 
     return {
         "id": project.get("id"),
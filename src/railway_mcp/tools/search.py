@@ -0,0 +1,53 @@
+"""Search tools."""
+
+from typing import Any
+
+from ..client import RailwayClient
+from ..search import SEARCH_KINDS
+from .templates import index_templates
+
+
+async def search(
+    client: RailwayClient,
+    query: str,
+    kinds: list[str] | None = None,
+    limit: int = 20,
+) -> list[dict[str, Any]]:
+    """Search projects, environments, services, domains and templates by name.
+
+    Answers from the local search index. The first search walks every
+    project (and lists the domains of every service, and the template
+    library, if those are searched); after that the index follows tool
+    results and background topology refreshes.
+
+    Args:
+        client: Railway API client
+        query: Words or word prefixes to look for; misspellings are tolerated
+        kinds: Kinds of objects to return (default: all)
+        limit: Maximum number of results
+
+    Returns:
+        Matches by descending relevance
+
+    Raises:
+        ValueError: If a kind is not valid
+    """
+    wanted = set(kinds) if kinds else set(SEARCH_KINDS)
+    invalid = wanted - SEARCH_KINDS
+    if invalid:
+        raise ValueError(
+            f"Invalid kinds: {', '.join(sorted(invalid))}. "
+            f"Must be among: {', '.join(sorted(SEARCH_KINDS))}"
+        )
+
+    topology = client.topology
+    if topology.refreshed_at is None:
+        await topology.refresh()
+    elif topology.refresh_interval > 0 and topology.stale:
+        topology.start_refresh()
+    if "domain" in wanted and "domain" not in client.search.complete:
+        await topology.index_domains()
+    if "template" in wanted and "template" not in client.search.complete:
+        await index_templates(client)
+
+    return [hit.as_dict() for hit in client.search.search(query, wanted, limit)]
@@ -4,36 +4,40 @@ from typing import Any
 
 from ..client import RailwayClient
 from ..graphql.mutations import DEPLOY_SERVICE_MUTATION
-from ..graphql.queries import GET_SERVICE_QUERY, LIST_SERVICES_QUERY
+from ..graphql.queries import LIST_SERVICES_QUERY
+from ..models import ListServicesData, to_builtins
+from ..pagination import paginate
+from ..topology import NodeKind
 
 
-async def list_services(client: RailwayClient, project_id: str) -> list[dict[str, Any]]:
+async def list_services(
+    client: RailwayClient, project_id: str, fresh: bool = False, max_stale: float | None = None
+) -> list[dict[str, Any]]:
     """List services in a project.
 
     Args:
         client: Railway API client
-        project_id: Project ID
+        project_id: Project ID or name
+        fresh: Bypass the response cache
+        max_stale: Seconds past its TTL a cached response may be served while
+            it is refreshed (defaults to the client's max_stale)
 
     Returns:
         List of service dictionaries
     """
-    data = await client.execute(LIST_SERVICES_QUERY, {"projectId": project_id})
-    services = []
-
-    edges = data.get("project", {}).get("services", {}).get("edges", [])
-    for edge in edges:
-        node = edge.get("node", {})
-        services.append(
-            {
-                "id": node.get("id"),
-                "name": node.get("name"),
-                "icon": node.get("icon"),
-                "createdAt": node.get("createdAt"),
-                "updatedAt": node.get("updatedAt"),
-            }
-        )
-
-    return services
+    project_id = (await client.topology.resolve(project=project_id)).project_id
+    services = paginate(
+        client,
+        LIST_SERVICES_QUERY,
+        {"projectId": project_id},
+        model=ListServicesData,
+        connection=lambda data: data.project.services if data.project is not None else None,
+        fresh=fresh,
+        max_stale=client.max_stale if max_stale is None else max_stale,
+    )
+    nodes = [service async for service in services]
+    client.topology.apply_children(project_id, NodeKind.SERVICE, nodes, complete=True)
+    return [to_builtins(service) for service in nodes]
 
 
 async def link_service(client: RailwayClient, service_id: str) -> dict[str, Any]:
@@ -41,7 +45,7 @@ async def link_service(client: RailwayClient, service_id: str) -> dict[str, Any]
 
     Args:
         client: Railway API client
-        service_id: Service ID to link
+        service_id: Service ID or name to link
 
     Returns:
         Service information
@@ -51,12 +55,55 @@ async def link_service(client: RailwayClient, service_id: str) -> dict[str, Any]
     """
     from ..exceptions import ServiceNotFoundError
 
-    data = await client.execute(GET_SERVICE_QUERY, {"serviceId": service_id})
-    service = data.get("service", {})
+    service_id = (await client.topology.resolve(service=service_id)).service_id
+    service = await client.loader.load("service", service_id) or {}
 
     if not service.get("id"):
         raise ServiceNotFoundError(f"Service {service_id} not found")
 
+    return _service_details(client, service)
+
+
+async def link_services(client: RailwayClient, service_ids: list[str]) -> list[dict[str, Any]]:
+    """Get details for several services in a single API request.
+
+    Args:
+        client: Railway API client
+        service_ids: Service IDs or names to link
+
+    Returns:
+        Service information, in the order of service_ids
+
+    Raises:
+        ServiceNotFoundError: If any service is not found
+    """
+    from ..exceptions import ServiceNotFoundError
+
+    service_ids = [
+        (await client.topology.resolve(service=service_id)).service_id for service_id in service_ids
+    ]
+    services = await client.loader.load_many("service", service_ids)
+
+    missing = [
+        service_id
+        for service_id, service in zip(service_ids, services, strict=True)
+        if not (service or {}).get("id")
+    ]
+    if missing:
+        raise ServiceNotFoundError(f"Services not found: {', '.join(missing)}")
+
+    return [_service_details(client, service) for service in services]
+
+
+def _service_details(client: RailwayClient, service: dict[str, Any]) -> dict[str, Any]:
+    client.topology.add(
+        NodeKind.SERVICE,
+        service["id"],
+        service.get("name"),
+        service.get("projectId"),
+        service.get("createdAt"),
+        service.get("updatedAt"),
+    )
     return {
         "id": service.get("id"),
         "name": service.get("name"),
@@ -76,15 +123,16 @@ async def deploy(
 
     Args:
         client: Railway API client
-        service_id: Service ID to deploy
-        environment_id: Environment ID to deploy to
+        service_id: Service ID or name to deploy
+        environment_id: Environment ID or name to deploy to
 
     Returns:
         Deployment result
     """
+    refs = await client.topology.resolve(service=service_id, environment=environment_id)
     data = await client.execute(
         DEPLOY_SERVICE_MUTATION,
-        {"serviceId": service_id, "environmentId": environment_id},
+        {"serviceId": refs.service_id, "environmentId": refs.environment_id},
     )
 
     # serviceInstanceDeploy returns a boolean
@@ -92,7 +140,7 @@ async def deploy(
 
     return {
         "success": success,
-        "serviceId": service_id,
-        "environmentId": environment_id,
+        "serviceId": refs.service_id,
+        "environmentId": refs.environment_id,
         "message": "Deployment triggered successfully" if success else "Deployment failed",
     }
@@ -17,4 +17,5 @@ async def check_railway_status(client: RailwayClient) -> dict:
             "name": user.get("name"),
             "email": user.get("email"),
         },
+        "client": client.stats(),
     }
@@ -5,62 +5,83 @@ from typing import Any
 from ..client import RailwayClient
 from ..graphql.mutations import DEPLOY_TEMPLATE_MUTATION
 from ..graphql.queries import GET_TEMPLATE_QUERY, LIST_TEMPLATES_QUERY
+from ..models import GetTemplateData, ListTemplatesData, Template, TemplateDetails, to_builtins
+from ..pagination import paginate
+from ..scheduler import Lane
 
 
-async def list_templates(client: RailwayClient, limit: int = 50) -> list[dict[str, Any]]:
+async def list_templates(
+    client: RailwayClient, limit: int = 50, fresh: bool = False
+) -> list[dict[str, Any]]:
     """List available templates from Railway Template Library.
 
     Args:
         client: Railway API client
         limit: Maximum number of templates to return
+        fresh: Bypass the response cache
 
     Returns:
         List of template dictionaries
     """
-    data = await client.execute(LIST_TEMPLATES_QUERY, {"first": limit})
-    templates = []
-
-    edges = data.get("templates", {}).get("edges", [])
-    for edge in edges:
-        node = edge.get("node", {})
-        templates.append(
-            {
-                "id": node.get("id"),
-                "code": node.get("code"),
-                "name": node.get("name"),
-                "description": node.get("description"),
-                "category": node.get("category"),
-                "health": node.get("health"),
-                "activeProjects": node.get("activeProjects"),
-            }
+    templates = paginate(
+        client,
+        LIST_TEMPLATES_QUERY,
+        model=ListTemplatesData,
+        connection=lambda data: data.templates,
+        limit=limit,
+        fresh=fresh,
+    )
+    results = []
+    async for template in templates:
+        index_template(client, template)
+        results.append(to_builtins(template))
+    return results
+
+
+async def index_templates(client: RailwayClient) -> None:
+    """Add every template in the library to the search index."""
+    templates = paginate(
+        client,
+        LIST_TEMPLATES_QUERY,
+        model=ListTemplatesData,
+        connection=lambda data: data.templates,
+        lane=Lane.BULK,
+    )
+    async for template in templates:
+        index_template(client, template)
+    client.search.complete.add("template")
+
+
+def index_template(client: RailwayClient, template: Template) -> None:
+    """Add a template to the search index."""
+    if template.id is not None:
+        client.search.upsert(
+            "template",
+            template.id,
+            template.name,
+            code=template.code,
+            category=template.category,
+            description=template.description,
         )
 
-    return templates
 
-
-async def get_template(client: RailwayClient, code: str) -> dict[str, Any]:
+async def get_template(client: RailwayClient, code: str, fresh: bool = False) -> dict[str, Any]:
     """Get template details.
 
     Args:
         client: Railway API client
         code: Template code (e.g., "redis", "postgres")
+        fresh: Bypass the response cache
 
     Returns:
         Template information
     """
-    data = await client.execute(GET_TEMPLATE_QUERY, {"code": code})
-    template = data.get("template", {})
-
-    return {
-        "id": template.get("id"),
-        "code": template.get("code"),
-        "name": template.get("name"),
-        "description": template.get("description"),
-        "category": template.get("category"),
-        "health": template.get("health"),
-        "activeProjects": template.get("activeProjects"),
-        "services": template.get("services", []),
-    }
+    data = await client.execute(
+        GET_TEMPLATE_QUERY, {"code": code}, fresh=fresh, model=GetTemplateData
+    )
+    if data.template is not None:
+        index_template(client, data.template)
+    return to_builtins(data.template or TemplateDetails())
 
 
 async def deploy_template(
@@ -74,17 +95,18 @@ async def deploy_template(
 
     Args:
         client: Railway API client
-        project_id: Project ID to deploy to
-        environment_id: Environment ID to deploy to
+        project_id: Project ID or name to deploy to
+        environment_id: Environment ID or name to deploy to
         template_code: Template code (e.g., "redis", "postgres")
         services: Optional list of service configurations
 
     Returns:
         Deployment result
     """
+    refs = await client.topology.resolve(project=project_id, environment=environment_id)
     variables = {
-        "projectId": project_id,
-        "environmentId": environment_id,
+        "projectId": refs.project_id,
+        "environmentId": refs.environment_id,
         "templateCode": template_code,
     }
     if services:
@@ -18,20 +18,23 @@ async def list_variables(
 
     Args:
         client: Railway API client
-        project_id: Project ID
-        environment_id: Environment ID
-        service_id: Optional service ID (for service-specific variables)
+        project_id: Project ID or name
+        environment_id: Environment ID or name
+        service_id: Optional service ID or name (for service-specific variables)
         include_values: If True, return actual values; if False, return masked values
 
     Returns:
         Dictionary of variable names and values (masked or actual based on include_values)
     """
+    refs = await client.topology.resolve(
+        project=project_id, environment=environment_id, service=service_id
+    )
     variables = {
-        "projectId": project_id,
-        "environmentId": environment_id,
+        "projectId": refs.project_id,
+        "environmentId": refs.environment_id,
     }
-    if service_id:
-        variables["serviceId"] = service_id
+    if refs.service_id:
+        variables["serviceId"] = refs.service_id
 
     data = await client.execute(LIST_VARIABLES_QUERY, variables)
 
@@ -56,21 +59,24 @@ async def set_variables(
 
     Args:
         client: Railway API client
-        project_id: Project ID
-        environment_id: Environment ID
+        project_id: Project ID or name
+        environment_id: Environment ID or name
         variables: Dictionary of variable names and values to set
-        service_id: Optional service ID (for service-specific variables)
+        service_id: Optional service ID or name (for service-specific variables)
 
     Returns:
         Result of the operation
     """
+    refs = await client.topology.resolve(
+        project=project_id, environment=environment_id, service=service_id
+    )
     mutation_variables = {
-        "projectId": project_id,
-        "environmentId": environment_id,
+        "projectId": refs.project_id,
+        "environmentId": refs.environment_id,
         "variables": variables,
     }
-    if service_id:
-        mutation_variables["serviceId"] = service_id
+    if refs.service_id:
+        mutation_variables["serviceId"] = refs.service_id
 
     data = await client.execute(SET_VARIABLES_MUTATION, mutation_variables)
 
@@ -0,0 +1,499 @@
+"""In-memory index of projects, environments and services.
+
+Tools use the index to turn names into IDs and to look up parent projects
+without asking the API. It is filled from every list_projects page, list
+of services or environments and service lookup the server sees, and
+refreshed in the background by walking LIST_PROJECTS_QUERY. Every change
+is mirrored into the search index, so it never needs a rebuild. Once
+domains have been searched, each walk also lists the domains of every
+service.
+"""
+
+import asyncio
+import contextvars
+import logging
+import re
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+from .exceptions import AmbiguousNameError
+from .graphql.queries import (
+    LIST_DOMAINS_QUERY,
+    LIST_ENVIRONMENTS_QUERY,
+    LIST_PROJECTS_QUERY,
+    LIST_SERVICES_QUERY,
+)
+from .models import ListEnvironmentsData, ListProjectsData, ListServicesData, Project
+from .pagination import paginate
+from .scheduler import Lane
+from .search import SearchIndex
+
+if TYPE_CHECKING:
+    from .client import RailwayClient
+
+logger = logging.getLogger(__name__)
+
+# Railway object IDs are UUIDs; anything else passed as a reference is a name
+_ID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.I)
+
+
+class NodeKind(StrEnum):
+    """Kinds of objects held in the index."""
+
+    PROJECT = "project"
+    ENVIRONMENT = "environment"
+    SERVICE = "service"
+
+
+@dataclass(slots=True)
+class TopologyNode:
+    """A project, environment or service and its parent project."""
+
+    kind: NodeKind
+    id: str
+    name: str | None = None
+    project_id: str | None = None
+    created_at: str | None = None
+    updated_at: str | None = None
+    description: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ResolvedRefs:
+    """IDs resolved from tool arguments.
+
+    Arguments that could not be resolved locally are passed through
+    unchanged, so the API reports them as not found.
+    """
+
+    project_id: str | None = None
+    environment_id: str | None = None
+    service_id: str | None = None
+
+
+class TopologyIndex:
+    """Hash-map index of IDs, names and parent links."""
+
+    def __init__(
+        self,
+        client: "RailwayClient",
+        refresh_interval: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        search: SearchIndex | None = None,
+    ):
+        """Initialize an empty index.
+
+        Args:
+            client: Railway API client used for refreshes
+            refresh_interval: Seconds after which a lookup schedules a
+                background refresh (0 disables refreshing on lookups)
+            clock: Monotonic time source
+            search: Search index kept in step with the nodes
+        """
+        self.client = client
+        self.refresh_interval = refresh_interval
+        self.search = search
+        self.refreshed_at: float | None = None
+        self.refreshes = 0
+        self._clock = clock
+        self._nodes: dict[str, TopologyNode] = {}
+        # (kind, project ID or None for any project, casefolded name) -> IDs
+        self._names: dict[tuple[NodeKind, str | None, str], set[str]] = {}
+        self._children: dict[str, set[str]] = {}
+        self._refresh: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def stale(self) -> bool:
+        """Whether the last full refresh is older than the refresh interval."""
+        return (
+            self.refreshed_at is None or self._clock() - self.refreshed_at >= self.refresh_interval
+        )
+
+    def get(self, node_id: str) -> TopologyNode | None:
+        """Return the node with an ID."""
+        return self._nodes.get(node_id)
+
+    def nodes(self, kind: NodeKind) -> list[TopologyNode]:
+        """Return every node of a kind."""
+        return [node for node in self._nodes.values() if node.kind is kind]
+
+    def children(self, project_id: str, kind: NodeKind) -> list[TopologyNode]:
+        """Return a project's environments or services."""
+        return [
+            node
+            for node_id in self._children.get(project_id, ())
+            if (node := self._nodes[node_id]).kind is kind
+        ]
+
+    def find(self, kind: NodeKind, name: str, project_id: str | None = None) -> TopologyNode | None:
+        """Return the node of a kind with a name, optionally within a project.
+
+        Raises:
+            AmbiguousNameError: If several nodes match
+        """
+        ids = self._names.get((kind, project_id, name.casefold()))
+        if not ids:
+            return None
+        if len(ids) > 1:
+            raise AmbiguousNameError(
+                f"{kind.value.capitalize()} name '{name}' matches several IDs: "
+                f"{', '.join(sorted(ids))}"
+            )
+        return self._nodes[next(iter(ids))]
+
+    def lookup(
+        self, kind: NodeKind, ref: str, project_id: str | None = None
+    ) -> TopologyNode | None:
+        """Return the node for an ID or name, optionally within a project."""
+        node = self._nodes.get(ref)
+        if node is not None and node.kind is kind:
+            if project_id is None or node.project_id in (None, project_id):
+                return node
+            return None
+        return self.find(kind, ref, project_id)
+
+    def add(
+        self,
+        kind: NodeKind,
+        node_id: str,
+        name: str | None = None,
+        project_id: str | None = None,
+        created_at: str | None = None,
+        updated_at: str | None = None,
+        description: str | None = None,
+    ) -> TopologyNode:
+        """Add or update a node; fields passed as None keep their known value."""
+        existing = self._nodes.get(node_id)
+        if existing is not None:
+            name = name if name is not None else existing.name
+            project_id = project_id if project_id is not None else existing.project_id
+            created_at = created_at if created_at is not None else existing.created_at
+            updated_at = updated_at if updated_at is not None else existing.updated_at
+            description = description if description is not None else existing.description
+            if existing.name == name and existing.project_id == project_id:
+                existing.created_at = created_at
+                existing.updated_at = updated_at
+                existing.description = description
+                self._index(existing)
+                return existing
+            self.remove(node_id, cascade=False)
+
+        node = TopologyNode(kind, node_id, name, project_id, created_at, updated_at, description)
+        self._nodes[node_id] = node
+        if name is not None:
+            for scope in {None, project_id}:
+                self._names.setdefault((kind, scope, name.casefold()), set()).add(node_id)
+        if project_id is not None and kind is not NodeKind.PROJECT:
+            self._children.setdefault(project_id, set()).add(node_id)
+        self._index(node)
+        return node
+
+    def _index(self, node: TopologyNode) -> None:
+        if self.search is not None:
+            self.search.upsert(
+                node.kind.value,
+                node.id,
+                node.name,
+                project_id=node.project_id,
+                description=node.description,
+            )
+
+    def remove(self, node_id: str, cascade: bool = True) -> None:
+        """Remove a node and, for projects, their environments and services."""
+        node = self._nodes.pop(node_id, None)
+        if node is None:
+            return
+        if self.search is not None:
+            self.search.remove(node_id)
+            if node.kind is NodeKind.SERVICE:
+                self.search.remove_children(node_id)
+        if node.name is not None:
+            for scope in {None, node.project_id}:
+                key = (node.kind, scope, node.name.casefold())
+                ids = self._names.get(key)
+                if ids is not None:
+                    ids.discard(node_id)
+                    if not ids:
+                        del self._names[key]
+        if node.project_id is not None:
+            self._children.get(node.project_id, set()).discard(node_id)
+        if cascade and node.kind is NodeKind.PROJECT:
+            for child_id in self._children.pop(node_id, set()):
+                self.remove(child_id)
+
+    def apply_project(self, project: Project) -> None:
+        """Index a project with its environments and services.
+
+        Children missing from a list are removed only if the list is complete.
+        """
+        if project.id is None:
+            return
+        self.add(
+            NodeKind.PROJECT,
+            project.id,
+            project.name,
+            None,
+            project.createdAt,
+            project.updatedAt,
+            project.description,
+        )
+        self.apply_children(
+            project.id,
+            NodeKind.ENVIRONMENT,
+            project.environments,
+            complete=not project.hasMoreEnvironments,
+        )
+        self.apply_children(
+            project.id, NodeKind.SERVICE, project.services, complete=not project.hasMoreServices
+        )
+
+    def apply_children(
+        self, project_id: str, kind: NodeKind, nodes: Iterable[Any], complete: bool = False
+    ) -> None:
+        """Index environments or services of a project.
+
+        Args:
+            project_id: Parent project ID
+            kind: NodeKind.ENVIRONMENT or NodeKind.SERVICE
+            nodes: Model objects with `id`, `name` and optionally timestamps
+            complete: Whether `nodes` is every child of the kind, so that
+                children missing from it are removed
+        """
+        seen = set()
+        for item in nodes:
+            if item.id is None:
+                continue
+            self.add(
+                kind,
+                item.id,
+                item.name,
+                project_id,
+                getattr(item, "createdAt", None),
+                getattr(item, "updatedAt", None),
+            )
+            seen.add(item.id)
+        if complete:
+            for node in self.children(project_id, kind):
+                if node.id not in seen:
+                    self.remove(node.id)
+
+    async def resolve(
+        self,
+        *,
+        project: str | None = None,
+        environment: str | None = None,
+        service: str | None = None,
+    ) -> ResolvedRefs:
+        """Resolve project, environment and service IDs or names to IDs.
+
+        Services are looked up within the project if one is given, and
+        environments within the given project or else the service's project.
+        Before giving up on a name, a refresh in progress is awaited, or one
+        is started and awaited if no walk has completed yet (the first one
+        may have failed, or background refreshes may be disabled). IDs the
+        index doesn't know yet pass through without waiting; a walk is
+        started in the background if none has completed. A stale index is
+        refreshed in the background.
+
+        Raises:
+            AmbiguousNameError: If a name matches several objects
+        """
+        refs, missed = self._resolve(project, environment, service)
+        if missed and self.refreshed_at is None:
+            self.start_refresh()
+        missed_name = any(_ID_RE.match(ref) is None for ref in missed)
+        if missed_name and self._refresh is not None and not self._refresh.done():
+            # Failures are logged by the task; unresolved arguments pass through
+            await asyncio.wait({self._refresh})
+            refs, _ = self._resolve(project, environment, service)
+        if self.refresh_interval > 0 and self.refreshed_at is not None and self.stale:
+            self.start_refresh()
+        return refs
+
+    def _resolve(
+        self, project: str | None, environment: str | None, service: str | None
+    ) -> tuple[ResolvedRefs, list[str]]:
+        """Resolve what the index knows, returning the references it doesn't."""
+        project_node = self.lookup(NodeKind.PROJECT, project) if project else None
+        project_id = project_node.id if project_node is not None else project
+        service_node = self.lookup(NodeKind.SERVICE, service, project_id) if service else None
+        if project_id is None and service_node is not None:
+            project_id = service_node.project_id
+        environment_node = (
+            self.lookup(NodeKind.ENVIRONMENT, environment, project_id) if environment else None
+        )
+        refs = ResolvedRefs(
+            project_id=project_id,
+            environment_id=environment_node.id if environment_node is not None else environment,
+            service_id=service_node.id if service_node is not None else service,
+        )
+        missed = [
+            ref
+            for ref, node in (
+                (project, project_node),
+                (environment, environment_node),
+                (service, service_node),
+            )
+            if ref is not None and node is None
+        ]
+        return refs, missed
+
+    async def refresh(self) -> None:
+        """Walk every project and rebuild the index, sharing a refresh in progress."""
+        await asyncio.shield(self.start_refresh())
+
+    def start_refresh(self) -> asyncio.Task[None]:
+        """Start a background refresh unless one is already running.
+
+        Returns:
+            The running refresh task
+        """
+        if self._refresh is None or self._refresh.done():
+            # Run outside the caller's context so a tool deadline doesn't apply
+            self._refresh = asyncio.get_running_loop().create_task(
+                self._walk(), context=contextvars.Context()
+            )
+            self._refresh.add_done_callback(_log_failure)
+        return self._refresh
+
+    async def stop_refresh(self) -> None:
+        """Cancel a refresh in progress."""
+        if self._refresh is not None and not self._refresh.done():
+            self._refresh.cancel()
+            await asyncio.gather(self._refresh, return_exceptions=True)
+
+    async def _walk(self) -> None:
+        seen = set()
+        projects = paginate(
+            self.client,
+            LIST_PROJECTS_QUERY,
+            model=ListProjectsData,
+            connection=lambda data: data.me.projects if data.me is not None else None,
+            lane=Lane.BULK,
+        )
+        # Apply each page as it arrives, and drop vanished projects only
+        # once the walk has completed
+        async for project in projects:
+            self.apply_project(project)
+            seen.add(project.id)
+            if project.id is not None and project.hasMoreEnvironments:
+                await self._walk_children(
+                    project.id,
+                    NodeKind.ENVIRONMENT,
+                    LIST_ENVIRONMENTS_QUERY,
+                    ListEnvironmentsData,
+                    lambda data: data.project.environments if data.project is not None else None,
+                )
+            if project.id is not None and project.hasMoreServices:
+                await self._walk_children(
+                    project.id,
+                    NodeKind.SERVICE,
+                    LIST_SERVICES_QUERY,
+                    ListServicesData,
+                    lambda data: data.project.services if data.project is not None else None,
+                )
+        for node in self.nodes(NodeKind.PROJECT):
+            if node.id not in seen:
+                self.remove(node.id)
+        self.refreshed_at = self._clock()
+        self.refreshes += 1
+        if self.search is not None and "domain" in self.search.complete:
+            await self.index_domains()
+
+    async def index_domains(self) -> None:
+        """Add the service and custom domains of every known service to the search index.
+
+        Sends one ListDomains request per service and environment of its
+        project, at bulk priority. Domains no longer listed are removed.
+        """
+        if self.search is None:
+            return
+        targets = [
+            (project.id, service.id, environment.id)
+            for project in self.nodes(NodeKind.PROJECT)
+            for service in self.children(project.id, NodeKind.SERVICE)
+            for environment in self.children(project.id, NodeKind.ENVIRONMENT)
+        ]
+        listings = await asyncio.gather(
+            *(
+                self.client.execute(
+                    LIST_DOMAINS_QUERY,
+                    {
+                        "projectId": project_id,
+                        "environmentId": environment_id,
+                        "serviceId": service_id,
+                    },
+                    lane=Lane.BULK,
+                )
+                for project_id, service_id, environment_id in targets
+            )
+        )
+        seen = set()
+        for (project_id, service_id, _), data in zip(targets, listings, strict=True):
+            domains = data.get("domains") or {}
+            for domain in [
+                *(domains.get("serviceDomains") or []),
+                *(domains.get("customDomains") or []),
+            ]:
+                name = (
+                    f"{domain.get('domain')}.{domain['suffix']}"
+                    if domain.get("domain") and domain.get("suffix")
+                    else domain.get("domain")
+                )
+                if domain.get("id") and name:
+                    self.search.upsert(
+                        "domain", domain["id"], name, project_id=project_id, service_id=service_id
+                    )
+                    seen.add(domain["id"])
+        for doc_id in self.search.ids("domain"):
+            if doc_id not in seen:
+                self.search.remove(doc_id)
+        self.search.complete.add("domain")
+
+    async def _walk_children(
+        self,
+        project_id: str,
+        kind: NodeKind,
+        query: str,
+        model: type,
+        connection: Callable[[Any], Any],
+    ) -> None:
+        """Page through a project's environments or services listed only in part."""
+        children = paginate(
+            self.client,
+            query,
+            {"projectId": project_id},
+            model=model,
+            connection=connection,
+            lane=Lane.BULK,
+        )
+        nodes = [child async for child in children]
+        self.apply_children(project_id, kind, nodes, complete=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the index size and refresh counters."""
+        counts = dict.fromkeys(NodeKind, 0)
+        for node in self._nodes.values():
+            counts[node.kind] += 1
+        return {
+            "projects": counts[NodeKind.PROJECT],
+            "environments": counts[NodeKind.ENVIRONMENT],
+            "services": counts[NodeKind.SERVICE],
+            "refreshes": self.refreshes,
+            "ageSeconds": (
+                round(self._clock() - self.refreshed_at, 1)
+                if self.refreshed_at is not None
+                else None
+            ),
+        }
+
+
+def _log_failure(task: asyncio.Task[None]) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Topology index refresh failed: %s", task.exception())
@@ -0,0 +1,136 @@
+"""Tests for the circuit breaker."""
+
+import json
+
+import pytest
+import respx
+from httpx import Response
+
+from railway_mcp.breaker import CircuitBreaker, CircuitState
+from railway_mcp.cache import ResponseCache
+from railway_mcp.client import RailwayClient
+from railway_mcp.exceptions import CircuitOpenError, GraphQLError, OverloadedError
+from railway_mcp.scheduler import Lane, Scheduler
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_opens_on_failure_rate_and_closes_after_probe():
+    """Test the breaker opens at the failure rate and probes once after the timeout."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_rate=0.5, min_requests=4, reset_timeout=10, clock=clock)
+
+    for failed in (False, True, False):
+        breaker.record(failed)
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state is CircuitState.OPEN
+    assert not breaker.start_probe()
+
+    clock.now = 10
+    assert breaker.start_probe()
+    assert not breaker.start_probe()
+    breaker.probe_failed()
+    assert breaker.retry_after == 10
+
+    clock.now = 20
+    assert breaker.start_probe()
+    breaker.probe_succeeded()
+    assert breaker.allow()
+    assert breaker.stats()["timesOpened"] == 2
+
+
+def test_old_outcomes_leave_the_window():
+    """Test failures older than the window do not count towards the rate."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(min_requests=2, window=30, clock=clock)
+
+    breaker.record(True)
+    clock.now = 31
+    breaker.record(True)
+    assert breaker.allow()
+    breaker.record(True)
+    assert not breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_client_fails_fast_serves_stale_reads_and_recovers():
+    """Test an open circuit skips the API, falls back to stale cache entries and recovers."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(min_requests=2, reset_timeout=15, clock=clock)
+    client = RailwayClient(
+        token="test_token",
+        api_url="https://api.test.com/graphql",
+        cache=ResponseCache(clock=clock),
+        circuit_breaker=breaker,
+    )
+    projects_query = "query ListProjects { me { id } }"
+    healthy = True
+
+    def handler(request):
+        if not healthy:
+            return Response(503)
+        if json.loads(request.content).get("operationName") == "Me":
+            return Response(200, json={"data": {"me": {"id": "user_1"}}})
+        return Response(200, json={"data": {"me": {"id": "projects"}}})
+
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(side_effect=handler)
+        async with client:
+            assert await client.execute(projects_query) == {"me": {"id": "projects"}}
+
+            healthy = False
+            clock.now = 60  # the cached response has expired
+            for _ in range(2):
+                with pytest.raises(GraphQLError):
+                    await client.execute("query Other { me { id } }")
+            assert breaker.state is CircuitState.OPEN
+            calls = route.call_count
+
+            with pytest.raises(CircuitOpenError) as excinfo:
+                await client.execute("query Other { me { id } }")
+            assert excinfo.value.retry_after == 15
+            assert await client.execute(projects_query) == {"me": {"id": "projects"}}
+            assert route.call_count == calls
+            assert client.stats()["staleResponses"] == 1
+
+            healthy = True
+            clock.now = 75
+            assert await client.execute("query Other { me { id } }") == {"me": {"id": "projects"}}
+            assert breaker.state is CircuitState.CLOSED
+            assert route.call_count == calls + 2
+
+
+@pytest.mark.asyncio
+async def test_local_failures_are_not_recorded():
+    """Test shed requests and undecodable bodies leave the failure rate alone."""
+    breaker = CircuitBreaker(min_requests=10)
+    scheduler = Scheduler(max_concurrency=1, queue_depths={Lane.INTERACTIVE: 0})
+    client = RailwayClient(
+        token="test_token",
+        api_url="https://api.test.com/graphql",
+        circuit_breaker=breaker,
+        scheduler=scheduler,
+    )
+    responses = [Response(503), Response(200, content=b"not json")]
+
+    with respx.mock:
+        respx.post("https://api.test.com/graphql").mock(side_effect=responses)
+        async with client:
+            with pytest.raises(GraphQLError):
+                await client.execute("query A { me { id } }", fresh=True)
+            with pytest.raises(ValueError):
+                await client.execute("query B { me { id } }", fresh=True)
+            async with scheduler.slot(Lane.INTERACTIVE):
+                with pytest.raises(OverloadedError):
+                    await client.execute("query C { me { id } }", fresh=True)
+
+    assert breaker.stats()["failureRate"] == 1.0
@@ -0,0 +1,183 @@
+"""Tests for the response cache."""
+
+import asyncio
+
+import pytest
+import respx
+from fastmcp import Client, FastMCP
+from httpx import Response
+
+from railway_mcp.cache import DEFAULT_INVALIDATIONS, ResponseCache
+from railway_mcp.client import RailwayClient
+from railway_mcp.graphql import mutations
+from railway_mcp.graphql.mutations import CREATE_ENVIRONMENT_MUTATION, SET_VARIABLES_MUTATION
+from railway_mcp.graphql.queries import LIST_ENVIRONMENTS_QUERY
+from railway_mcp.graphql.registry import operation_name
+from railway_mcp.middleware import CacheAgeMiddleware
+from railway_mcp.tools.projects import list_projects
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def client():
+    """Create a test client with a response cache."""
+    return RailwayClient(
+        token="test_token", api_url="https://api.test.com/graphql", cache=ResponseCache()
+    )
+
+
+def test_cache_expires_after_ttl():
+    """Test entries are served until their TTL elapses."""
+    clock = FakeClock()
+    cache = ResponseCache(ttls={"ListServices": 10.0}, clock=clock)
+    cache.set("ListServices", {"projectId": "p1"}, {"project": {}})
+
+    clock.now = 9.0
+    assert cache.get("ListServices", {"projectId": "p1"}) == {"project": {}}
+    clock.now = 10.0
+    assert cache.get("ListServices", {"projectId": "p1"}) is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_cache_evicts_least_recently_used():
+    """Test the least recently used entry is evicted when full."""
+    cache = ResponseCache(max_entries=2)
+    cache.set("GetService", {"serviceId": "a"}, "a")
+    cache.set("GetService", {"serviceId": "b"}, "b")
+    cache.get("GetService", {"serviceId": "a"})
+    cache.set("GetService", {"serviceId": "c"}, "c")
+
+    assert cache.get("GetService", {"serviceId": "b"}) is None
+    assert cache.get("GetService", {"serviceId": "a"}) == "a"
+    assert cache.stats.evictions == 1
+
+
+def test_set_variables_invalidates_only_its_scope():
+    """Test SetVariables evicts ListVariables for the same scope only."""
+    cache = ResponseCache()
+    scope = {"projectId": "p1", "environmentId": "e1"}
+    other = {"projectId": "p1", "environmentId": "e2"}
+    service = {**scope, "serviceId": "s1"}
+    for variables in (scope, other, service):
+        cache.set("ListVariables", variables, {"variables": {}})
+
+    assert cache.invalidate("SetVariables", {**scope, "variables": {"A": "1"}}) == 1
+    assert cache.get("ListVariables", scope) is None
+    assert cache.get("ListVariables", other) is not None
+    assert cache.get("ListVariables", service) is not None
+
+
+def test_stale_write_after_invalidation_is_dropped():
+    """Test a response fetched before an invalidation is not cached."""
+    cache = ResponseCache()
+    generation = cache.generation
+    cache.invalidate("CreateEnvironment", {"projectId": "p1", "name": "staging"})
+    cache.set("ListEnvironments", {"projectId": "p1"}, "old", generation=generation)
+
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_client_serves_cached_reads_and_invalidates_on_mutation(client):
+    """Test cached reads, fresh bypass and mutation-driven invalidation."""
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(
+            side_effect=lambda request: Response(
+                200,
+                json={
+                    "data": {"environmentCreate": {"id": "env_new"}}
+                    if b"mutation" in request.content
+                    else {"project": {"environments": {"edges": []}}}
+                },
+            )
+        )
+
+        async with client:
+            variables = {"projectId": "p1"}
+            await client.execute(LIST_ENVIRONMENTS_QUERY, variables)
+            await client.execute(LIST_ENVIRONMENTS_QUERY, variables)
+            assert route.call_count == 1
+
+            await client.execute(LIST_ENVIRONMENTS_QUERY, variables, fresh=True)
+            assert route.call_count == 2
+
+            await client.execute(CREATE_ENVIRONMENT_MUTATION, {"projectId": "p1", "name": "dev"})
+            await client.execute(LIST_ENVIRONMENTS_QUERY, variables)
+            assert route.call_count == 4
+
+        assert client.cache.stats.hits == 1
+        assert client.cache.stats.invalidations == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate_serves_cached_reads_with_their_age():
+    """Test reads within the staleness bound return at once and refresh in the background."""
+    clock = FakeClock()
+    client = RailwayClient(
+        token="test_token",
+        api_url="https://api.test.com/graphql",
+        cache=ResponseCache(clock=clock),
+        max_stale=60,
+    )
+    server = FastMCP("test")
+    server.add_middleware(CacheAgeMiddleware())
+
+    @server.tool()
+    async def projects() -> list[dict]:
+        return await list_projects(client)
+
+    names = iter(["first", "second", "third"])
+
+    def handler(request):
+        node = {"id": "proj_1", "name": next(names)}
+        return Response(
+            200, json={"data": {"me": {"projects": {"edges": [{"node": node}], "pageInfo": {}}}}}
+        )
+
+    async def call() -> tuple[str, dict | None]:
+        result = await mcp_client.call_tool("projects")
+        return result.structured_content["result"][0]["name"], result.meta
+
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(side_effect=handler)
+        async with client, Client(server) as mcp_client:
+            assert (await call())[0] == "first"
+
+            clock.now = 40  # 10s past the 30s TTL
+            name, meta = await call()
+            assert name == "first"
+            assert meta["cacheAge"] == 40
+            assert meta["stale"] is True
+            while client._inflight:
+                await asyncio.sleep(0)
+            assert route.call_count == 2
+
+            name, meta = await call()
+            assert (name, meta["cacheAge"], meta["stale"]) == ("second", 0, False)
+
+            clock.now = 200  # beyond the staleness bound
+            assert (await call())[0] == "third"
+            assert route.call_count == 3
+
+    assert client.cache.stats.revalidating_hits == 1
+
+
+def test_default_rules_cover_every_mutation():
+    """Test every mutation constant has an invalidation rule."""
+    names = {
+        operation_name(value)
+        for name, value in vars(mutations).items()
+        if name.endswith("_MUTATION")
+    }
+    assert names <= DEFAULT_INVALIDATIONS.keys()
+    assert operation_name(SET_VARIABLES_MUTATION) == "SetVariables"
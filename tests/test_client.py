@@ -1,11 +1,19 @@
 """Tests for the Railway GraphQL client."""
 
+import asyncio
+import hashlib
+import json
+import subprocess
+import sys
+
 import pytest
 import respx
 from httpx import Response
 
 from railway_mcp.client import RailwayClient
+from railway_mcp.config import Settings
 from railway_mcp.exceptions import AuthenticationError, GraphQLError
+from railway_mcp.graphql.queries import LIST_PROJECTS_QUERY
 
 
 @pytest.fixture
@@ -97,3 +105,176 @@ async def test_execute_success(client):
 
         assert data["project"]["id"] == "proj_123"
         assert data["project"]["name"] == "My Project"
+
+
+@pytest.mark.asyncio
+async def test_execute_coalesces_identical_reads(client):
+    """Test concurrent identical queries share one upstream request."""
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(
+            return_value=Response(200, json={"data": {"project": {"id": "proj_123"}}})
+        )
+
+        async with client:
+            results = await asyncio.gather(
+                *(
+                    client.execute("query P($id: String!) { project(id: $id) { id } }", {"id": "1"})
+                    for _ in range(5)
+                )
+            )
+
+        assert route.call_count == 1
+        assert client.coalesced_requests == 4
+        assert all(r["project"]["id"] == "proj_123" for r in results)
+
+
+@pytest.mark.asyncio
+async def test_execute_never_coalesces_mutations(client):
+    """Test identical concurrent mutations are each sent upstream."""
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(
+            return_value=Response(200, json={"data": {"serviceInstanceDeploy": True}})
+        )
+
+        async with client:
+            await asyncio.gather(
+                *(client.execute("mutation Deploy { serviceInstanceDeploy }") for _ in range(3))
+            )
+
+        assert route.call_count == 3
+        assert client.coalesced_requests == 0
+
+
+@pytest.mark.asyncio
+async def test_from_settings_configures_pool_and_timeouts():
+    """Test pool sizing and per-phase timeouts come from settings."""
+    settings = Settings(
+        railway_token="test_token",
+        http_max_connections=8,
+        http_max_keepalive_connections=4,
+        http_connect_timeout=2.0,
+        http_read_timeout=15.0,
+    )
+    client = RailwayClient.from_settings(settings)
+
+    assert client.limits.max_connections == 8
+    assert client.limits.max_keepalive_connections == 4
+    assert client.timeout.connect == 2.0
+    assert client.timeout.read == 15.0
+
+    async with client:
+        assert client.client.timeout.read == 15.0
+
+
+class PersistedQueryServer:
+    """Stand-in GraphQL server implementing automatic persisted queries."""
+
+    def __init__(self):
+        self.store: dict[str, str] = {}
+        self.request_sizes: list[int] = []
+
+    def __call__(self, request):
+        self.request_sizes.append(len(request.content))
+        body = json.loads(request.content)
+        sha = body["extensions"]["persistedQuery"]["sha256Hash"]
+        if "query" in body:
+            assert hashlib.sha256(body["query"].encode()).hexdigest() == sha
+            self.store[sha] = body["query"]
+        elif sha not in self.store:
+            return Response(
+                200,
+                json={
+                    "errors": [
+                        {
+                            "message": "PersistedQueryNotFound",
+                            "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"},
+                        }
+                    ]
+                },
+            )
+        return Response(200, json={"data": {"me": {"projects": {"edges": []}}}})
+
+
+@pytest.mark.asyncio
+async def test_persisted_queries_send_hash_after_registration():
+    """Test APQ falls back to the full document once, then sends only the hash."""
+    server = PersistedQueryServer()
+    client = RailwayClient(
+        token="test_token", api_url="https://api.test.com/graphql", persisted_queries=True
+    )
+    with respx.mock:
+        respx.post("https://api.test.com/graphql").mock(side_effect=server)
+
+        async with client:
+            await client.execute(LIST_PROJECTS_QUERY)
+            await client.execute(LIST_PROJECTS_QUERY)
+
+    # hash miss, full registration, then a hash-only hit
+    assert len(server.request_sizes) == 3
+    assert server.request_sizes[2] < server.request_sizes[1] / 2
+    assert client.persisted_query_misses == 1
+    assert client.persisted_query_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_background_verification_gates_first_request(client):
+    """Test requests wait for background verification while the pool warms up."""
+    order = []
+
+    async def handler(request):
+        name = json.loads(request.content).get("operationName")
+        if name == "Me":
+            await asyncio.sleep(0.02)
+            order.append(name)
+            return Response(200, json={"data": {"me": {"id": "user_1"}}})
+        order.append(name)
+        return Response(200, json={"data": {"ok": True}})
+
+    with respx.mock:
+        respx.post("https://api.test.com/graphql").mock(side_effect=handler)
+        warmup = respx.head("https://api.test.com/graphql").mock(return_value=Response(405))
+        async with client:
+            client.start_background_verification(warmup_connections=3)
+            assert await client.execute("query Other { ok }") == {"ok": True}
+
+    assert order == ["Me", "Other"]
+    assert warmup.call_count == 2
+    assert set(client.stats()["startup"]) == {"verifiedMs", "warmupMs"}
+
+
+@pytest.mark.asyncio
+async def test_background_verification_failure_is_sticky(client):
+    """Test a rejected token fails every later request without contacting the API."""
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(return_value=Response(401))
+        async with client:
+            client.start_background_verification()
+            for _ in range(2):
+                with pytest.raises(AuthenticationError):
+                    await client.execute("query Other { ok }")
+
+    assert route.call_count == 1
+
+
+def test_client_import_does_not_load_the_server():
+    """Test importing the package and client leaves FastMCP and settings unloaded."""
+    code = (
+        "import sys, railway_mcp.client; "
+        "print(sorted({'fastmcp', 'pydantic_settings'} & set(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_server_import_defers_the_client_and_tools():
+    """Test importing the server leaves the client and tool modules to startup and first use."""
+    code = (
+        "import sys, railway_mcp.server; "
+        "print(sorted({'railway_mcp.client', 'railway_mcp.tools.deployments'} & set(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,14 @@
+"""Tests for the JSON codec."""
+
+import json
+
+from railway_mcp import codec
+
+
+def test_round_trip_and_sorted_keys():
+    """Test the active backend round-trips and sorts keys on request."""
+    value = {"b": [1, 2.5, None], "a": {"name": "api ✓"}}
+
+    assert codec.loads(codec.dumps(value)) == value
+    assert codec.dumps({"b": 1, "a": 2}, sort_keys=True) == b'{"a":2,"b":1}'
+    assert json.loads(codec.dumps(value)) == value
@@ -0,0 +1,132 @@
+"""Tests for deadline propagation and cancellation."""
+
+import asyncio
+import json
+
+import pytest
+import respx
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
+from httpx import Response
+
+from railway_mcp.client import RailwayClient
+from railway_mcp.deadline import deadline, remaining
+from railway_mcp.exceptions import DeadlineExceededError
+from railway_mcp.middleware import DeadlineMiddleware
+
+
+@pytest.fixture
+def client():
+    """Create a test client."""
+    return RailwayClient(token="test_token", api_url="https://api.test.com/graphql")
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_the_request_timeout(client):
+    """Test the remaining budget becomes the HTTP timeout and expired budgets fail fast."""
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(
+            return_value=Response(200, json={"data": {"ok": True}})
+        )
+        async with client:
+            # Reads may be shared between callers, so only requests sent on
+            # the caller's behalf alone take its deadline as their timeout
+            with deadline(5), deadline(60):
+                assert remaining() <= 5
+                await client.execute("mutation A { ok }")
+            timeout = route.calls.last.request.extensions["timeout"]
+            assert 0 < timeout["read"] <= 5
+            assert timeout["connect"] <= 5
+
+            with deadline(-1), pytest.raises(DeadlineExceededError):
+                await client.execute("query B { ok }")
+            assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_callers_abort_the_shared_request(client):
+    """Test the upstream request is aborted only once every waiting caller is cancelled."""
+    started = asyncio.Event()
+    aborted = asyncio.Event()
+
+    async def slow(request):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            aborted.set()
+            raise
+        return Response(200, json={"data": {"ok": True}})
+
+    with respx.mock:
+        respx.post("https://api.test.com/graphql").mock(side_effect=slow)
+        async with client:
+            callers = [asyncio.ensure_future(client.execute("query A { ok }")) for _ in range(2)]
+            await started.wait()
+
+            callers[0].cancel()
+            await asyncio.sleep(0.01)
+            assert not aborted.is_set()
+
+            callers[1].cancel()
+            await asyncio.wait_for(aborted.wait(), 1)
+            await asyncio.gather(*callers, return_exceptions=True)
+            assert not client._inflight
+
+
+@pytest.mark.asyncio
+async def test_shared_requests_apply_each_callers_deadline(client):
+    """Test callers sharing a request or batch each time out on their own deadline."""
+
+    async def slow(request):
+        await asyncio.sleep(0.2)
+        if json.loads(request.content)["operationName"] == "Batch":
+            return Response(200, json={"data": {"s0": {"id": "svc_1"}}})
+        return Response(200, json={"data": {"ok": True}})
+
+    async def call(seconds, coroutine_function, *args):
+        with deadline(seconds):
+            return await coroutine_function(*args)
+
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(side_effect=slow)
+        async with client:
+            for function, args, expected in [
+                (client.execute, ("query A { ok }",), {"ok": True}),
+                (client.loader.load, ("service", "svc_1"), {"id": "svc_1"}),
+            ]:
+                short, long = await asyncio.gather(
+                    call(0.05, function, *args),
+                    call(5, function, *args),
+                    return_exceptions=True,
+                )
+                assert isinstance(short, DeadlineExceededError)
+                assert long == expected
+            assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_middleware_enforces_tool_deadlines():
+    """Test tools are cancelled at their deadline and see it propagated."""
+    server = FastMCP("test")
+    middleware = DeadlineMiddleware(default_timeout=5, tool_timeouts={"slow": 0.05})
+    server.add_middleware(middleware)
+
+    @server.tool()
+    async def slow() -> str:
+        await asyncio.sleep(10)
+        return "done"
+
+    @server.tool()
+    async def budget() -> float:
+        return remaining()
+
+    async with Client(server) as mcp_client:
+        with pytest.raises(ToolError, match=r"did not finish within 0\.05s"):
+            await mcp_client.call_tool("slow")
+        result = await mcp_client.call_tool("budget")
+        assert 4 < result.data <= 5
+
+    assert middleware.timeout_for("slow", {"timeout": 2}) == 2
+    assert middleware.timeout_for("slow", {"timeout": 0}) is None
+    assert middleware.timeout_for("get_logs") == 120
@@ -0,0 +1,155 @@
+"""Tests for the batching loader."""
+
+import asyncio
+import json
+import time
+
+import pytest
+import respx
+from httpx import Response
+
+from railway_mcp.client import RailwayClient
+from railway_mcp.exceptions import GraphQLError, ServiceNotFoundError
+from railway_mcp.loader import build_batch_document
+from railway_mcp.tools.services import link_service, link_services
+
+
+@pytest.fixture
+def client():
+    """Create a test client."""
+    client = RailwayClient(token="test_token", api_url="https://api.test.com/graphql")
+    # Treat the empty name index as complete, so IDs pass straight through
+    client.topology.refreshed_at = time.monotonic()
+    return client
+
+
+def service_node(service_id: str) -> dict:
+    """Build a service node as returned by the API."""
+    return {"id": service_id, "name": f"svc-{service_id}", "projectId": "proj_1"}
+
+
+def test_build_batch_document_uses_aliases():
+    """Test lookups compile to aliased root fields with variables."""
+    document, variables, aliases = build_batch_document(
+        [("service", "a"), ("service", "b"), ("deployment", "c")]
+    )
+
+    assert aliases == ["s0", "s1", "d0"]
+    assert variables == {"s0": "a", "s1": "b", "d0": "c"}
+    assert "s1: service(id: $s1) { id name icon createdAt updatedAt projectId }" in document
+    assert "d0: deployment(id: $d0)" in document
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_request(client):
+    """Test lookups in the same tick are resolved with one request."""
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(
+            return_value=Response(
+                200,
+                json={"data": {"s0": service_node("a"), "s1": service_node("b"), "s2": None}},
+            )
+        )
+
+        async with client:
+            first, second = await asyncio.gather(
+                link_service(client, "a"), link_service(client, "b")
+            )
+            with pytest.raises(ServiceNotFoundError):
+                await link_services(client, ["a", "b", "missing"])
+
+        assert first["name"] == "svc-a"
+        assert second["name"] == "svc-b"
+        assert route.call_count == 2
+        assert client.loader.batches_sent == 2
+
+
+@pytest.mark.asyncio
+async def test_per_alias_errors_reach_only_their_caller(client):
+    """Test a GraphQL error on one alias fails only that lookup."""
+    with respx.mock:
+        respx.post("https://api.test.com/graphql").mock(
+            return_value=Response(
+                200,
+                json={
+                    "data": {"s0": service_node("a"), "s1": None},
+                    "errors": [{"message": "Not authorized", "path": ["s1"]}],
+                },
+            )
+        )
+
+        async with client:
+            results = await asyncio.gather(
+                client.loader.load("service", "a"),
+                client.loader.load("service", "b"),
+                return_exceptions=True,
+            )
+
+        assert results[0]["id"] == "a"
+        assert isinstance(results[1], GraphQLError)
+        assert "Not authorized" in str(results[1])
+
+
+@pytest.mark.asyncio
+async def test_duplicate_ids_are_sent_once(client):
+    """Test the same ID requested twice appears once in the batch."""
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(
+            return_value=Response(200, json={"data": {"s0": service_node("a")}})
+        )
+
+        async with client:
+            services = await link_services(client, ["a", "a"])
+
+        body = json.loads(route.calls.last.request.content)
+        assert body["variables"] == {"s0": "a"}
+        assert [s["id"] for s in services] == ["a", "a"]
+
+
+@pytest.mark.asyncio
+async def test_batch_is_aborted_when_every_caller_leaves(client):
+    """Test a batch keeps running for remaining callers and stops after the last one."""
+    started = asyncio.Event()
+    aborted = asyncio.Event()
+
+    async def slow(request):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            aborted.set()
+            raise
+        return Response(200, json={"data": {"s0": service_node("a")}})
+
+    with respx.mock:
+        respx.post("https://api.test.com/graphql").mock(side_effect=slow)
+        async with client:
+            callers = [asyncio.ensure_future(client.loader.load("service", "a")) for _ in range(2)]
+            await started.wait()
+
+            callers[0].cancel()
+            await asyncio.sleep(0.01)
+            assert not aborted.is_set()
+
+            callers[1].cancel()
+            await asyncio.wait_for(aborted.wait(), 1)
+            await asyncio.gather(*callers, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_batches_skip_persisted_queries():
+    """Test batch documents are sent in full even with persisted queries enabled."""
+    client = RailwayClient(
+        token="test_token", api_url="https://api.test.com/graphql", persisted_queries=True
+    )
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(
+            return_value=Response(200, json={"data": {"s0": service_node("a")}})
+        )
+        async with client:
+            assert (await client.loader.load("service", "a"))["name"] == "svc-a"
+
+    body = json.loads(route.calls.last.request.content)
+    assert route.call_count == 1
+    assert "extensions" not in body
+    assert body["query"].startswith("query Batch(")
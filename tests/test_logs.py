@@ -0,0 +1,456 @@
+"""Tests for log tailing, incremental fetching, filtering, compaction and export."""
+
+import asyncio
+import gzip
+import json
+
+import pytest
+import respx
+from httpx import Response
+from websockets.asyncio.server import serve
+
+from railway_mcp.client import RailwayClient
+from railway_mcp.logs import LogArchive, LogBuffer, LogFilter, LogSubscription, LogWatermarks
+from railway_mcp.logs.compact import compact_log, template
+from railway_mcp.logs.export import export_path
+from railway_mcp.logs.filters import parse_time
+from railway_mcp.tools import deployments
+from railway_mcp.tools.deployments import (
+    export_logs,
+    get_logs,
+    search_exported_logs,
+    search_logs,
+    tail_logs,
+)
+
+
+def line(n: int) -> dict:
+    """Build a log line."""
+    return {"message": f"line {n}", "timestamp": f"2024-01-01T00:00:{n:02d}Z", "severity": "info"}
+
+
+class StandInServer:
+    """Local graphql-transport-ws server streaming log batches pushed by the test."""
+
+    def __init__(self):
+        self.connections = 0
+        self.subscriptions = []
+        self.batches: asyncio.Queue = asyncio.Queue()
+
+    async def handler(self, websocket):
+        self.connections += 1
+        init = json.loads(await websocket.recv())
+        assert init["type"] == "connection_init"
+        assert init["payload"]["Authorization"] == "Bearer test_token"
+        await websocket.send(json.dumps({"type": "connection_ack"}))
+        subscribe = json.loads(await websocket.recv())
+        self.subscriptions.append(subscribe["payload"])
+        while (batch := await self.batches.get()) is not None:
+            payload = {"data": {"deploymentLogs": batch}}
+            await websocket.send(
+                json.dumps({"id": subscribe["id"], "type": "next", "payload": payload})
+            )
+        await websocket.send(json.dumps({"id": subscribe["id"], "type": "complete"}))
+
+
+def test_ring_buffer_reports_overwritten_lines():
+    """Test reads continue from a cursor and count lines lost to overflow."""
+    buffer = LogBuffer(capacity=3)
+    buffer.extend([line(1), line(2)])
+    batch = buffer.read(None, 10)
+    assert (len(batch.lines), batch.cursor) == (2, 2)
+
+    buffer.extend([line(3), line(4), line(5), line(6)])
+    batch = buffer.read(2, 2)
+    assert [entry["message"] for entry in batch.lines] == ["line 4", "line 5"]
+    assert (batch.cursor, batch.skipped) == (5, 1)
+    assert buffer.read(None, 1).lines == [line(6)]
+
+
+@pytest.mark.asyncio
+async def test_tail_shares_one_subscription_and_returns_new_lines():
+    """Test concurrent callers share a subscription and cursors skip seen lines."""
+    server = StandInServer()
+    async with serve(server.handler, "127.0.0.1", 0, subprotocols=["graphql-transport-ws"]) as ws:
+        port = ws.sockets[0].getsockname()[1]
+        client = RailwayClient(token="test_token", api_url=f"http://127.0.0.1:{port}/graphql")
+        async with client:
+            first = asyncio.create_task(tail_logs(client, "dep_1", wait=5))
+            second = asyncio.create_task(tail_logs(client, "dep_1", wait=5))
+            await asyncio.sleep(0.1)
+            server.batches.put_nowait([line(1), line(2)])
+            results = await asyncio.gather(first, second)
+            assert results[0] == results[1]
+            assert [entry["message"] for entry in results[0]["logs"]] == ["line 1", "line 2"]
+
+            cursor = results[0]["cursor"]
+            server.batches.put_nowait([line(3)])
+            result = await tail_logs(client, "dep_1", cursor=cursor, wait=5)
+            assert result["logs"] == [line(3)]
+            assert result["live"]
+
+            server.batches.put_nowait(None)
+            result = await tail_logs(client, "dep_1", cursor=result["cursor"], wait=0.1)
+            assert result["logs"] == []
+            assert client.stats()["logStreams"]["subscriptions"] == 1
+
+            with pytest.raises(ValueError, match="Invalid cursor"):
+                await tail_logs(client, "dep_1", cursor="abc")
+            with pytest.raises(ValueError, match="Invalid cursor"):
+                await tail_logs(client, "dep_1", cursor="3")
+
+    assert server.connections == 1
+    assert server.subscriptions[0]["operationName"] == "StreamDeploymentLogs"
+    assert server.subscriptions[0]["variables"] == {"deploymentId": "dep_1", "limit": 1000}
+
+
+@pytest.mark.asyncio
+async def test_idle_subscriptions_close_and_their_cursors_reset():
+    """Test an unread subscription closes on its own and its cursors don't carry over."""
+    server = StandInServer()
+    async with serve(server.handler, "127.0.0.1", 0, subprotocols=["graphql-transport-ws"]) as ws:
+        port = ws.sockets[0].getsockname()[1]
+        client = RailwayClient(
+            token="test_token",
+            api_url=f"http://127.0.0.1:{port}/graphql",
+            log_stream_idle_timeout=0.2,
+        )
+        async with client:
+            server.batches.put_nowait([line(1)])
+            result = await tail_logs(client, "dep_1", wait=5)
+            assert result["live"]
+            subscription = client.log_streams.subscribe("dep_1")
+
+            await asyncio.sleep(0.5)
+            assert not subscription.live
+            assert client.stats()["logStreams"]["subscriptions"] == 0
+            server.batches.put_nowait(None)
+            await asyncio.sleep(0.05)
+
+            # The old cursor is reset to the new subscription's oldest line
+            server.batches.put_nowait([line(1), line(2)])
+            resumed = await tail_logs(client, "dep_1", cursor=result["cursor"], wait=5)
+            assert resumed["reset"]
+            assert resumed["logs"] == [line(1), line(2)]
+            assert resumed["cursor"].split(":")[0] != result["cursor"].split(":")[0]
+            again = await tail_logs(client, "dep_1", cursor=resumed["cursor"], wait=0)
+            assert (again["logs"], again["reset"]) == ([], False)
+        # Let the stand-in's handler finish
+        server.batches.put_nowait(None)
+
+
+@pytest.mark.asyncio
+async def test_get_logs_cursor_returns_only_new_lines():
+    """Test a cursor fetches from its watermark and drops lines already returned."""
+    client = RailwayClient(token="test_token", api_url="https://api.test.com/graphql")
+    same_second = {**line(2), "message": "line 2b"}
+    responses = [[line(1), line(2)], [line(2), same_second, line(3)], [line(3)]]
+    sent = []
+
+    def handler(request):
+        sent.append(json.loads(request.content)["variables"])
+        return Response(200, json={"data": {"deploymentLogs": responses[len(sent) - 1]}})
+
+    with respx.mock:
+        respx.post("https://api.test.com/graphql").mock(side_effect=handler)
+        async with client:
+            first = await get_logs(client, "dep_1")
+            assert first["logs"] == [line(1), line(2)]
+            second = await get_logs(client, "dep_1", cursor=first["cursor"])
+            assert second["logs"] == [same_second, line(3)]
+            third = await get_logs(client, "dep_1", cursor=second["cursor"])
+            assert third == {"logs": [], "cursor": second["cursor"]}
+            with pytest.raises(ValueError, match="Invalid cursor"):
+                await get_logs(client, "dep_1", cursor="!")
+
+    assert "startDate" not in sent[0]
+    assert sent[1]["startDate"] == line(2)["timestamp"]
+    assert sent[2]["startDate"] == line(3)["timestamp"]
+    assert client.stats()["logDuplicatesDropped"] == 2
+
+
+def test_reconnect_replay_compares_timestamps_by_instant():
+    """Test replayed lines are deduplicated whatever the fractional precision."""
+    subscription = LogSubscription("ws://test", "test_token", "dep_1", "deployment")
+    subscription._append([line(4), line(5)])
+
+    # The server replays from the start, with more precise timestamps
+    subscription._replaying = True
+    later = {**line(5), "timestamp": "2024-01-01T00:00:05.25Z", "message": "later"}
+    subscription._append(
+        [
+            {**line(4), "timestamp": "2024-01-01T00:00:04.000Z"},
+            {**line(5), "timestamp": "2024-01-01T00:00:05.000Z"},
+            later,
+        ]
+    )
+    assert subscription.buffer.read(None, 10).lines == [line(4), line(5), later]
+
+
+def test_watermarks_stream_lines_in_one_pass():
+    """Test filtering and cursor tracking read lines lazily, as they are consumed."""
+    watermarks = LogWatermarks()
+    consumed = []
+
+    def source(lines):
+        for entry in lines:
+            consumed.append(entry)
+            yield entry
+
+    advance = watermarks.advance("dep_1", None)
+    lines = advance.track(watermarks.filter("dep_1", None, source([line(2), line(1)])))
+    assert consumed == []
+    assert list(lines) == [line(2), line(1)]
+    cursor = advance.cursor()
+
+    consumed.clear()
+    advance = watermarks.advance("dep_1", cursor)
+    lines = advance.track(watermarks.filter("dep_1", cursor, source([line(1), line(2)])))
+    assert next(lines, None) is None
+    assert len(consumed) == 2
+    assert watermarks.duplicates_dropped == 2
+    assert advance.cursor() == cursor
+
+
+def test_filter_keeps_context_in_one_pass():
+    """Test matches come with surrounding lines and stop at the match limit."""
+    lines = [line(n) for n in range(1, 11)]
+    lines[3]["severity"] = lines[7]["severity"] = "error"
+
+    consumed = []
+
+    def source():
+        for entry in lines:
+            consumed.append(entry)
+            yield entry
+
+    log_filter = LogFilter(min_severity="warn", context=1)
+    results = list(log_filter.apply(source(), max_matches=1))
+    assert [(entry["message"], entry["match"]) for entry in results] == [
+        ("line 3", False),
+        ("line 4", True),
+        ("line 5", False),
+    ]
+    # Nothing after the trailing context of the last match was read
+    assert len(consumed) == 5
+
+    window = LogFilter(
+        start=parse_time("2024-01-01T00:00:02"),
+        end=parse_time("2024-01-01T00:00:05+00:00"),
+        pattern=r"line [2-9]$",
+        regex=True,
+    )
+    assert [entry["message"] for entry in window.apply(lines)] == ["line 2", "line 3", "line 4"]
+    with pytest.raises(ValueError, match="Invalid regular expression"):
+        LogFilter(pattern="(", regex=True)
+    with pytest.raises(ValueError, match="Invalid severity"):
+        LogFilter(min_severity="loud")
+
+
+@pytest.mark.asyncio
+async def test_search_logs_narrows_the_request_and_counts_matches():
+    """Test time windows are sent upstream and matches are counted."""
+    client = RailwayClient(token="test_token", api_url="https://api.test.com/graphql")
+    lines = [line(n) for n in range(1, 6)]
+    lines[2]["message"] = "Connection REFUSED by db"
+
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(
+            return_value=Response(200, json={"data": {"buildLogs": lines}})
+        )
+        async with client:
+            result = await search_logs(
+                client,
+                "dep_1",
+                "refused",
+                log_type="build",
+                start="2024-01-01T00:00:00Z",
+                context=1,
+            )
+
+    variables = json.loads(route.calls[0].request.content)["variables"]
+    assert variables["startDate"] == "2024-01-01T00:00:00.000000Z"
+    assert "endDate" not in variables
+    assert [entry["message"] for entry in result["logs"]] == [
+        "line 2",
+        "Connection REFUSED by db",
+        "line 4",
+    ]
+    assert (result["matches"], result["scanned"]) == (1, 5)
+
+
+def test_compaction_groups_noise_and_keeps_errors():
+    """Test repeated and templated lines collapse while errors stay verbatim."""
+    downloads = [
+        {**line(n), "message": f"Downloading pkg-{n}.{n}.0 ({n * 1.5:.1f} MB) sha256:ab12cd{n}ef"}
+        for n in range(1, 6)
+    ]
+    error = {**line(6), "message": "ERROR: No matching distribution", "severity": "error"}
+    done = {**line(8), "message": "Build done"}
+    result = compact_log([*downloads, error, error, done])
+
+    assert result["totalLines"] == 8
+    grouped, kept, last = result["logs"]
+    assert grouped["template"] == template(downloads[0]["message"])
+    assert grouped["template"] == "Downloading pkg-<num> (<num> MB) sha<num>:<hex>"
+    assert (grouped["count"], grouped["firstTimestamp"], grouped["lastTimestamp"]) == (
+        5,
+        line(1)["timestamp"],
+        line(5)["timestamp"],
+    )
+    assert kept == {
+        **error,
+        "count": 2,
+        "firstTimestamp": line(6)["timestamp"],
+        "lastTimestamp": line(6)["timestamp"],
+    }
+    assert last == done
+
+    bounded = compact_log(
+        [{**line(n), "message": f"step {'x' * n}"} for n in range(1, 11)], max_templates=3
+    )
+    assert len(bounded["logs"]) == 4
+    other = bounded["logs"][-1]
+    assert (other["template"], other["count"]) == ("<other>", 7)
+    assert (other["firstTimestamp"], other["lastTimestamp"]) == (
+        line(4)["timestamp"],
+        line(10)["timestamp"],
+    )
+    single = compact_log(
+        [{**line(n), "message": f"step {'x' * n}"} for n in range(1, 5)], max_templates=3
+    )
+    assert single["logs"][-1] == {
+        "template": "<other>",
+        "message": "step xxxx",
+        "timestamp": line(4)["timestamp"],
+        "count": 1,
+        "firstTimestamp": line(4)["timestamp"],
+        "lastTimestamp": line(4)["timestamp"],
+    }
+
+
+def test_archive_reads_only_blocks_that_can_match(tmp_path):
+    """Test searches skip blocks by severity and time and the file stays plain gzip."""
+    lines = [line(n) for n in range(1, 11)]
+    lines[6]["severity"] = "error"
+    path = export_path(tmp_path, "dep_1", "deployment")
+    archive = LogArchive.write(path, lines, block_lines=2, deploymentId="dep_1")
+
+    assert archive.index["deploymentId"] == "dep_1"
+    assert (archive.index["lines"], len(archive.index["blocks"])) == (10, 5)
+    assert [json.loads(raw) for raw in gzip.decompress(path.read_bytes()).splitlines()] == lines
+
+    errors = list(archive.search(LogFilter(min_severity="error", context=1)))
+    assert [entry["message"] for entry in errors] == ["line 7", "line 8"]
+    assert archive.blocks_read == 1
+
+    archive = LogArchive(path)
+    window = LogFilter(
+        start=parse_time("2024-01-01T00:00:03"), end=parse_time("2024-01-01T00:00:05")
+    )
+    assert [entry["message"] for entry in archive.search(window)] == ["line 3", "line 4"]
+    assert archive.blocks_read == 1
+
+    # An index paired with a different data file is rejected
+    LogArchive.write(path, lines[:3])
+    index = LogArchive.index_path(path).read_bytes()
+    LogArchive.write(path, lines)
+    LogArchive.index_path(path).write_bytes(index)
+    with pytest.raises(ValueError, match="doesn't match its index"):
+        LogArchive(path)
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == [
+        "dep_1.deployment.index.json",
+        "dep_1.deployment.ndjson.gz",
+    ]
+
+    with pytest.raises(ValueError, match="Invalid deployment ID"):
+        export_path(tmp_path, "../dep_1", "deployment")
+
+
+@pytest.mark.asyncio
+async def test_export_logs_then_search_without_the_api(tmp_path):
+    """Test several deployments export concurrently and search offline."""
+    client = RailwayClient(
+        token="test_token", api_url="https://api.test.com/graphql", log_export_dir=str(tmp_path)
+    )
+
+    def handler(request):
+        deployment_id = json.loads(request.content)["variables"]["deploymentId"]
+        if deployment_id == "dep_2":
+            return Response(200, json={"errors": [{"message": "Deployment not found"}]})
+        return Response(200, json={"data": {"deploymentLogs": [line(1), line(2)]}})
+
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(side_effect=handler)
+        async with client:
+            exports = await export_logs(client, ["dep_1", "dep_2", "dep_1"])
+            calls = route.call_count
+            assert calls == 2
+            result = await search_exported_logs(client, "dep_1", "line 2")
+            with pytest.raises(ValueError, match="run export_logs first"):
+                await search_exported_logs(client, "dep_2")
+            assert route.call_count == calls
+
+    assert exports[0]["path"] == str(tmp_path / "dep_1.deployment.ndjson.gz")
+    assert (exports[0]["lines"], exports[0]["blocks"]) == (2, 1)
+    assert exports[1]["deploymentId"] == "dep_2"
+    assert exports[2] == exports[0]
+    assert "Deployment not found" in exports[1]["error"]
+    assert result == {"logs": [line(2)], "matches": 1, "blocksRead": 1, "blocks": 1}
+
+
+@pytest.mark.asyncio
+async def test_export_logs_pages_through_the_whole_log(tmp_path, monkeypatch):
+    """Test exports page from the last timestamp seen without duplicating lines."""
+    monkeypatch.setattr(deployments, "LOG_PAGE_SIZE", 3)
+    client = RailwayClient(
+        token="test_token", api_url="https://api.test.com/graphql", log_export_dir=str(tmp_path)
+    )
+    same_second = {**line(2), "message": "line 2b"}
+    log = [line(1), line(2), same_second, line(3), line(4)]
+    sent = []
+
+    def handler(request):
+        variables = json.loads(request.content)["variables"]
+        sent.append(variables)
+        start = variables.get("startDate", "")
+        page = [entry for entry in log if entry["timestamp"] >= start][: variables["limit"]]
+        return Response(200, json={"data": {"deploymentLogs": page}})
+
+    with respx.mock:
+        respx.post("https://api.test.com/graphql").mock(side_effect=handler)
+        async with client:
+            [export] = await export_logs(client, ["dep_1"])
+
+    assert [variables.get("startDate") for variables in sent] == [
+        None,
+        line(2)["timestamp"],
+        line(3)["timestamp"],
+    ]
+    assert export["lines"] == 5
+    archive = LogArchive(export["path"])
+    assert list(archive.search(LogFilter())) == log
+
+
+@pytest.mark.asyncio
+async def test_search_logs_stops_fetching_once_enough_lines_match(monkeypatch):
+    """Test a search reads pages only until it has its matches."""
+    monkeypatch.setattr(deployments, "LOG_PAGE_SIZE", 2)
+    client = RailwayClient(token="test_token", api_url="https://api.test.com/graphql")
+    log = [line(n) for n in range(1, 10)]
+
+    def handler(request):
+        variables = json.loads(request.content)["variables"]
+        start = variables.get("startDate", "")
+        page = [entry for entry in log if entry["timestamp"] >= start][: variables["limit"]]
+        return Response(200, json={"data": {"deploymentLogs": page}})
+
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(side_effect=handler)
+        async with client:
+            result = await search_logs(client, "dep_1", "line 3", limit=1)
+            assert route.call_count == 2
+            everything = await search_logs(client, "dep_1", "line")
+
+    assert result == {"logs": [line(3)], "matches": 1, "scanned": 3}
+    assert (everything["matches"], everything["scanned"]) == (9, 9)
@@ -0,0 +1,124 @@
+"""Tests for typed response models."""
+
+import json
+
+import pytest
+import respx
+from httpx import Response
+
+from railway_mcp import models
+from railway_mcp.client import RailwayClient
+from railway_mcp.exceptions import GraphQLError
+from railway_mcp.tools.templates import get_template
+
+PROJECTS_BODY = json.dumps(
+    {
+        "data": {
+            "me": {
+                "projects": {
+                    "edges": [
+                        {
+                            "node": {
+                                "id": "proj_1",
+                                "name": "api",
+                                "description": None,
+                                "createdAt": "2024-01-01T00:00:00Z",
+                                "updatedAt": "2024-01-02T00:00:00Z",
+                                "environments": {
+                                    "edges": [{"node": {"id": "env_1", "name": "production"}}]
+                                },
+                                "services": {
+                                    "edges": [{"node": {"id": "svc_1", "name": "web"}}],
+                                    "pageInfo": {"hasNextPage": True},
+                                },
+                                "unknownField": True,
+                            }
+                        }
+                    ]
+                }
+            }
+        }
+    }
+).encode()
+
+EXPECTED_PROJECTS = [
+    {
+        "id": "proj_1",
+        "name": "api",
+        "description": None,
+        "createdAt": "2024-01-01T00:00:00Z",
+        "updatedAt": "2024-01-02T00:00:00Z",
+        "environments": [{"id": "env_1", "name": "production"}],
+        "services": [{"id": "svc_1", "name": "web"}],
+        "hasMoreEnvironments": False,
+        "hasMoreServices": True,
+    }
+]
+
+
+@pytest.fixture(params=["msgspec", "pydantic"])
+def backend(request, monkeypatch):
+    """Run a test against each decoding backend."""
+    if request.param == "pydantic":
+        monkeypatch.setattr(models, "msgspec", None)
+    elif models.msgspec is None:
+        pytest.skip("msgspec is not installed")
+    models._decoder.cache_clear()
+    yield request.param
+    models._decoder.cache_clear()
+
+
+def test_decode_flattens_connections(backend):
+    """Test nested connections decode to reference lists and unknown fields are ignored."""
+    response = models.decode(PROJECTS_BODY, models.ListProjectsData)
+
+    assert response.errors is None
+    assert models.to_builtins(response.data.me.projects.nodes) == EXPECTED_PROJECTS
+
+
+def test_decode_errors_and_null_data(backend):
+    """Test error responses decode without data."""
+    body = b'{"data":null,"errors":[{"message":"Not Authorized","path":["me"]}]}'
+    response = models.decode(body, models.ListProjectsData)
+
+    assert response.data is None
+    assert response.errors[0]["message"] == "Not Authorized"
+
+    with pytest.raises(GraphQLError, match="ListProjectsData"):
+        models.decode(b'{"data":{"me":{"projects":[]}}}', models.ListProjectsData)
+
+
+@pytest.mark.asyncio
+async def test_execute_with_model():
+    """Test execute decodes into the model and raises on GraphQL errors."""
+    client = RailwayClient(token="test_token", api_url="https://api.test.com/graphql")
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql")
+        route.mock(return_value=Response(200, content=PROJECTS_BODY))
+        async with client:
+            data = await client.execute(
+                "query ListProjects { me { id } }", model=models.ListProjectsData
+            )
+            assert isinstance(data, models.ListProjectsData)
+            assert data.me.projects.nodes[0].services[0].name == "web"
+
+            route.mock(return_value=Response(200, json={"errors": [{"message": "boom"}]}))
+            with pytest.raises(GraphQLError, match="boom"):
+                await client.execute(
+                    "query ListProjects { me { id } }", model=models.ListProjectsData
+                )
+
+
+@pytest.mark.asyncio
+async def test_get_template_missing():
+    """Test a missing template returns empty fields instead of failing."""
+    client = RailwayClient(token="test_token", api_url="https://api.test.com/graphql")
+    with respx.mock:
+        respx.post("https://api.test.com/graphql").mock(
+            return_value=Response(200, json={"data": {"template": None}})
+        )
+        async with client:
+            template = await get_template(client, "missing")
+
+    assert template["id"] is None
+    assert template["services"] == []
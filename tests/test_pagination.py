@@ -0,0 +1,89 @@
+"""Tests for cursor-based pagination."""
+
+import asyncio
+import json
+import time
+
+import pytest
+import respx
+from httpx import Response
+
+from railway_mcp.client import RailwayClient
+from railway_mcp.tools.deployments import list_deployments
+from railway_mcp.tools.environments import link_environment
+from railway_mcp.tools.projects import list_projects
+
+
+class PagedServer:
+    """Serve a connection in pages, honouring the first/after variables."""
+
+    def __init__(self, total: int, wrap):
+        self.total = total
+        self.wrap = wrap
+        self.requests: list[dict] = []
+
+    def __call__(self, request) -> Response:
+        variables = json.loads(request.content).get("variables") or {}
+        self.requests.append(variables)
+        start = int(variables.get("after") or 0)
+        end = min(start + variables["first"], self.total)
+        connection = {
+            "edges": [{"node": {"id": str(i), "name": f"item-{i}"}} for i in range(start, end)],
+            "pageInfo": {"hasNextPage": end < self.total, "endCursor": str(end)},
+        }
+        return Response(200, json={"data": self.wrap(connection)})
+
+
+@pytest.fixture
+def client():
+    """Create a test client with small pages."""
+    client = RailwayClient(token="test_token", api_url="https://api.test.com/graphql", page_size=10)
+    # Treat the empty name index as complete, so IDs pass straight through
+    client.topology.refreshed_at = time.monotonic()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_list_projects_walks_every_page(client):
+    """Test every page is fetched and cursors are passed along."""
+    server = PagedServer(25, lambda c: {"me": {"projects": c}})
+    with respx.mock:
+        respx.post("https://api.test.com/graphql").mock(side_effect=server)
+        async with client:
+            projects = await list_projects(client)
+
+    assert [p["id"] for p in projects] == [str(i) for i in range(25)]
+    assert [r.get("after") for r in server.requests] == [None, "10", "20"]
+    assert projects[0]["environments"] == []
+
+
+@pytest.mark.asyncio
+async def test_limit_stops_early(client):
+    """Test the last page is shrunk to the limit and no further pages are requested."""
+    server = PagedServer(100, lambda c: {"deployments": c})
+    with respx.mock:
+        respx.post("https://api.test.com/graphql").mock(side_effect=server)
+        async with client:
+            deployments = await list_deployments(client, "svc", "env", limit=15)
+
+    assert len(deployments) == 15
+    assert [r["first"] for r in server.requests] == [10, 5]
+
+
+@pytest.mark.asyncio
+async def test_early_exit_cancels_prefetch(client):
+    """Test abandoning iteration cancels the prefetched page without leaking errors."""
+    server = PagedServer(30, lambda c: {"project": {"environments": c}})
+
+    async def slow(request):
+        await asyncio.sleep(0 if not server.requests else 10)
+        return server(request)
+
+    with respx.mock:
+        respx.post("https://api.test.com/graphql").mock(side_effect=slow)
+        async with client:
+            environment = await asyncio.wait_for(link_environment(client, "proj", "3"), 1)
+            assert not client._inflight
+
+    assert environment["name"] == "item-3"
+    assert len(server.requests) == 1
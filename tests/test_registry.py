@@ -0,0 +1,56 @@
+"""Tests for the GraphQL document registry."""
+
+import json
+
+from railway_mcp.graphql.mutations import SET_VARIABLES_MUTATION
+from railway_mcp.graphql.queries import LIST_PROJECTS_QUERY
+from railway_mcp.graphql.registry import OPERATIONS_BY_NAME, get_operation, minify
+
+
+def test_minify_keeps_strings_and_separates_names():
+    """Test minification drops insignificant characters only."""
+    document = """
+    query Find($id: String!, $first: Int) {  # trailing comment
+        project(id: $id, name: "a,  b") { id name }
+    }
+    """
+
+    assert minify(document) == (
+        'query Find($id:String!$first:Int){project(id:$id name:"a,  b"){id name}}'
+    )
+
+
+def test_constants_are_precompiled():
+    """Test registry constants carry their name, kind and variables."""
+    operation = get_operation(SET_VARIABLES_MUTATION)
+
+    assert operation is OPERATIONS_BY_NAME["SetVariables"]
+    assert operation.is_mutation
+    assert operation.variables == ("projectId", "environmentId", "serviceId", "variables")
+    assert not get_operation(LIST_PROJECTS_QUERY).is_mutation
+
+
+def test_payload_splices_variables_into_prefix():
+    """Test the pre-encoded payload is the JSON request body."""
+    operation = get_operation(LIST_PROJECTS_QUERY)
+
+    body = json.loads(operation.payload({"first": 5}))
+    assert body == {
+        "query": operation.document,
+        "operationName": "ListProjects",
+        "variables": {"first": 5},
+    }
+    hashed = json.loads(operation.payload(None, persisted=True, include_query=False))
+    assert hashed["extensions"]["persistedQuery"]["sha256Hash"] == operation.sha256
+    assert "query" not in hashed
+
+
+def test_adhoc_documents_are_compiled_on_demand():
+    """Test documents outside the registry are parsed and memoized."""
+    document = 'query { project(id: "123") { id } }'
+
+    operation = get_operation(document)
+
+    assert operation.name is None
+    assert operation.kind == "query"
+    assert get_operation(document) is operation
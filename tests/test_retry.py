@@ -0,0 +1,147 @@
+"""Tests for the retry policy and client-side rate limiting."""
+
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+from railway_mcp.client import RailwayClient
+from railway_mcp.exceptions import GraphQLError, RateLimitError
+from railway_mcp.retry import (
+    RetryPolicy,
+    TokenBucket,
+    is_retryable,
+    parse_rate_limit,
+    parse_retry_after,
+)
+
+
+@pytest.fixture
+def client():
+    """Create a test client that retries without waiting."""
+    return RailwayClient(
+        token="test_token",
+        api_url="https://api.test.com/graphql",
+        retry_policy=RetryPolicy(max_attempts=3, base_delay=0.0, max_delay=0.0),
+    )
+
+
+def test_mutations_retry_only_when_safe():
+    """Test retry classification for reads and non-idempotent mutations."""
+    server_error = GraphQLError("HTTP error 502", status_code=502)
+    read_timeout = httpx.ReadTimeout("timed out")
+    connect_error = httpx.ConnectError("refused")
+
+    assert is_retryable(server_error, idempotent=True)
+    assert not is_retryable(server_error, idempotent=False)
+    assert not is_retryable(read_timeout, idempotent=False)
+    assert is_retryable(connect_error, idempotent=False)
+    assert is_retryable(RateLimitError("slow down"), idempotent=False)
+    assert not is_retryable(GraphQLError("bad query", status_code=400), idempotent=True)
+
+
+def test_decorrelated_jitter_stays_within_bounds():
+    """Test backoff delays stay between the base and maximum delay."""
+    policy = RetryPolicy(base_delay=0.5, max_delay=4.0)
+    delay = policy.base_delay
+    for _ in range(50):
+        delay = policy.next_delay(delay)
+        assert 0.5 <= delay <= 4.0
+
+
+def test_parse_headers():
+    """Test Retry-After and rate-limit header parsing."""
+    headers = httpx.Headers(
+        {
+            "Retry-After": "7",
+            "X-RateLimit-Limit": "100",
+            "X-RateLimit-Remaining": "40",
+            "X-RateLimit-Reset": "30",
+        }
+    )
+
+    assert parse_retry_after(headers) == 7.0
+    assert parse_rate_limit(headers) == (100, 40, 30.0)
+    assert parse_rate_limit(httpx.Headers()) is None
+
+
+@pytest.mark.asyncio
+async def test_read_retries_after_429_and_502(client):
+    """Test reads are retried through rate limiting and gateway errors."""
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(
+            side_effect=[
+                Response(429, headers={"Retry-After": "0"}),
+                Response(502, text="Bad Gateway"),
+                Response(200, json={"data": {"me": {"id": "user_123"}}}),
+            ]
+        )
+
+        async with client:
+            data = await client.execute("query Me { me { id } }")
+
+        assert data["me"]["id"] == "user_123"
+        assert route.call_count == 3
+        assert client.retries == 2
+
+
+@pytest.mark.asyncio
+async def test_long_retry_after_is_not_waited_for(client):
+    """Test a Retry-After beyond the maximum delay fails instead of stalling."""
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(
+            return_value=Response(429, headers={"Retry-After": "3600"})
+        )
+
+        async with client:
+            with pytest.raises(RateLimitError) as excinfo:
+                await client.execute("query Me { me { id } }")
+
+        assert excinfo.value.retry_after == 3600
+        assert route.call_count == 1
+        assert client.retries == 0
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_mutation_is_not_retried_on_502(client):
+    """Test a deploy mutation fails fast on a gateway error."""
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(
+            return_value=Response(502, text="Bad Gateway")
+        )
+
+        async with client:
+            with pytest.raises(GraphQLError):
+                await client.execute(
+                    "mutation DeployService { serviceInstanceDeploy }",
+                )
+
+        assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_graphql_rate_limit_error_is_retried(client):
+    """Test rate-limit errors reported in the GraphQL body are retried."""
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(
+            side_effect=[
+                Response(200, json={"errors": [{"message": "Rate limit exceeded"}]}),
+                Response(200, json={"data": {"me": {"id": "user_123"}}}),
+            ]
+        )
+
+        async with client:
+            await client.execute("query Me { me { id } }")
+
+        assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_waits_when_exhausted():
+    """Test the bucket throttles once the reported quota is spent."""
+    bucket = TokenBucket()
+    bucket.observe(limit=1000, remaining=0, reset_in=1.0)
+
+    await bucket.acquire()
+
+    assert bucket.throttled == 1
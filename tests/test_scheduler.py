@@ -0,0 +1,149 @@
+"""Tests for the request scheduler."""
+
+import asyncio
+
+import pytest
+import respx
+from httpx import Response
+
+from railway_mcp.client import RailwayClient
+from railway_mcp.exceptions import OverloadedError
+from railway_mcp.scheduler import AdaptiveLimit, Lane, Scheduler
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_admitted_by_lane_priority():
+    """Test freed slots go to mutations first, then interactive, then bulk reads."""
+    scheduler = Scheduler(max_concurrency=1)
+    order = []
+
+    async def request(lane: Lane) -> None:
+        async with scheduler.slot(lane):
+            order.append(lane)
+
+    await scheduler.acquire(Lane.BULK)
+    tasks = [asyncio.ensure_future(request(lane)) for lane in (Lane.BULK, Lane.INTERACTIVE)]
+    tasks.append(asyncio.ensure_future(request(Lane.MUTATION)))
+    await asyncio.sleep(0)
+    assert scheduler.queued() == 3
+
+    scheduler.release()
+    await asyncio.gather(*tasks)
+
+    assert order == [Lane.MUTATION, Lane.INTERACTIVE, Lane.BULK]
+    assert scheduler.active == 0
+    assert scheduler.stats()["lanes"]["bulk"]["admitted"] == 2
+
+
+@pytest.mark.asyncio
+async def test_full_lane_rejects_and_cancelled_waiters_leave():
+    """Test a full lane rejects immediately and cancelled waiters free their place."""
+    scheduler = Scheduler(max_concurrency=1, queue_depths={"bulk": 1})
+    await scheduler.acquire(Lane.INTERACTIVE)
+
+    waiter = asyncio.ensure_future(scheduler.acquire(Lane.BULK))
+    await asyncio.sleep(0)
+    with pytest.raises(OverloadedError):
+        await scheduler.acquire(Lane.BULK)
+
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    assert scheduler.queued() == 0
+    scheduler.release()
+    assert scheduler.active == 0
+    assert scheduler.stats()["lanes"]["bulk"]["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_client_caps_concurrent_requests():
+    """Test the client never has more requests in flight than the scheduler allows."""
+    client = RailwayClient(
+        token="test_token",
+        api_url="https://api.test.com/graphql",
+        scheduler=Scheduler(max_concurrency=2),
+    )
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return Response(200, json={"data": {"ok": True}})
+
+    with respx.mock:
+        respx.post("https://api.test.com/graphql").mock(side_effect=handler)
+        async with client:
+            await asyncio.gather(
+                *(client.execute("query Q($i: Int) { ok }", {"i": i}) for i in range(6))
+            )
+
+    assert peak == 2
+    interactive = client.stats()["scheduler"]["lanes"]["interactive"]
+    assert interactive["admitted"] == 6
+    assert interactive["maxWaitMs"] > 0
+
+
+class StandInServer:
+    """Local stand-in for the API with adjustable latency and throttling."""
+
+    def __init__(self):
+        self.latency = 0.002
+        self.throttle = False
+
+    async def __call__(self, request):
+        await asyncio.sleep(self.latency)
+        if self.throttle:
+            return Response(429, headers={"retry-after": "0"})
+        return Response(200, json={"data": {"ok": True}})
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limit_grows_and_backs_off():
+    """Test the limit grows while latency is stable and is cut on 429s and latency spikes."""
+    scheduler = Scheduler(max_concurrency=2)
+    adaptive = AdaptiveLimit(scheduler, max_limit=8, window=5)
+    client = RailwayClient(
+        token="test_token",
+        api_url="https://api.test.com/graphql",
+        scheduler=scheduler,
+        adaptive_limit=adaptive,
+    )
+    server = StandInServer()
+
+    async def burst(count: int) -> None:
+        await asyncio.gather(
+            *(
+                client.execute("query Q($i: Int) { ok }", {"i": i}, fresh=True)
+                for i in range(count)
+            ),
+            return_exceptions=True,
+        )
+
+    with respx.mock:
+        respx.post("https://api.test.com/graphql").mock(side_effect=server)
+        async with client:
+            await burst(60)
+            grown = scheduler.limit
+            assert grown > 2
+            assert adaptive.baseline is not None
+            assert adaptive.decreases == 0
+
+            server.throttle = True
+            await burst(10)
+            assert scheduler.limit <= grown // 2
+            throttled = adaptive.decreases
+            assert throttled >= 1
+
+            server.throttle = False
+            scheduler.limit = 8
+            server.latency = 0.05
+            await burst(8)
+            assert scheduler.limit < 8
+            assert adaptive.decreases == throttled + 1
+
+    stats = client.stats()["adaptiveLimit"]
+    assert stats["limit"] == scheduler.limit
+    assert stats["p90RttMs"] >= 50
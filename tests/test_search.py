@@ -0,0 +1,115 @@
+"""Tests for the search index and tool."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+import respx
+from httpx import Response
+
+from railway_mcp import server
+from railway_mcp.client import RailwayClient
+from railway_mcp.search import SearchIndex
+from railway_mcp.tools.search import search
+
+
+def test_prefix_fuzzy_and_incremental_updates():
+    """Test terms match prefixes and misspellings, and updates need no rebuild."""
+    index = SearchIndex()
+    index.upsert("service", "svc_1", "payments-api", project_id="proj_1")
+    index.upsert("service", "svc_2", "web", project_id="proj_1")
+    index.upsert("project", "proj_1", "Shop", description="Online payments store")
+    index.upsert("template", "tpl_1", "PostgreSQL", code="postgres", category="Databases")
+
+    hits = index.search("pay")
+    assert [hit.document.id for hit in hits] == ["svc_1", "proj_1"]
+    assert hits[0].score > hits[1].score
+    assert [hit.document.id for hit in index.search("paymnts api")] == ["svc_1"]
+    assert index.search("paymnts", fuzzy=False) == []
+    assert [hit.document.id for hit in index.search("pay", kinds={"project"})] == ["proj_1"]
+    assert index.search("postgres")[0].as_dict() == {
+        "kind": "template",
+        "id": "tpl_1",
+        "name": "PostgreSQL",
+        "code": "postgres",
+        "score": 3.0,
+    }
+
+    index.upsert("service", "svc_1", "billing", project_id="proj_1")
+    assert [hit.document.id for hit in index.search("pay")] == ["proj_1"]
+    index.remove("proj_1")
+    assert index.search("pay") == []
+    assert index.search("bill")[0].document.name == "billing"
+
+
+@pytest.mark.asyncio
+async def test_search_tool_answers_from_the_index():
+    """Test the tool loads the index once, then follows topology changes."""
+    client = RailwayClient(token="test_token", api_url="https://api.test.com/graphql")
+    sent = []
+    custom_domains = [{"id": "dom_1", "domain": "shop.example.com"}]
+
+    def handler(request):
+        operation = json.loads(request.content).get("operationName")
+        sent.append(operation)
+        if operation == "ListDomains":
+            service_domain = {"id": "dom_2", "domain": "shop-prod", "suffix": "up.railway.app"}
+            data = {
+                "domains": {"serviceDomains": [service_domain], "customDomains": custom_domains}
+            }
+        elif operation == "ListProjects":
+            node = {
+                "id": "proj_1",
+                "name": "shop",
+                "environments": {"edges": [{"node": {"id": "env_1", "name": "production"}}]},
+                "services": {"edges": [{"node": {"id": "svc_1", "name": "checkout"}}]},
+            }
+            data = {"me": {"projects": {"edges": [{"node": node}], "pageInfo": {}}}}
+        else:
+            template = {"id": "tpl_1", "code": "redis", "name": "Redis"}
+            data = {"templates": {"edges": [{"node": template}], "pageInfo": {}}}
+        return Response(200, json={"data": data})
+
+    with respx.mock:
+        respx.post("https://api.test.com/graphql").mock(side_effect=handler)
+        async with client:
+            results = await search(client, "checkot")
+            assert results == [
+                {
+                    "kind": "service",
+                    "id": "svc_1",
+                    "name": "checkout",
+                    "projectId": "proj_1",
+                    "score": 0.9,
+                }
+            ]
+            assert (await search(client, "red", kinds=["template"]))[0]["code"] == "redis"
+            assert await search(client, "example", kinds=["domain"]) == [
+                {
+                    "kind": "domain",
+                    "id": "dom_1",
+                    "name": "shop.example.com",
+                    "projectId": "proj_1",
+                    "serviceId": "svc_1",
+                    "score": 3.0,
+                }
+            ]
+
+            # Later walks list domains again and drop removed ones
+            custom_domains.clear()
+            await client.topology.refresh()
+            assert await search(client, "example", kinds=["domain"]) == []
+            assert (await search(client, "shop prod", kinds=["domain"]))[0]["id"] == "dom_2"
+
+            client.topology.remove("proj_1")
+            assert await search(client, "checkout") == []
+            assert client.search.count("domain") == 0
+            with pytest.raises(ValueError, match="Invalid kinds: deployment"):
+                await search(client, "shop", kinds=["deployment"])
+
+            # The server tool reaches the same index
+            context = server.AppContext(client=client)
+            ctx = SimpleNamespace(request_context=SimpleNamespace(lifespan_context=context))
+            assert (await server.search(ctx, "redis", ["template"]))[0]["code"] == "redis"
+
+    assert sent == ["ListProjects", "ListDomains", "ListTemplates", "ListProjects", "ListDomains"]
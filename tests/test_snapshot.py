@@ -0,0 +1,110 @@
+"""Tests for cache snapshots."""
+
+import asyncio
+import gzip
+
+import pytest
+import respx
+from httpx import Response
+
+from railway_mcp import models
+from railway_mcp.cache import ResponseCache
+from railway_mcp.client import RailwayClient
+from railway_mcp.graphql.queries import LIST_PROJECTS_QUERY
+from railway_mcp.snapshot import load_snapshot, save_snapshot
+
+PROJECTS = models.ListProjectsData(
+    me=models.ProjectsViewer(
+        projects=models.Connection(
+            edges=[
+                models.Edge(
+                    node=models.Project(
+                        id="proj_1",
+                        name="api",
+                        environments=[models.Ref(id="env_1", name="production")],
+                    )
+                )
+            ]
+        )
+    )
+)
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Test entries come back as models with their remaining TTL, for the same token only."""
+    path = tmp_path / "cache" / "snapshot.json.gz"
+    cache = ResponseCache(clock=FakeClock())
+    cache.set("ListProjects", {"first": 50}, PROJECTS, model=models.ListProjectsData)
+    cache.set("GetDeployment", {"id": "d1"}, {"deployment": {"id": "d1"}})
+    assert save_snapshot(cache, path, "token", clock=FakeClock(1000)) == 2
+
+    restored = ResponseCache(clock=FakeClock())
+    assert load_snapshot(restored, path, "token", clock=FakeClock(1015)) == 2
+    # 15s passed while the server was down: ListProjects (30s TTL) is still
+    # fresh, GetDeployment (5s) has expired but can be served while refreshing
+    ttls = {entry.operation: expires_in for entry, expires_in in restored.entries()}
+    assert ttls == {"ListProjects": pytest.approx(15), "GetDeployment": pytest.approx(-10)}
+    assert restored.get("ListProjects", {"first": 50}, models.ListProjectsData) == PROJECTS
+    assert restored.get("GetDeployment", {"id": "d1"}) is None
+    assert restored.get_revalidating("GetDeployment", {"id": "d1"}) == {"deployment": {"id": "d1"}}
+    assert restored.stats.as_dict()["restored"] == 2
+
+    assert load_snapshot(ResponseCache(), path, "other", clock=FakeClock(1015)) == 0
+    assert load_snapshot(ResponseCache(), path, "token", max_age=60, clock=FakeClock(2000)) == 0
+    assert load_snapshot(ResponseCache(), tmp_path / "missing", "token") == 0
+    (tmp_path / "corrupt").write_bytes(b"not gzip")
+    assert load_snapshot(ResponseCache(), tmp_path / "corrupt", "token") == 0
+
+
+def test_snapshot_never_contains_variable_values(tmp_path):
+    """Test variable responses stay out of the snapshot, which only its owner can read."""
+    path = tmp_path / "snapshot.json.gz"
+    cache = ResponseCache()
+    cache.set("ListProjects", {"first": 50}, PROJECTS, model=models.ListProjectsData)
+    cache.set("ListVariables", {"projectId": "p1"}, {"variables": {"API_KEY": "s3cr3t"}})
+    assert save_snapshot(cache, path, "token") == 1
+
+    content = gzip.decompress(path.read_bytes())
+    assert b"s3cr3t" not in content
+    assert b"ListVariables" not in content
+    assert path.stat().st_mode & 0o777 == 0o600
+    assert [entry.name for entry in tmp_path.iterdir()] == [path.name]
+
+
+@pytest.mark.asyncio
+async def test_client_serves_restored_entries_while_revalidating():
+    """Test an expired restored entry is returned at once and refreshed in the background."""
+    cache = ResponseCache()
+    cache.restore("ListProjects", {"first": 50}, PROJECTS, models.ListProjectsData, -60)
+    client = RailwayClient(token="t", api_url="https://api.test.com/graphql", cache=cache)
+    fresh = {"me": {"projects": {"edges": [], "pageInfo": {"hasNextPage": False}}}}
+
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(
+            return_value=Response(200, json={"data": fresh})
+        )
+        async with client:
+            data = await client.execute(
+                LIST_PROJECTS_QUERY, {"first": 50}, model=models.ListProjectsData
+            )
+            assert data == PROJECTS
+            # A second caller doesn't start another refresh
+            await client.execute(LIST_PROJECTS_QUERY, {"first": 50}, model=models.ListProjectsData)
+            while client._inflight:
+                await asyncio.sleep(0)
+
+            data = await client.execute(
+                LIST_PROJECTS_QUERY, {"first": 50}, model=models.ListProjectsData
+            )
+            assert data.me.projects.nodes == []
+            assert route.call_count == 1
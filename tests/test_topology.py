@@ -0,0 +1,185 @@
+"""Tests for the topology index."""
+
+import asyncio
+import json
+
+import pytest
+import respx
+from httpx import Response
+
+from railway_mcp import models
+from railway_mcp.client import RailwayClient
+from railway_mcp.exceptions import AmbiguousNameError
+from railway_mcp.tools.environments import link_environment, list_environments
+from railway_mcp.tools.services import deploy
+from railway_mcp.topology import NodeKind
+
+
+def project(project_id: str, name: str, environments: dict, services: dict) -> dict:
+    """Build a ListProjects node."""
+    return {
+        "id": project_id,
+        "name": name,
+        "environments": {
+            "edges": [{"node": {"id": i, "name": n}} for i, n in environments.items()]
+        },
+        "services": {"edges": [{"node": {"id": i, "name": n}} for i, n in services.items()]},
+    }
+
+
+PROJECTS = [
+    project("proj_1", "shop", {"env_1": "production", "env_2": "staging"}, {"svc_1": "api"}),
+    project("proj_2", "blog", {"env_3": "production"}, {"svc_2": "web", "svc_3": "api"}),
+]
+
+
+@pytest.fixture
+def client():
+    """Create a test client."""
+    return RailwayClient(token="test_token", api_url="https://api.test.com/graphql")
+
+
+def test_names_resolve_within_parent_projects(client):
+    """Test name lookups use parent links and reject ambiguous names."""
+    index = client.topology
+    for node in PROJECTS:
+        index.apply_project(models.decode(json.dumps({"data": node}).encode(), models.Project).data)
+
+    assert index.lookup(NodeKind.PROJECT, "Shop").id == "proj_1"
+    assert index.lookup(NodeKind.SERVICE, "web").project_id == "proj_2"
+    assert index.lookup(NodeKind.ENVIRONMENT, "production", "proj_2").id == "env_3"
+    with pytest.raises(AmbiguousNameError, match="env_1, env_3"):
+        index.lookup(NodeKind.ENVIRONMENT, "production")
+
+    renamed = project("proj_1", "store", {"env_1": "production"}, {"svc_1": "api"})
+    index.apply_project(models.decode(json.dumps({"data": renamed}).encode(), models.Project).data)
+    assert index.lookup(NodeKind.PROJECT, "shop") is None
+    assert index.get("env_2") is None
+
+    index.remove("proj_2")
+    assert index.lookup(NodeKind.SERVICE, "api").id == "svc_1"
+    assert index.stats()["services"] == 1
+
+
+@pytest.mark.asyncio
+async def test_walk_pages_through_truncated_children(client):
+    """Test a first page of services removes nothing and the walk fetches the rest."""
+    truncated = project("proj_1", "shop", {"env_1": "production"}, {"svc_1": "api"})
+    truncated["services"]["pageInfo"] = {"hasNextPage": True}
+    index = client.topology
+    index.add(NodeKind.SERVICE, "svc_2", "worker", "proj_1")
+    index.apply_project(
+        models.decode(json.dumps({"data": truncated}).encode(), models.Project).data
+    )
+    assert index.get("svc_2") is not None
+
+    def handler(request):
+        operation = json.loads(request.content)["operationName"]
+        if operation == "ListProjects":
+            data = {"me": {"projects": {"edges": [{"node": truncated}], "pageInfo": {}}}}
+        else:
+            nodes = [{"id": "svc_1", "name": "api"}, {"id": "svc_3", "name": "cron"}]
+            edges = [{"node": node} for node in nodes]
+            data = {"project": {"services": {"edges": edges, "pageInfo": {}}}}
+        return Response(200, json={"data": data})
+
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(side_effect=handler)
+        async with client:
+            await index.refresh()
+
+    assert route.call_count == 2
+    assert index.lookup(NodeKind.SERVICE, "cron").id == "svc_3"
+    assert index.get("svc_2") is None
+
+
+@pytest.mark.asyncio
+async def test_tools_accept_names_resolved_without_api_calls(client):
+    """Test a refreshed index lets tools take names and skip lookups."""
+    sent = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        sent.append((body.get("operationName"), body.get("variables")))
+        operation = body.get("operationName")
+        if operation == "ListProjects":
+            edges = [{"node": node} for node in PROJECTS]
+            data = {"me": {"projects": {"edges": edges, "pageInfo": {}}}}
+        elif operation == "ListEnvironments":
+            node = {"id": "env_1", "name": "production", "createdAt": "2024-01-01T00:00:00Z"}
+            data = {"project": {"environments": {"edges": [{"node": node}], "pageInfo": {}}}}
+        else:
+            data = {"serviceInstanceDeploy": True}
+        return Response(200, json={"data": data})
+
+    with respx.mock:
+        respx.post("https://api.test.com/graphql").mock(side_effect=handler)
+        async with client:
+            await client.topology.refresh()
+
+            result = await deploy(client, "web", "production")
+            assert (result["serviceId"], result["environmentId"]) == ("svc_2", "env_3")
+
+            await list_environments(client, "shop")
+            environment = await link_environment(client, "shop", "production")
+            assert environment["createdAt"] == "2024-01-01T00:00:00Z"
+
+    assert [operation for operation, _ in sent] == [
+        "ListProjects",
+        "DeployService",
+        "ListEnvironments",
+    ]
+    assert sent[1][1] == {"serviceId": "svc_2", "environmentId": "env_3"}
+    assert sent[2][1]["projectId"] == "proj_1"
+
+
+@pytest.mark.asyncio
+async def test_names_resolve_after_a_failed_first_walk():
+    """Test a miss walks the projects again until one walk has succeeded."""
+    client = RailwayClient(
+        token="test_token", api_url="https://api.test.com/graphql", topology_refresh_interval=0
+    )
+    edges = [{"node": node} for node in PROJECTS]
+    responses = [
+        Response(503),
+        Response(200, json={"data": {"me": {"projects": {"edges": edges, "pageInfo": {}}}}}),
+    ]
+
+    with respx.mock:
+        route = respx.post("https://api.test.com/graphql").mock(side_effect=responses)
+        async with client:
+            await asyncio.wait({client.topology.start_refresh()})
+            assert client.topology.refreshed_at is None
+
+            refs = await client.topology.resolve(project="shop", service="api")
+            assert (refs.project_id, refs.service_id) == ("proj_1", "svc_1")
+            # Once a walk has completed, misses no longer trigger one
+            assert (await client.topology.resolve(project="proj_9")).project_id == "proj_9"
+
+    assert route.call_count == 2
+    assert client.topology.refreshes == 1
+
+
+@pytest.mark.asyncio
+async def test_ids_pass_through_before_the_first_walk():
+    """Test unknown IDs don't wait for the first walk, which runs in the background."""
+    client = RailwayClient(
+        token="test_token", api_url="https://api.test.com/graphql", topology_refresh_interval=0
+    )
+    project_id = "0f6f6f1e-3c1a-4e8b-9d2a-5b7c8d9e0f1a"
+    walked = asyncio.Event()
+
+    async def handler(request):
+        await walked.wait()
+        return Response(200, json={"data": {"me": {"projects": {"edges": [], "pageInfo": {}}}}})
+
+    with respx.mock:
+        respx.post("https://api.test.com/graphql").mock(side_effect=handler)
+        async with client:
+            refs = await asyncio.wait_for(client.topology.resolve(project=project_id), 1)
+            assert refs.project_id == project_id
+            walk = client.topology.start_refresh()
+            assert not walk.done()
+            walked.set()
+            await walk
+            assert client.topology.refreshed_at is not None